@@ -3,21 +3,39 @@ Sistema de Analytics para o jogo Desprogramados
 Coleta métricas de gameplay para análise e melhorias
 """
 
-import json
+import atexit
 import time
-import os
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from datetime import datetime
+from collections import defaultdict
 from logger import log_info, log_debug, log_error
 from config import GameConfig
+from analytics_store import AnalyticsStore, AnalyticsWriter
+from optimizations import get_level_performance_summary, frame_timer
+from flight_recorder import record_event
+from heatmap import heatmap_recorder
+
+# Eventos que só alimentam agregados da sessão (um por quadro) e não vão para a tabela de eventos
+SESSION_ONLY_EVENTS = ('performance',)
 
 class GameAnalytics:
-    """Sistema de analytics para coletar métricas do jogo"""
+    """
+    Sistema de analytics para coletar métricas do jogo
+
+    track_* só mexem em contadores em memória e enfileiram o evento; a
+    gravação (eventos em lote e upsert da sessão) roda na thread do
+    AnalyticsWriter depois de start(). Sem start() (ferramentas, scripts)
+    nada vai para a fila e save_and_reset grava na thread de quem chamou.
+    """
     
     def __init__(self):
-        self.enabled = GameConfig.ANALYTICS_CONFIG['enabled']
-        self.save_interval = GameConfig.ANALYTICS_CONFIG['save_interval']
-        self.metrics_file = GameConfig.ANALYTICS_CONFIG['metrics_file']
+        config = GameConfig.ANALYTICS_CONFIG
+        self.enabled = config['enabled']
+        self.save_interval = config['save_interval']
+        self.store = AnalyticsStore(config['store_file'], config['legacy_file'])
+        self.writer = AnalyticsWriter(
+            self.store, config['queue_size'], config['batch_size'], config['flush_interval']
+        )
+        self.last_frame = None
         
         # Métricas em tempo real
         self.session_start = time.time()
@@ -31,8 +49,12 @@ class GameAnalytics:
             'player_actions': defaultdict(int),
             'level_times': {},
             'errors': 0,
-            'performance_metrics': []
+            'performance_metrics': [],
+            'level_performance': {},
+            'startup': {}
         }
+        # A sessão viva é uma linha do store, atualizada a cada save
+        self.session_id = self.current_session['start_time']
         
         # Contadores por jogador
         self.player_stats = {
@@ -44,104 +66,91 @@ class GameAnalytics:
         self.frame_times = []
         self.last_save_time = time.time()
         
-        # Carregar dados históricos se existirem
-        self.historical_data = self._load_historical_data()
-        
         log_info("Sistema de Analytics inicializado")
     
-    def _load_historical_data(self):
-        """Carrega dados históricos de analytics"""
-        try:
-            if os.path.exists(self.metrics_file):
-                with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    log_debug(f"Analytics históricos carregados: {len(data.get('sessions', []))} sessões")
-                    return data
-        except Exception as e:
-            log_error(f"Erro ao carregar analytics históricos: {e}")
-        
-        return {'sessions': [], 'total_stats': {}}
+    def start(self):
+        """Liga a thread de escrita e o tempo de jogo por quadro (chamado pelo loop do jogo)"""
+        if not self.enabled or self.writer.running:
+            return
+        self.writer.start()
+        frame_timer.begin_hooks.append(self.on_begin_frame)
+        atexit.register(self.shutdown)
+    
+    def on_begin_frame(self, scene):
+        """Hook do FrameTimer: soma o tempo de jogo em todas as cenas (menu e minigames)"""
+        now = time.perf_counter()
+        if self.last_frame is not None:
+            self.update_play_time(now - self.last_frame)
+        self.last_frame = now
+    
+    def _snapshot(self):
+        """
+        Cópia rasa da sessão para a thread de escrita
+
+        Só os contêineres são copiados (listas/dicts que o jogo continua
+        alterando); a serialização, inclusive a compactação dos mapas de
+        calor, fica com a thread.
+        """
+        snapshot = {
+            key: value.copy() if isinstance(value, (dict, list)) else value
+            for key, value in self.current_session.items()
+        }
+        snapshot['heatmaps'] = heatmap_recorder.snapshot()
+        return snapshot
     
     def _save_data(self):
-        """Salva dados de analytics no arquivo"""
+        """Entrega a sessão atual para gravação (upsert; totais atualizados pela diferença)"""
         try:
-            # Finalizar sessão atual
             self.current_session['end_time'] = datetime.now().isoformat()
             self.current_session['duration'] = time.time() - self.session_start
-            
-            # Adicionar à lista de sessões
-            self.historical_data['sessions'].append(self.current_session)
-            
-            # Manter apenas as últimas 100 sessões
-            if len(self.historical_data['sessions']) > 100:
-                self.historical_data['sessions'] = self.historical_data['sessions'][-100:]
-            
-            # Calcular estatísticas totais
-            self._calculate_total_stats()
-            
-            # Salvar no arquivo
-            with open(self.metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(self.historical_data, f, indent=2, ensure_ascii=False)
-            
-            log_debug("Dados de analytics salvos")
-            
+            if self.writer.running:
+                self.writer.save_session(self.session_id, self._snapshot())
+            else:
+                self.store.save_session(self.session_id, self._snapshot())
+                log_debug("Dados de analytics salvos")
         except Exception as e:
             log_error(f"Erro ao salvar analytics: {e}")
     
-    def _calculate_total_stats(self):
-        """Calcula estatísticas totais de todas as sessões"""
-        total_stats = {
-            'total_sessions': len(self.historical_data['sessions']),
-            'total_play_time': 0,
-            'total_levels_completed': 0,
-            'total_deaths': 0,
-            'total_paint_actions': 0,
-            'total_jumps': 0,
-            'average_session_duration': 0,
-            'most_played_level': None,
-            'player_preferences': defaultdict(int)
-        }
-        
-        level_completions = Counter()
-        
-        for session in self.historical_data['sessions']:
-            total_stats['total_play_time'] += session.get('play_time', 0)
-            total_stats['total_levels_completed'] += session.get('levels_completed', 0)
-            total_stats['total_deaths'] += session.get('deaths', 0)
-            total_stats['total_paint_actions'] += session.get('paint_actions', 0)
-            total_stats['total_jumps'] += session.get('jumps', 0)
-            
-            # Contar níveis completados
-            for level, time_taken in session.get('level_times', {}).items():
-                level_completions[level] += 1
-            
-            # Contar ações dos jogadores
-            for player, actions in session.get('player_actions', {}).items():
-                total_stats['player_preferences'][player] += actions
-        
-        # Calcular médias
-        if total_stats['total_sessions'] > 0:
-            total_stats['average_session_duration'] = total_stats['total_play_time'] / total_stats['total_sessions']
-        
-        # Nível mais jogado
-        if level_completions:
-            total_stats['most_played_level'] = level_completions.most_common(1)[0][0]
-        
-        self.historical_data['total_stats'] = total_stats
+    def flush(self, timeout=2.0):
+        """Grava já a sessão e os eventos pendentes (saída, erro crítico)"""
+        if not self.enabled:
+            return True
+        self._save_data()
+        return self.writer.flush(timeout)
+    
+    def shutdown(self):
+        """Último save e fim da thread de escrita (atexit)"""
+        if not self.enabled:
+            return
+        self._save_data()
+        self.writer.stop()
+        self.store.close()
     
     def track_event(self, event_type, data=None):
         """Registra um evento do jogo"""
+        record_event('analytics', event_type, data)
         if not self.enabled:
             return
         
         timestamp = time.time()
+        if self.writer.running and event_type not in SESSION_ONLY_EVENTS:
+            self.writer.add_event(self.session_id, timestamp, event_type, data)
         
         if event_type == 'level_completed':
             level_name = data.get('level', 'unknown')
             time_taken = data.get('time', 0)
             self.current_session['levels_completed'] += 1
             self.current_session['level_times'][level_name] = time_taken
-            log_debug(f"Level completado: {level_name} em {time_taken:.2f}s")
+            log_debug("Level completado: %s em %.2fs", level_name, time_taken)
+            
+            # Percentis de tempo de quadro do nível (engasgos não somem na média)
+            performance = data.get('performance')
+            if performance:
+                self.current_session['level_performance'][level_name] = performance
+                log_debug(
+                    "Performance de %s: p50 %.1fms, p99 %.1fms, máx %.1fms", level_name,
+                    performance['p50_frame_time'], performance['p99_frame_time'], performance['max_frame_time']
+                )
             
         elif event_type == 'player_action':
             player_name = data.get('player', 'unknown')
@@ -156,11 +165,16 @@ class GameAnalytics:
                 
         elif event_type == 'death':
             self.current_session['deaths'] += 1
-            log_debug(f"Morte registrada - Total: {self.current_session['deaths']}")
+            log_debug("Morte registrada - Total: %d", self.current_session['deaths'])
             
         elif event_type == 'error':
             self.current_session['errors'] += 1
-            log_debug(f"Erro registrado: {data}")
+            log_debug("Erro registrado: %s", data)
+            
+        elif event_type == 'startup':
+            # Tempo até o primeiro quadro do menu e fases do boot (ms)
+            self.current_session['startup'] = dict(data)
+            log_debug("Primeiro quadro em %.1fms", data.get('time_to_first_frame', 0))
             
         elif event_type == 'performance':
             frame_time = data.get('frame_time', 0)
@@ -198,7 +212,8 @@ class GameAnalytics:
             'deaths': self.current_session['deaths'],
             'paint_actions': self.current_session['paint_actions'],
             'jumps': self.current_session['jumps'],
-            'errors': self.current_session['errors']
+            'errors': self.current_session['errors'],
+            'time_to_first_frame': self.current_session['startup'].get('time_to_first_frame')
         }
     
     def get_player_stats(self, player_name):
@@ -231,7 +246,7 @@ class GameAnalytics:
             'session_summary': current_summary,
             'performance': performance,
             'player_stats': {player: dict(stats) for player, stats in self.player_stats.items()},
-            'historical_data': self.historical_data.get('total_stats', {})
+            'historical_data': self.store.get_total_stats()
         }
         
         return report
@@ -253,13 +268,17 @@ class GameAnalytics:
                 'player_actions': defaultdict(int),
                 'level_times': {},
                 'errors': 0,
-                'performance_metrics': []
+                'performance_metrics': [],
+                'level_performance': {},
+                'startup': {}
             }
+            self.session_id = self.current_session['start_time']
             
             self.player_stats = {
                 'Jackson': defaultdict(int),
                 'Jean': defaultdict(int)
             }
+            heatmap_recorder.reset()
             
             log_info("Analytics resetados para nova sessão")
 
@@ -271,7 +290,11 @@ def track_event(event_type, data=None):
     game_analytics.track_event(event_type, data)
 
 def track_level_completed(level_name, time_taken):
-    game_analytics.track_event('level_completed', {'level': level_name, 'time': time_taken})
+    game_analytics.track_event('level_completed', {
+        'level': level_name,
+        'time': time_taken,
+        'performance': get_level_performance_summary(level_name)
+    })
 
 def track_player_action(player_name, action):
     game_analytics.track_event('player_action', {'player': player_name, 'action': action})
@@ -282,8 +305,20 @@ def track_death():
 def track_error(error_message):
     game_analytics.track_event('error', {'message': error_message})
 
+def track_startup(time_to_first_frame, phases):
+    game_analytics.track_event('startup', {'time_to_first_frame': time_to_first_frame, 'phases': phases})
+
 def track_frame_time(frame_time):
     game_analytics.track_frame_time(frame_time)
 
 def get_analytics_report():
-    return game_analytics.generate_report() 
\ No newline at end of file
+    return game_analytics.generate_report()
+
+def start_analytics():
+    game_analytics.start()
+
+def flush_analytics(timeout=2.0):
+    return game_analytics.flush(timeout)
+
+def get_analytics_writer_stats():
+    return game_analytics.writer.get_stats() 
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Relatório de analytics e logs do jogo Desprogramados
+Percorre o store de analytics (analytics.db) e os logs rotacionados
+(logs/game.log*, inclusive .gz) linha a linha, sem carregar nenhum deles
+inteiro: sessões, distribuição dos tempos de conclusão por nível,
+percentis de tempo de quadro por nível e os avisos mais frequentes
+
+Uso:
+    python analytics_report.py
+    python analytics_report.py --top 20 --json
+"""
+
+import os
+
+# Sem o aviso de boas-vindas do pygame no stdout (quebraria o --json)
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import glob
+import gzip
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from config import GameConfig
+from analytics_store import AnalyticsStore
+from optimizations import FrameHistogram
+from logger import set_log_level
+
+WARNING_LEVELS = ('WARNING', 'ERROR', 'CRITICAL')
+NUMBER = re.compile(r'\d+(?:\.\d+)?')
+REPEATED = re.compile(r' \[(?:(mensagem anterior )?repetida (\d+) vezes)?[^\]]*\]$')
+
+class CompletionHistogram(FrameHistogram):
+    """Tempos de conclusão de nível em segundos (mesmas operações do FrameHistogram)"""
+
+    BUCKETS = (10, 20, 30, 45, 60, 90, 120, 180, 240, 300, 450, 600, 900, 1200, 1800, 3600)
+
+def _percentiles(histogram, unit_digits=1):
+    return {
+        'count': histogram.count,
+        'mean': round(histogram.mean(), unit_digits),
+        'p50': round(histogram.percentile(50), unit_digits),
+        'p90': round(histogram.percentile(90), unit_digits),
+        'p99': round(histogram.percentile(99), unit_digits),
+        'max': round(histogram.max, unit_digits)
+    }
+
+def scan_analytics(store):
+    """
+    Sessões, tempos de conclusão e histogramas de quadro por nível
+
+    Conclusões vêm da tabela de eventos (todas as tentativas); sessões
+    anteriores a ela usam level_times/level_performance (a última de cada nível).
+    """
+    completions = defaultdict(CompletionHistogram)
+    frame_times = defaultdict(FrameHistogram)
+    levels_without_histogram = Counter()
+    sessions_with_events = set()
+
+    def add_performance(level, performance):
+        histogram = (performance or {}).get('frame_time_histogram')
+        if histogram is None:
+            if performance:
+                levels_without_histogram[level] += 1
+        elif histogram.get('count'):
+            # Histograma vazio (nível sem quadros medidos) não vira linha zerada no relatório
+            frame_times[level].merge(FrameHistogram.from_dict(histogram))
+
+    for session_id, _, data in store.iter_events('level_completed'):
+        sessions_with_events.add(session_id)
+        level = data.get('level', 'unknown')
+        completions[level].add(data.get('time', 0))
+        add_performance(level, data.get('performance'))
+
+    sessions = {'total': 0, 'play_time': 0.0, 'first': None, 'last': None, 'by_day': Counter()}
+    for session_id, start, play_time, level_times, level_performance in store.iter_session_summaries():
+        start = start or ''
+        sessions['total'] += 1
+        sessions['play_time'] += play_time
+        sessions['first'] = sessions['first'] or start
+        sessions['last'] = start
+        sessions['by_day'][start[:10]] += 1
+        if session_id in sessions_with_events:
+            continue
+        for level, time_taken in level_times.items():
+            completions[level].add(time_taken)
+        for level, performance in (json.loads(level_performance) if level_performance else {}).items():
+            add_performance(level, performance)
+
+    return {
+        'sessions': {
+            'total': sessions['total'],
+            'play_time_h': round(sessions['play_time'] / 3600, 2),
+            'first': sessions['first'],
+            'last': sessions['last'],
+            'by_day': dict(sorted(sessions['by_day'].items()))
+        },
+        'level_completion_s': {level: _percentiles(h) for level, h in sorted(completions.items())},
+        'level_frame_time_ms': {level: _percentiles(h) for level, h in sorted(frame_times.items())},
+        'levels_without_histogram': dict(levels_without_histogram)
+    }
+
+def _empty_analytics():
+    """Relatório de analytics sem store (nada gravado ainda)"""
+    return {
+        'sessions': {'total': 0, 'play_time_h': 0.0, 'first': None, 'last': None, 'by_day': {}},
+        'level_completion_s': {},
+        'level_frame_time_ms': {},
+        'levels_without_histogram': {}
+    }
+
+def _open_log(path):
+    """Linhas em bytes: a decodificação fica com _decode_line"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+def _decode_line(line):
+    """UTF-8; logs antigos (sem encoding no handler, gravados no Windows) caem no cp1252"""
+    try:
+        return line.decode('utf-8')
+    except UnicodeDecodeError:
+        return line.decode('cp1252', errors='replace')
+
+def scan_logs(log_dir, log_file, top):
+    """
+    Avisos e erros mais frequentes nos logs (atual e rotacionados)
+
+    Números viram N para agrupar mensagens iguais; o resumo "repetida N
+    vezes" do limite por ponto de chamada soma as cópias suprimidas.
+    """
+    counts = Counter()
+    levels = Counter()
+    files = sorted(glob.glob(os.path.join(log_dir, f'{log_file}*')))
+    for path in files:
+        with _open_log(path) as f:
+            for line in f:
+                parts = _decode_line(line).rstrip('\r\n').split(' - ', 3)
+                if len(parts) < 4 or parts[2] not in WARNING_LEVELS:
+                    continue
+                level, message = parts[2], parts[3]
+                repeats = 1
+                match = REPEATED.search(message)
+                if match:
+                    message = message[:match.start()]
+                    if match.group(2) and not match.group(1):
+                        repeats += int(match.group(2))
+                counts[(level, NUMBER.sub('N', message))] += repeats
+                levels[level] += repeats
+    return {
+        'files': [os.path.basename(path) for path in files],
+        'by_level': dict(levels),
+        'top': [
+            {'level': level, 'message': message, 'count': count}
+            for (level, message), count in counts.most_common(top)
+        ]
+    }
+
+def _print_table(title, rows, unit):
+    print(f"\n{title}")
+    if not rows:
+        print("  (sem dados)")
+        return
+    print(f"  {'nível':<14} {'n':>6} {'média':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'máx':>8}  {unit}")
+    for level, stats in rows.items():
+        print(f"  {level:<14} {stats['count']:>6} {stats['mean']:>8} {stats['p50']:>8} "
+              f"{stats['p90']:>8} {stats['p99']:>8} {stats['max']:>8}")
+
+def print_report(report):
+    sessions = report['analytics']['sessions']
+    print(f"Sessões: {sessions['total']} ({sessions['play_time_h']}h de jogo), "
+          f"de {sessions['first'] or '-'} a {sessions['last'] or '-'}")
+    _print_table("Tempo de conclusão por nível", report['analytics']['level_completion_s'], 's')
+    _print_table("Tempo de quadro por nível", report['analytics']['level_frame_time_ms'], 'ms')
+    missing = report['analytics']['levels_without_histogram']
+    if missing:
+        print(f"  sem histograma (sessões antigas): {', '.join(f'{k} {v}' for k, v in missing.items())}")
+
+    logs = report['logs']
+    print(f"\nAvisos nos logs ({len(logs['files'])} arquivos): "
+          + (', '.join(f"{level} {count}" for level, count in logs['by_level'].items()) or 'nenhum'))
+    for entry in logs['top']:
+        print(f"  {entry['count']:>6}  {entry['level']:<8} {entry['message']}")
+
+def main():
+    config = GameConfig.ANALYTICS_CONFIG
+    parser = argparse.ArgumentParser(description='Relatório de analytics e logs (leitura em fluxo)')
+    parser.add_argument('--store', default=config['store_file'], help='store de analytics (SQLite)')
+    parser.add_argument('--logs', default='logs', help='pasta dos logs')
+    parser.add_argument('--top', type=int, default=10, help='avisos mais frequentes a mostrar')
+    parser.add_argument('--json', action='store_true', help='imprime o relatório em JSON')
+    args = parser.parse_args()
+    if args.json:
+        # O console do log também escreve no stdout
+        set_log_level('WARNING')
+
+    if os.path.exists(args.store) or os.path.exists(config['legacy_file']):
+        # Abrir o store importa um analytics.json antigo, se o store ainda não existir
+        store = AnalyticsStore(args.store, config['legacy_file'])
+        analytics = scan_analytics(store)
+        store.close()
+    else:
+        analytics = _empty_analytics()
+    report = {
+        'analytics': analytics,
+        'logs': scan_logs(args.logs, GameConfig.LOG_CONFIG['file'], args.top)
+    }
+    if args.json:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
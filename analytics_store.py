@@ -0,0 +1,382 @@
+"""
+Armazenamento de analytics do jogo Desprogramados
+SQLite (stdlib) só de acréscimo: uma linha por sessão, atualizada (upsert)
+enquanto a sessão está viva, e totais mantidos de forma incremental, então
+salvar custa o mesmo com 10 ou 10 mil sessões no histórico. A escrita roda
+numa thread própria (AnalyticsWriter), em lotes
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from logger import log_info, log_error, log_warning
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    start_time TEXT,
+    end_time TEXT,
+    data TEXT NOT NULL,
+    contribution TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    session_id TEXT NOT NULL,
+    time REAL NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS events_type ON events (type);
+"""
+
+ADD_TOTAL = """
+INSERT INTO totals (name, value) VALUES (?, ?)
+ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+"""
+
+UPSERT_SESSION = """
+INSERT INTO sessions (id, start_time, end_time, data, contribution) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    end_time = excluded.end_time, data = excluded.data, contribution = excluded.contribution
+"""
+
+def _json_default(obj):
+    """Objetos que só viram JSON na hora de gravar (ex.: grades dos mapas de calor)"""
+    if hasattr(obj, 'to_json'):
+        return obj.to_json()
+    raise TypeError(f"{type(obj).__name__} não é serializável em JSON")
+
+def session_contribution(session):
+    """
+    Quanto uma sessão soma aos totais (nome -> valor)
+
+    Mesmas regras do antigo _calculate_total_stats: cada nível em
+    'level_times' conta uma conclusão e as ações somam por jogador.
+    """
+    contribution = {
+        'sessions': 1,
+        'play_time': session.get('play_time', 0),
+        'levels_completed': session.get('levels_completed', 0),
+        'deaths': session.get('deaths', 0),
+        'paint_actions': session.get('paint_actions', 0),
+        'jumps': session.get('jumps', 0)
+    }
+    time_to_first_frame = session.get('startup', {}).get('time_to_first_frame')
+    if time_to_first_frame:
+        contribution['first_frame_sum'] = time_to_first_frame
+        contribution['first_frame_count'] = 1
+    for level in session.get('level_times', {}):
+        contribution[f'level:{level}'] = 1
+    for player, actions in session.get('player_actions', {}).items():
+        contribution[f'player:{player}'] = actions
+    return contribution
+
+class AnalyticsStore:
+    """
+    Sessões e totais em SQLite
+
+    A conexão só é aberta no primeiro uso (fora do boot) e é compartilhada
+    entre a thread de escrita e as leituras de relatório, sob um lock. Cada
+    save é uma transação: a linha da sessão e a diferença nos totais entram
+    juntas ou não entram.
+    """
+
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.conn = None
+        self.lock = threading.RLock()
+
+    def _connect(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(SCHEMA)
+            self._import_legacy()
+        return self.conn
+
+    def _import_legacy(self):
+        """Importa uma vez o analytics.json antigo (sessões duplicadas pelo save antigo viram uma)"""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        if self.conn.execute('SELECT 1 FROM sessions LIMIT 1').fetchone():
+            return
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                sessions = json.load(f).get('sessions', [])
+        except (OSError, ValueError) as e:
+            log_error(f"Erro ao importar {self.legacy_path}: {e}")
+            return
+        # O save antigo reacrescentava a sessão viva; fica a cópia mais longa de cada início
+        latest = {}
+        for session in sessions:
+            key = session.get('start_time')
+            if key not in latest or session.get('duration', 0) >= latest[key].get('duration', 0):
+                latest[key] = session
+        with self.conn:
+            for start_time, session in latest.items():
+                self._upsert(start_time, session)
+        log_info(f"{len(latest)} sessões importadas de {self.legacy_path} ({len(sessions)} registros)")
+
+    def _upsert(self, session_id, session):
+        """Grava a sessão e soma aos totais só a diferença desde o último save dela"""
+        row = self.conn.execute(
+            'SELECT contribution FROM sessions WHERE id = ?', (session_id,)
+        ).fetchone()
+        previous = json.loads(row[0]) if row else {}
+        contribution = session_contribution(session)
+        for name in contribution.keys() | previous.keys():
+            delta = contribution.get(name, 0) - previous.get(name, 0)
+            if delta:
+                self.conn.execute(ADD_TOTAL, (name, delta))
+        self.conn.execute(UPSERT_SESSION, (
+            session_id, session.get('start_time'), session.get('end_time'),
+            json.dumps(session, ensure_ascii=False, default=_json_default), json.dumps(contribution)
+        ))
+
+    def save_session(self, session_id, session):
+        """Upsert da sessão viva (custo constante, independente do histórico)"""
+        self.write_batch((), (session_id, session))
+
+    def write_batch(self, events, session=None):
+        """
+        Um lote numa transação: eventos (session_id, time, type, data) e,
+        se houver, o upsert da sessão (session_id, sessão)
+        """
+        with self.lock:
+            conn = self._connect()
+            with conn:
+                if events:
+                    conn.executemany(
+                        'INSERT INTO events (session_id, time, type, data) VALUES (?, ?, ?, ?)',
+                        [(session_id, timestamp, event_type,
+                          json.dumps(data, ensure_ascii=False, default=str) if data is not None else None)
+                         for session_id, timestamp, event_type, data in events]
+                    )
+                if session is not None:
+                    self._upsert(*session)
+
+    def get_totals(self):
+        """Totais brutos (nome -> valor)"""
+        with self.lock:
+            return dict(self._connect().execute('SELECT name, value FROM totals'))
+
+    def get_total_stats(self):
+        """Estatísticas agregadas no formato do antigo historical_data['total_stats']"""
+        totals = self.get_totals()
+        sessions = int(totals.get('sessions', 0))
+        levels = {name[6:]: int(value) for name, value in totals.items() if name.startswith('level:') and value}
+        first_frames = totals.get('first_frame_count', 0)
+        return {
+            'total_sessions': sessions,
+            'total_play_time': totals.get('play_time', 0),
+            'total_levels_completed': int(totals.get('levels_completed', 0)),
+            'total_deaths': int(totals.get('deaths', 0)),
+            'total_paint_actions': int(totals.get('paint_actions', 0)),
+            'total_jumps': int(totals.get('jumps', 0)),
+            'average_session_duration': totals.get('play_time', 0) / sessions if sessions else 0,
+            'average_time_to_first_frame': (
+                totals.get('first_frame_sum', 0) / first_frames if first_frames else 0
+            ),
+            'most_played_level': max(levels, key=levels.get) if levels else None,
+            'player_preferences': {
+                name[7:]: int(value) for name, value in totals.items() if name.startswith('player:')
+            }
+        }
+
+    def _iter_rows(self, sql, params=()):
+        """
+        Linhas uma por vez numa conexão própria de leitura: com WAL ela não
+        espera pela thread de escrita nem a segura
+        """
+        with self.lock:
+            self._connect()
+        conn = sqlite3.connect(self.path)
+        try:
+            yield from conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def iter_sessions(self):
+        """(id, sessão) em ordem de início, sem carregar o histórico inteiro"""
+        # O id é o start_time da sessão: a ordem vem do índice da chave primária
+        for session_id, data in self._iter_rows('SELECT id, data FROM sessions ORDER BY id'):
+            yield session_id, json.loads(data)
+
+    def iter_session_summaries(self):
+        """
+        (id, start_time, play_time, level_times, level_performance JSON) em
+        ordem de início; o SQLite extrai só esses campos (sem métricas por
+        quadro nem mapas de calor no Python). level_performance volta como
+        texto, para só decodificar quando for usado
+        """
+        rows = self._iter_rows(
+            "SELECT id, start_time, json_extract(data, '$.play_time'), json_extract(data, '$.level_times'), "
+            "json_extract(data, '$.level_performance') FROM sessions ORDER BY id"
+        )
+        for session_id, start_time, play_time, level_times, level_performance in rows:
+            yield (session_id, start_time, play_time or 0,
+                   json.loads(level_times) if level_times else {}, level_performance)
+
+    def iter_events(self, event_type):
+        """(session_id, time, data) dos eventos de um tipo, em ordem de gravação"""
+        rows = self._iter_rows(
+            'SELECT session_id, time, data FROM events WHERE type = ? ORDER BY rowid', (event_type,)
+        )
+        for session_id, timestamp, data in rows:
+            yield session_id, timestamp, json.loads(data) if data is not None else None
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+class _Flush:
+    """Marcador na fila: sinaliza quando tudo que entrou antes dele foi gravado"""
+    __slots__ = ('done',)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+_STOP = object()
+
+class AnalyticsWriter:
+    """
+    Thread de escrita do analytics
+
+    O jogo só enfileira (put_nowait numa fila limitada; cheia = descarta e
+    conta) e deixa o retrato mais recente da sessão num slot único, que
+    nunca é descartado. A thread junta até `batch_size` eventos e o retrato
+    pendente numa transação, pelo menos a cada `flush_interval` segundos.
+    """
+
+    def __init__(self, store, queue_size, batch_size, flush_interval):
+        self.store = store
+        self.queue = queue.Queue(queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pending_session = None  # (session_id, retrato) mais recente
+        self.thread = None
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self.thread = threading.Thread(target=self._run, name='analytics-writer', daemon=True)
+        self.thread.start()
+
+    def add_event(self, session_id, timestamp, event_type, data):
+        """O(1) e não bloqueia"""
+        try:
+            self.queue.put_nowait((session_id, timestamp, event_type, data))
+        except queue.Full:
+            self.dropped += 1
+
+    def save_session(self, session_id, snapshot):
+        """Substitui o retrato pendente; só o mais recente é gravado"""
+        with self.lock:
+            self.pending_session = (session_id, snapshot)
+
+    def _take_session(self):
+        with self.lock:
+            session, self.pending_session = self.pending_session, None
+        return session
+
+    def _write(self, events):
+        session = self._take_session()
+        if not events and session is None:
+            return
+        try:
+            self.store.write_batch(events, session)
+            self.written += len(events)
+            self.batches += 1
+        except Exception as e:
+            log_error(f"Erro ao gravar analytics ({len(events)} eventos): {e}")
+
+    def _run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._write([])
+                continue
+            events, markers, stop = [], [], False
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _Flush):
+                    markers.append(item)
+                else:
+                    events.append(item)
+                if stop or len(events) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(events)
+            for marker in markers:
+                marker.done.set()
+            if stop:
+                return
+
+    def flush(self, timeout=2.0):
+        """
+        Grava tudo o que já foi enfileirado; sem a thread (ferramentas,
+        scripts) grava na thread de quem chamou. Retorna False se não
+        terminou dentro de `timeout`.
+        """
+        if not self.running:
+            events = []
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, tuple):
+                    events.append(item)
+            self._write(events)
+            return True
+        marker = _Flush()
+        try:
+            self.queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def stop(self, timeout=2.0):
+        """Esvazia a fila e encerra a thread (na saída do processo)"""
+        if not self.running:
+            self.flush(timeout)
+            return
+        if not self.flush(timeout):
+            log_warning("Analytics: fila não esvaziou a tempo na saída")
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+        self.thread = None
+
+    def get_stats(self):
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'queue_size': self.queue.qsize(),
+            'queue_capacity': self.queue.maxsize
+        }
@@ -0,0 +1,424 @@
+"""
+Pipeline de assets para o jogo Desprogramados
+Cozinha PNGs em blobs de pixels crus e carrega-os via mmap, sem decodificar zlib
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import time
+import weakref
+from collections import Counter, deque
+import pygame
+from logger import log_debug, log_info, log_warning
+from config import GameConfig
+from flight_recorder import record_span
+
+COOKED_VERSION = 1
+BYTES_PER_PIXEL = 4
+
+def _tobytes(surface, pixel_format):
+    """Serializa a superfície (pygame < 2.1.3 só tem tostring)"""
+    to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+    return to_bytes(surface, pixel_format)
+
+def cooked_paths(source_path, cooked_dir=None, variant=None):
+    """Retorna os caminhos (blob, sidecar) do asset cozido de um PNG"""
+    cooked_dir = cooked_dir or GameConfig.COOKED_DIR
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    if variant:
+        name = f"{name}.{variant}"
+    base = os.path.join(cooked_dir, name)
+    return base + '.raw', base + '.json'
+
+def hash_file(path, chunk_size=None):
+    """Calcula o hash de conteúdo de um arquivo em blocos"""
+    chunk_size = chunk_size or GameConfig.ASSET_CONFIG['hash_chunk_size']
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_sidecar(sidecar_path):
+    """Lê o sidecar JSON de um asset cozido (None se não existir ou for inválido)"""
+    try:
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != COOKED_VERSION:
+        return None
+    return meta
+
+def _write_atomic(path, data, mode='wb'):
+    """Escreve em arquivo temporário e renomeia, para nunca deixar blob pela metade"""
+    tmp_path = path + '.tmp'
+    encoding = None if 'b' in mode else 'utf-8'
+    with open(tmp_path, mode, encoding=encoding) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _source_stamp(source_path):
+    """Tamanho e mtime do PNG, usados para checar frescor sem ler o arquivo"""
+    st = os.stat(source_path)
+    return st.st_size, st.st_mtime_ns
+
+def anim_frame_keys(*anim_tables):
+    """Extrai as chaves (linha, quadro) referenciadas pelas tabelas ANIM"""
+    keys = set()
+    for anim_table in anim_tables:
+        for anim in anim_table.values():
+            for frame in range(anim['frames']):
+                keys.add((anim['row'], frame))
+    return sorted(keys)
+
+def pack_frames(sheet, frame_keys, frame_w, frame_h):
+    """
+    Copia apenas os quadros referenciados para um atlas compacto
+
+    Returns:
+        (superfície do atlas, dict (linha, quadro) -> (x, y, w, h))
+    """
+    cols = max(1, math.ceil(math.sqrt(len(frame_keys))))
+    rows = max(1, math.ceil(len(frame_keys) / cols))
+    atlas = pygame.Surface((cols * frame_w, rows * frame_h), pygame.SRCALPHA, 32)
+    rects = {}
+    for index, (row, frame) in enumerate(frame_keys):
+        x, y = (index % cols) * frame_w, (index // cols) * frame_h
+        # BLEND_RGBA_MAX sobre destino zerado = cópia exata, inclusive do alfa
+        atlas.blit(sheet, (x, y), (frame * frame_w, row * frame_h, frame_w, frame_h),
+                   special_flags=pygame.BLEND_RGBA_MAX)
+        rects[(row, frame)] = (x, y, frame_w, frame_h)
+    return atlas, rects
+
+class SpriteAtlas:
+    """Atlas de quadros de animação indexado por (linha, quadro) da spritesheet original"""
+
+    def __init__(self, surface, rects):
+        self.surface = surface
+        self.rects = rects
+        self.frame_cache = {}
+
+    @classmethod
+    def from_sheet(cls, sheet, frame_keys, frame_w, frame_h):
+        """Monta o atlas em memória a partir da spritesheet completa"""
+        atlas, rects = pack_frames(sheet, frame_keys, frame_w, frame_h)
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        return cls(atlas, rects)
+
+    def frame_rect(self, row, frame):
+        """Retorna o retângulo do quadro dentro do atlas"""
+        return self.rects[(row, frame)]
+
+    def get_frame(self, row, frame):
+        """Retorna o quadro como subsuperfície do atlas (sem cópia, com cache)"""
+        key = (row, frame)
+        surface = self.frame_cache.get(key)
+        if surface is None:
+            surface = self.surface.subsurface(self.rects[key])
+            self.frame_cache[key] = surface
+        return surface
+
+    def get_size(self):
+        """Tamanho do atlas em pixels"""
+        return self.surface.get_size()
+
+class AssetCooker:
+    """Converte PNGs em blobs de pixels crus com sidecar JSON"""
+
+    def __init__(self, cooked_dir=None):
+        self.cooked_dir = cooked_dir or GameConfig.COOKED_DIR
+        self.pixel_format = GameConfig.ASSET_CONFIG['cooked_format']
+        self.premultiplied = GameConfig.ASSET_CONFIG['premultiplied']
+
+    def _is_up_to_date(self, meta, digest):
+        """Verifica se o blob existente corresponde ao conteúdo e às opções atuais"""
+        return (
+            meta is not None and
+            meta.get('source_hash') == digest and
+            meta.get('format') == self.pixel_format and
+            meta.get('premultiplied') == self.premultiplied
+        )
+
+    def cook_image(self, source_path, force=False, tier=None, digest=None):
+        """
+        Cozinha um PNG de forma incremental
+
+        Args:
+            tier: Nome do tier (GameConfig.RENDER_TIERS) para gravar uma versão pré-reduzida
+
+        Returns:
+            True se o blob foi (re)escrito, False se já estava atualizado
+        """
+        raw_path, sidecar_path = cooked_paths(source_path, self.cooked_dir, tier)
+        scale = GameConfig.RENDER_TIERS[tier] if tier else 1.0
+        digest = digest or hash_file(source_path)
+        size, mtime_ns = _source_stamp(source_path)
+        meta = read_sidecar(sidecar_path)
+
+        if (not force and self._is_up_to_date(meta, digest) and os.path.exists(raw_path) and
+                meta.get('scale', 1.0) == scale):
+            # Mesmo conteúdo: só atualiza o carimbo se o arquivo foi tocado
+            if (meta.get('source_size'), meta.get('source_mtime_ns')) != (size, mtime_ns):
+                meta['source_size'], meta['source_mtime_ns'] = size, mtime_ns
+                _write_atomic(sidecar_path, json.dumps(meta, indent=2), 'w')
+            return False
+
+        image = pygame.image.load(source_path)
+        base_size = image.get_size()
+        if tier or self.premultiplied:
+            # Superfície RGBA 32 bits independente do display (smoothscale e premul_alpha exigem)
+            image = pygame.image.frombuffer(_tobytes(image, 'RGBA'), base_size, 'RGBA')
+        if tier:
+            # Mesmo arredondamento de RenderTier.scaled_size
+            image = pygame.transform.smoothscale(image, (
+                max(1, math.ceil(base_size[0] * scale)), max(1, math.ceil(base_size[1] * scale))
+            ))
+        if self.premultiplied:
+            image = image.premul_alpha()
+        width, height = image.get_size()
+        pixels = _tobytes(image, self.pixel_format)
+
+        os.makedirs(self.cooked_dir, exist_ok=True)
+        _write_atomic(raw_path, pixels)
+        # O sidecar é escrito por último: sem ele o blob é ignorado pelo loader
+        _write_atomic(sidecar_path, json.dumps({
+            'version': COOKED_VERSION,
+            'source': source_path.replace(os.sep, '/'),
+            'source_hash': digest,
+            'source_size': size,
+            'source_mtime_ns': mtime_ns,
+            'size': [width, height],
+            'pitch': width * BYTES_PER_PIXEL,
+            'format': self.pixel_format,
+            'premultiplied': self.premultiplied,
+            'tier': tier or 'base',
+            'scale': scale,
+            'base_size': list(base_size)
+        }, indent=2), 'w')
+        log_debug("Asset cozido: %s [%s] (%dx%d, %s)", source_path, tier or 'base', width, height, self.pixel_format)
+        return True
+
+    def cook_atlas(self, sheet_path, anim_tables, frame_w, frame_h, force=False):
+        """
+        Cozinha um atlas com apenas os quadros referenciados pelas tabelas ANIM
+
+        Returns:
+            True se o atlas foi (re)escrito, False se já estava atualizado
+        """
+        raw_path, sidecar_path = cooked_paths(sheet_path, self.cooked_dir, 'atlas')
+        frame_keys = anim_frame_keys(*anim_tables)
+        digest = hash_file(sheet_path)
+        size, mtime_ns = _source_stamp(sheet_path)
+        meta = read_sidecar(sidecar_path)
+
+        if (not force and self._is_up_to_date(meta, digest) and os.path.exists(raw_path) and
+                [tuple(f[:2]) for f in meta.get('frames', [])] == frame_keys):
+            if (meta.get('source_size'), meta.get('source_mtime_ns')) != (size, mtime_ns):
+                meta['source_size'], meta['source_mtime_ns'] = size, mtime_ns
+                _write_atomic(sidecar_path, json.dumps(meta, indent=2), 'w')
+            return False
+
+        atlas, rects = pack_frames(pygame.image.load(sheet_path), frame_keys, frame_w, frame_h)
+        if self.premultiplied:
+            atlas = atlas.premul_alpha()
+        width, height = atlas.get_size()
+
+        os.makedirs(self.cooked_dir, exist_ok=True)
+        _write_atomic(raw_path, _tobytes(atlas, self.pixel_format))
+        _write_atomic(sidecar_path, json.dumps({
+            'version': COOKED_VERSION,
+            'source': sheet_path.replace(os.sep, '/'),
+            'source_hash': digest,
+            'source_size': size,
+            'source_mtime_ns': mtime_ns,
+            'size': [width, height],
+            'pitch': width * BYTES_PER_PIXEL,
+            'format': self.pixel_format,
+            'premultiplied': self.premultiplied,
+            'frame_size': [frame_w, frame_h],
+            'frames': [[row, frame, *rects[(row, frame)]] for row, frame in frame_keys]
+        }), 'w')
+        log_debug("Atlas cozido: %s (%d quadros, %dx%d)", sheet_path, len(frame_keys), width, height)
+        return True
+
+    def cook_directory(self, assets_dir=None, force=False):
+        """Cozinha todos os PNGs de uma pasta e retorna estatísticas"""
+        assets_dir = assets_dir or GameConfig.ASSETS_DIR
+        stats = {'cooked': [], 'skipped': [], 'failed': []}
+        for filename in sorted(os.listdir(assets_dir)):
+            if not filename.lower().endswith('.png'):
+                continue
+            path = os.path.join(assets_dir, filename)
+            try:
+                digest = hash_file(path)
+                results = [self.cook_image(path, force, digest=digest)]
+                for tier in GameConfig.ASSET_CONFIG['cooked_tiers']:
+                    results.append(self.cook_image(path, force, tier, digest))
+                if any(results):
+                    stats['cooked'].append(filename)
+                else:
+                    stats['skipped'].append(filename)
+            except Exception as e:
+                log_warning(f"Falha ao cozinhar {path}: {e}")
+                stats['failed'].append(filename)
+        log_info(
+            f"Cozimento de assets: {len(stats['cooked'])} cozidos, "
+            f"{len(stats['skipped'])} inalterados, {len(stats['failed'])} falhas"
+        )
+        return stats
+
+class AssetLoader:
+    """Carrega imagens a partir do blob cozido, com fallback para o PNG"""
+
+    def __init__(self, cooked_dir=None):
+        self.cooked_dir = cooked_dir or GameConfig.COOKED_DIR
+        self.use_cooked = GameConfig.ASSET_CONFIG['use_cooked']
+        self.load_stats = {
+            'cooked_loads': 0,
+            'png_loads': 0,
+            'stale_blobs': 0,
+            'atlas_builds': 0
+        }
+        # Superfície carregada -> PNG de origem, para achar os blobs dos tiers
+        self._source_paths = weakref.WeakKeyDictionary()
+        # Superfícies cujos pixels estão num mmap (page cache), não no heap
+        self.mapped_surfaces = weakref.WeakSet()
+        # Últimos carregamentos (fim em perf_counter, caminho, ms, origem) para o detector de engasgos
+        self.recent_loads = deque(maxlen=32)
+        # Carregamentos por caminho (recarga do mesmo asset aparece aqui e no teste de resistência)
+        self.load_counts = Counter()
+
+    def _record_load(self, path, start, kind):
+        end = time.perf_counter()
+        self.load_counts[path] += 1
+        self.recent_loads.append((end, path, (end - start) * 1000, kind))
+        record_span('asset', os.path.basename(path), start, (end - start) * 1000, {'path': path, 'kind': kind})
+
+    def load_cooked(self, source_path, variant=None):
+        """Mapeia o blob cozido em memória; None se não houver blob válido"""
+        surface, meta = self._map_cooked(source_path, variant)
+        return surface
+
+    def _map_cooked(self, source_path, variant=None):
+        """Mapeia o blob cozido e retorna (superfície, sidecar) ou (None, None)"""
+        raw_path, sidecar_path = cooked_paths(source_path, self.cooked_dir, variant)
+        meta = read_sidecar(sidecar_path)
+        if meta is None:
+            return None, None
+
+        # Checagem barata de frescor: PNG alterado depois do cozimento
+        if os.path.exists(source_path):
+            if _source_stamp(source_path) != (meta.get('source_size'), meta.get('source_mtime_ns')):
+                self.load_stats['stale_blobs'] += 1
+                log_debug(f"Blob cozido desatualizado, usando PNG: {source_path}")
+                return None, None
+
+        width, height = meta['size']
+        try:
+            with open(raw_path, 'rb') as f:
+                # ACCESS_COPY: páginas compartilhadas com o page cache até alguém escrever
+                pixels = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError) as e:
+            log_debug(f"Falha ao mapear blob {raw_path}: {e}")
+            return None, None
+
+        if len(pixels) != width * height * BYTES_PER_PIXEL:
+            pixels.close()
+            log_warning(f"Blob cozido com tamanho inválido: {raw_path}")
+            return None, None
+
+        # A superfície mantém referência ao mmap enquanto existir
+        surface = pygame.image.frombuffer(pixels, (width, height), meta['format'])
+        self.mapped_surfaces.add(surface)
+        self.load_stats['cooked_loads'] += 1
+        return surface, meta
+
+    def load_image(self, path, alpha=True):
+        """
+        Carrega uma imagem pronta para blit
+
+        Args:
+            path: Caminho do PNG original
+            alpha: Se False, converte para o formato opaco do display
+        """
+        start = time.perf_counter()
+        surface = self.load_cooked(path) if self.use_cooked else None
+        kind = 'cooked'
+        if surface is None:
+            surface = pygame.image.load(path)
+            kind = 'png'
+            self.load_stats['png_loads'] += 1
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha() if alpha else surface.convert()
+        elif not alpha and pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        self._source_paths[surface] = path
+        self._record_load(path, start, kind)
+        return surface
+
+    def source_path(self, surface):
+        """Retorna o PNG de origem de uma superfície carregada por load_image"""
+        return self._source_paths.get(surface)
+
+    def load_tier_image(self, path, tier_name):
+        """Carrega o blob pré-reduzido de um tier (None se não foi cozido)"""
+        if not self.use_cooked:
+            return None
+        return self.load_cooked(path, tier_name)
+
+    def load_sprite_atlas(self, sheet_path, anim_table, frame_w, frame_h):
+        """
+        Carrega o atlas de quadros de uma spritesheet de personagem
+
+        Usa o atlas cozido quando ele contém todos os quadros do ANIM; caso
+        contrário monta o atlas em memória e descarta a spritesheet completa.
+        """
+        frame_keys = anim_frame_keys(anim_table)
+        if self.use_cooked:
+            start = time.perf_counter()
+            surface, meta = self._map_cooked(sheet_path, 'atlas')
+            if surface is not None:
+                rects = {(f[0], f[1]): tuple(f[2:]) for f in meta['frames']}
+                if all(key in rects for key in frame_keys):
+                    self._record_load(sheet_path, start, 'atlas')
+                    return SpriteAtlas(surface, rects)
+                log_debug(f"Atlas cozido incompleto, remontando: {sheet_path}")
+        sheet = self.load_image(sheet_path)
+        self.load_stats['atlas_builds'] += 1
+        return SpriteAtlas.from_sheet(sheet, frame_keys, frame_w, frame_h)
+
+    def get_load_stats(self):
+        """Retorna estatísticas de carregamento"""
+        return dict(self.load_stats)
+
+# Instâncias globais do pipeline de assets
+asset_cooker = AssetCooker()
+asset_loader = AssetLoader()
+
+def load_image(path, alpha=True):
+    """Carrega imagem do blob cozido ou do PNG"""
+    return asset_loader.load_image(path, alpha)
+
+def load_sprite_atlas(sheet_path, anim_table, frame_w, frame_h):
+    """Carrega o atlas de quadros de animação de uma spritesheet"""
+    return asset_loader.load_sprite_atlas(sheet_path, anim_table, frame_w, frame_h)
+
+def cook_assets(assets_dir=None, force=False):
+    """Cozinha todos os PNGs da pasta de assets"""
+    return asset_cooker.cook_directory(assets_dir, force)
+
+def cook_sprite_atlases(sheet_paths, anim_tables, frame_w, frame_h, force=False):
+    """Cozinha os atlas das spritesheets com a união dos quadros das tabelas ANIM"""
+    cooked = []
+    for sheet_path in sheet_paths:
+        try:
+            if asset_cooker.cook_atlas(sheet_path, anim_tables, frame_w, frame_h, force):
+                cooked.append(os.path.basename(sheet_path))
+        except Exception as e:
+            log_warning(f"Falha ao cozinhar atlas de {sheet_path}: {e}")
+    return cooked
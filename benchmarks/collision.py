@@ -0,0 +1,276 @@
+"""
+Microbenchmarks de colisão do jogo Desprogramados
+Custo por chamada de Player.try_move, detect_vertical_wall, check_on_ground,
+unstick_from_map e MovelPlatform.check_player_on_top nas máscaras reais
+(color_map1.png e paint_colormap.png), com posições gravadas de jogadores em
+rampa, contra parede, no ar, no chão e sobre a plataforma móvel
+
+Uso (na raiz do projeto):
+    python -m benchmarks.collision
+    python -m benchmarks.collision --record     # regrava benchmarks/collision_positions.json
+    python -m benchmarks.collision --compare logs/collision_antes.json
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Primeiro import do jogo: liga os drivers dummy do SDL antes do pygame
+from headless import SceneFinished, ScriptedInput, ScriptedClock
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+import pygame
+from config import GameConfig
+from asset_pipeline import load_image, load_sprite_atlas
+from optimizations import frame_timer
+
+POSITIONS_PATH = os.path.join('benchmarks', 'collision_positions.json')
+CASES = ('ramp', 'wall', 'air', 'ground', 'movel')
+MAX_SAMPLES = 48        # posições guardadas por caso
+REPEATS = 5             # melhor de N medições
+MIN_CALLS = 2000        # chamadas por medição
+
+class ForwardInput(ScriptedInput):
+    """Entrada da gravação: anda para a direita pulando de tempos em tempos (atravessa a fase)"""
+
+    def step(self):
+        self.frame += 1
+        self.held = {ctrl['right'] for ctrl in self.controls}
+        if self.frame % 40 < 6:
+            self.held.update(ctrl['jump'] for ctrl in self.controls)
+        if self.frame % 300 >= 240:
+            # Um trecho para a esquerda a cada 5s para gravar paredes dos dois lados
+            self.held = {ctrl['left'] for ctrl in self.controls}
+
+class Level:
+    """Máscara real de uma fase e as chamadas de colisão com a assinatura de cada minigame"""
+
+    def __init__(self, name):
+        self.name = name
+        if name == 'plataforma':
+            from minigames import plataforma as module
+            self.mask = pygame.mask.from_surface(load_image(module.COLORMAP_PATH))
+            self.draw_mask = None
+            self.movel = module.MovelPlatform(load_image(module.MOVEL_PATH), load_image(module.MOVEL_COLORMAP_PATH))
+        else:
+            from minigames import paint as module
+            self.mask = pygame.mask.from_surface(load_image(module.COLORMAP_PATH))
+            # Sem traços do jogador: só a máscara da fase decide a colisão
+            self.draw_mask = pygame.mask.Mask(self.mask.get_size())
+            self.movel = None
+        self.module = module
+        atlas = load_sprite_atlas(module.SPRITES['Jackson'], module.ANIM, module.SPRITE_W, module.SPRITE_H)
+        self.player = module.Player('Jackson', 0, 0, atlas)
+
+    def masks(self):
+        return (self.mask,) if self.draw_mask is None else (self.mask, self.draw_mask)
+
+    def calls(self):
+        """Nome -> chamada sem argumentos sobre self.player (posição já aplicada)"""
+        player, masks = self.player, self.masks()
+        calls = {
+            'try_move_x': lambda: player.try_move(player.dir, 0, *masks),
+            'try_move_y': lambda: player.try_move(0, 1, *masks),
+            'detect_vertical_wall': lambda: player.detect_vertical_wall(*masks, player.x + player.dir, player.y),
+            'check_on_ground': lambda: player.check_on_ground(*masks),
+            'unstick_from_map': lambda: player.unstick_from_map(*masks),
+        }
+        if self.movel is not None:
+            calls['check_player_on_top'] = lambda: self.movel.check_player_on_top(player)
+        return calls
+
+    def blocked(self):
+        """Se o jogador não consegue dar o próximo passo na direção em que olha (posição restaurada)"""
+        player = self.player
+        x, y = player.x, player.y
+        moved = player.try_move(player.dir, 0, *self.masks())
+        player.x, player.y = x, y
+        return not moved
+
+    def classify(self, previous):
+        """
+        Caso da posição atual do jogador: plataforma móvel, ar, parede (passo
+        bloqueado), rampa (no chão nos dois quadros e y mudou) ou chão
+        """
+        player, masks = self.player, self.masks()
+        if self.movel is not None and self.movel.check_player_on_top(player):
+            return 'movel'
+        if not player.check_on_ground(*masks):
+            return 'air'
+        if self.blocked():
+            return 'wall'
+        if previous is not None and previous[1] != 'air' and previous[0] != player.y:
+            return 'ramp'
+        return 'ground'
+
+def apply_position(player, position):
+    player.x, player.y, player.dir, player.state, player.anim_frame, player.vy = position
+
+# --- Gravação ---
+
+def _scene_locals(function_name):
+    frame = sys._getframe()
+    while frame is not None and frame.f_code.co_name != function_name:
+        frame = frame.f_back
+    return frame.f_locals if frame is not None else None
+
+def record_level(name, frames):
+    """Roda a cena com ForwardInput e amostra as posições dos jogadores a cada quadro"""
+    level = Level(name)
+    scene_function = 'run_plataforma_minigame' if name == 'plataforma' else 'run_paint_minigame'
+    samples = {case: [] for case in CASES}
+    previous = {}
+
+    def on_begin_frame(scene):
+        scene_locals = _scene_locals(scene_function)
+        if not scene_locals or 'players' not in scene_locals:
+            return
+        for player in scene_locals['players']:
+            position = [round(player.x, 2), round(player.y, 2), player.dir, player.state,
+                        player.anim_frame, round(player.vy, 2)]
+            apply_position(level.player, position)
+            case = level.classify(previous.get(player.name))
+            previous[player.name] = (player.y, case)
+            if position not in samples[case]:
+                samples[case].append(position)
+
+    scripted_input = ForwardInput(GameConfig.CONTROLS)
+    scripted_input.install()
+    random.seed(0)
+    frame_timer.begin_hooks.append(on_begin_frame)
+    try:
+        if name == 'plataforma':
+            level.module.run_plataforma_minigame(pygame.display.get_surface(), ScriptedClock(scripted_input, frames))
+        else:
+            level.module.run_paint_minigame(pygame.display.get_surface(), ScriptedClock(scripted_input, frames))
+    except SceneFinished:
+        pass
+    finally:
+        frame_timer.begin_hooks.remove(on_begin_frame)
+
+    if level.movel is not None and not samples['movel']:
+        # A gravação não chegou à plataforma: pés sobre o topo, ao longo da largura dela
+        rect = level.movel.get_rect()
+        for x in range(rect.left + level.module.SPRITE_W // 2, rect.right - level.module.SPRITE_W // 2, 16):
+            for y in (rect.top - level.module.SPRITE_H, rect.top - level.module.SPRITE_H + 8):
+                samples['movel'].append([x, y, 1, 'idle', 0, 0.0])
+    # Espalha as amostras guardadas ao longo da gravação (sem repetir quando há menos que MAX_SAMPLES)
+    spread = {}
+    for case, positions in samples.items():
+        n = min(MAX_SAMPLES, len(positions))
+        if n:
+            spread[case] = [positions[i * len(positions) // n] for i in range(n)]
+    return spread
+
+# --- Medição ---
+
+def measure(level, call, positions):
+    """ns por chamada (melhor de REPEATS), descontado o custo de reposicionar o jogador"""
+    player = level.player
+    calls = max(MIN_CALLS, len(positions))
+    sequence = [positions[i % len(positions)] for i in range(calls)]
+
+    def run(with_call):
+        start = time.perf_counter_ns()
+        if with_call:
+            for position in sequence:
+                apply_position(player, position)
+                call()
+        else:
+            for position in sequence:
+                apply_position(player, position)
+        return time.perf_counter_ns() - start
+
+    overhead = min(run(False) for _ in range(REPEATS))
+    best = min(run(True) for _ in range(REPEATS))
+    return max(0.0, (best - overhead) / calls), calls
+
+def bench(positions_by_level, levels):
+    results = []
+    for name in levels:
+        level = Level(name)
+        for function, call in level.calls().items():
+            for case in CASES:
+                positions = positions_by_level.get(name, {}).get(case)
+                if not positions:
+                    continue
+                ns, calls = measure(level, call, positions)
+                results.append({
+                    'level': name,
+                    'function': function,
+                    'case': case,
+                    'positions': len(positions),
+                    'calls': calls,
+                    'us_per_call': round(ns / 1000, 3)
+                })
+    return results
+
+def compare(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['level'], r['function'], r['case']): r for r in json.load(f)['results']}
+    print(f"\nComparação com {baseline_path} (µs/chamada, negativo = mais rápido):")
+    for result in results:
+        old = baseline.get((result['level'], result['function'], result['case']))
+        if old is None:
+            continue
+        before, after = old['us_per_call'], result['us_per_call']
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"  {result['level']:<11} {result['function']:<21} {result['case']:<7} "
+              f"{before:9.2f} -> {after:9.2f} ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmarks de colisão nas máscaras reais das fases')
+    parser.add_argument('--levels', nargs='+', choices=['plataforma', 'paint'], default=['plataforma', 'paint'])
+    parser.add_argument('--record', action='store_true', help=f'grava novas posições em {POSITIONS_PATH}')
+    parser.add_argument('--record-frames', type=int, default=1800, help='quadros gravados por fase')
+    parser.add_argument('--output', help='arquivo JSON (padrão: logs/collision_<horário>.json)')
+    parser.add_argument('--compare', metavar='JSON', help='resultado anterior para comparar')
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1280, 720))
+
+    if args.record:
+        positions = {}
+        if os.path.exists(POSITIONS_PATH):
+            with open(POSITIONS_PATH, encoding='utf-8') as f:
+                positions = json.load(f)
+        for name in args.levels:
+            positions[name] = record_level(name, args.record_frames)
+            print(f"{name}: " + ', '.join(f"{case} {len(p)}" for case, p in positions[name].items()))
+        with open(POSITIONS_PATH, 'w', encoding='utf-8') as f:
+            json.dump(positions, f, ensure_ascii=False, indent=1)
+        print(f"Posições gravadas em {POSITIONS_PATH}")
+        return
+
+    with open(POSITIONS_PATH, encoding='utf-8') as f:
+        positions = json.load(f)
+    results = bench(positions, args.levels)
+    print(f"{'fase':<11} {'função':<21} {'caso':<7} {'µs/chamada':>10}")
+    for result in results:
+        print(f"{result['level']:<11} {result['function']:<21} {result['case']:<7} {result['us_per_call']:10.2f}")
+
+    output = args.output or os.path.join('logs', f"collision_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(),
+            'pygame': pygame.version.ver,
+            'repeats': REPEATS,
+            'results': results
+        }, f, ensure_ascii=False, indent=2)
+    print(f"Resultado em {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Benchmark das cenas do jogo Desprogramados
+Roda plataforma, paint e begin sem janela, com entrada roteirizada, por um
+número fixo de quadros em vários tamanhos de janela e grava em JSON o tempo
+de simulação (input + física) e de render + present por quadro
+
+Uso (na raiz do projeto):
+    python -m benchmarks.scenes
+    python -m benchmarks.scenes --scenes plataforma --sizes 1280x720 --compare logs/bench_antes.json
+    python -m benchmarks.scenes --scenes plataforma --drones 2000
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Primeiro import do jogo: liga os drivers dummy do SDL antes do pygame
+from headless import SceneFinished, ScriptedInput, ScriptedClock
+
+import argparse
+import json
+import platform
+import random
+from datetime import datetime
+import pygame
+from config import GameConfig
+from optimizations import RingBuffer, frame_timer
+
+SIM_STAGES = ('input', 'physics')
+RENDER_STAGES = ('render', 'present')
+
+def _run_begin(screen, clock):
+    from minigames.paint import run_begin_minigame
+    return run_begin_minigame(screen, clock, 'assets/begin.png', 'assets/begin_colormap.png', None, None)
+
+def _run_paint(screen, clock):
+    from minigames.paint import run_paint_minigame
+    return run_paint_minigame(screen, clock)
+
+def _run_plataforma(screen, clock):
+    from minigames.plataforma import run_plataforma_minigame
+    return run_plataforma_minigame(screen, clock)
+
+SCENES = {
+    'plataforma': _run_plataforma,
+    'paint': _run_paint,
+    'begin': _run_begin,
+}
+
+class StageCollector:
+    """Listener do FrameTimer: guarda sim e render+present de cada quadro após o aquecimento"""
+
+    def __init__(self, frames, warmup_frames):
+        self.warmup_frames = warmup_frames
+        self.seen = 0
+        self.sim = RingBuffer(frames)
+        self.render = RingBuffer(frames)
+
+    def __call__(self, scene, stages):
+        self.seen += 1
+        if self.seen <= self.warmup_frames:
+            return
+        self.sim.append(sum(stages.get(stage, 0.0) for stage in SIM_STAGES))
+        self.render.append(sum(stages.get(stage, 0.0) for stage in RENDER_STAGES))
+
+def _summary(buffer):
+    stats = buffer.percentiles((50, 95, 99))
+    return {
+        'mean': round(buffer.mean(), 3),
+        'p50': round(stats['p50'], 3),
+        'p95': round(stats['p95'], 3),
+        'p99': round(stats['p99'], 3),
+        'max': round(stats['max'], 3)
+    }
+
+def bench_scene(name, size, frames, warmup_frames):
+    """
+    Roda uma cena num tamanho de janela e devolve os tempos por quadro (ms);
+    se a cena levantar exceção (ex.: asset faltando), devolve o erro no lugar
+    """
+    screen = pygame.display.set_mode(size)
+    random.seed(0)
+    scripted_input = ScriptedInput(GameConfig.CONTROLS)
+    scripted_input.install()
+    # Um quadro a mais: o último só é fechado no begin_frame seguinte
+    clock = ScriptedClock(scripted_input, warmup_frames + frames + 1)
+    collector = StageCollector(frames, warmup_frames)
+    frame_timer.listeners.append(collector)
+    try:
+        result = SCENES[name](screen, clock)
+    except SceneFinished:
+        result = None
+    except Exception as e:
+        return {
+            'scene': name,
+            'window': f'{size[0]}x{size[1]}',
+            'frames': len(collector.sim),
+            'error': f'{type(e).__name__}: {e}'
+        }
+    finally:
+        frame_timer.listeners.remove(collector)
+    sim = _summary(collector.sim)
+    render = _summary(collector.render)
+    return {
+        'scene': name,
+        'window': f'{size[0]}x{size[1]}',
+        'frames': len(collector.sim),
+        'ended_early': result is not None,
+        'sim_ms': sim,
+        'render_present_ms': render,
+        'total_ms': round(sim['mean'] + render['mean'], 3)
+    }
+
+def compare(results, baseline_path):
+    """Imprime a variação das médias em relação a um JSON anterior"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['scene'], r['window']): r for r in json.load(f)['results']}
+    print(f"\nComparação com {baseline_path} (média ms/quadro, negativo = mais rápido):")
+    for result in results:
+        old = baseline.get((result['scene'], result['window']))
+        if old is None or 'error' in old or 'error' in result:
+            continue
+        parts = []
+        for key in ('sim_ms', 'render_present_ms'):
+            before, after = old[key]['mean'], result[key]['mean']
+            change = (after - before) / before * 100 if before else 0.0
+            parts.append(f"{key[:-3]} {before:.2f} -> {after:.2f} ({change:+.1f}%)")
+        print(f"  {result['scene']:<11} {result['window']:>9}  " + '  '.join(parts))
+
+def _parse_size(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+def main():
+    config = GameConfig.BENCH_CONFIG
+    parser = argparse.ArgumentParser(description='Benchmark das cenas sem janela')
+    parser.add_argument('--scenes', nargs='+', choices=list(SCENES), default=list(SCENES))
+    parser.add_argument('--sizes', nargs='+', type=_parse_size, metavar='LxA',
+                        default=config['window_sizes'], help='tamanhos de janela (ex.: 1280x720)')
+    parser.add_argument('--frames', type=int, default=config['frames'])
+    parser.add_argument('--warmup', type=int, default=config['warmup_frames'])
+    parser.add_argument('--drones', type=int, help='drones na plataforma (padrão: GameConfig.ROBOT_COUNT)')
+    parser.add_argument('--output', help='arquivo JSON (padrão: bench_<horário>.json em BENCH_CONFIG)')
+    parser.add_argument('--compare', metavar='JSON', help='resultado anterior para comparar')
+    args = parser.parse_args()
+
+    if args.drones is not None:
+        from minigames import plataforma
+        plataforma.ROBOT_COUNT = args.drones
+
+    pygame.display.init()
+    pygame.font.init()
+    results = []
+    print(f"{'cena':<11} {'janela':>9} {'sim':>7} {'p95':>7} {'render':>7} {'p95':>7}  ms/quadro")
+    for name in args.scenes:
+        for size in args.sizes:
+            result = bench_scene(name, tuple(size), args.frames, args.warmup)
+            results.append(result)
+            if 'error' in result:
+                # Cena quebrada não derruba as outras: fica no JSON com o erro
+                print(f"{name:<11} {result['window']:>9}  FALHOU: {result['error']}")
+                continue
+            print(f"{name:<11} {result['window']:>9} "
+                  f"{result['sim_ms']['mean']:7.2f} {result['sim_ms']['p95']:7.2f} "
+                  f"{result['render_present_ms']['mean']:7.2f} {result['render_present_ms']['p95']:7.2f}"
+                  f"{'  (cena terminou antes)' if result['ended_early'] else ''}")
+
+    output = args.output or os.path.join(
+        config['output_dir'], f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+            'video_driver': pygame.display.get_driver(),
+            'frames': args.frames,
+            'warmup_frames': args.warmup,
+            'drones': args.drones,
+            'results': results
+        }, f, ensure_ascii=False, indent=2)
+    print(f"Resultado em {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 1 if any('error' in result for result in results) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -111,12 +111,102 @@ class GameConfig:
     # ===== CAMINHOS DE ARQUIVOS =====
     ASSETS_DIR = 'assets'
     MUSIC_DIR = 'music'
+    COOKED_DIR = os.path.join(ASSETS_DIR, 'cooked')
+    CACHE_DIR = 'cache'
     
     SPRITES = {
         'Jackson': os.path.join(ASSETS_DIR, 'jackson.png'),
         'Jean': os.path.join(ASSETS_DIR, 'Jean.png'),
     }
     
+    # ===== ASSETS COZIDOS =====
+    ASSET_CONFIG = {
+        'use_cooked': True,        # carregar blobs crus via mmap quando existirem
+        'cooked_format': 'BGRA',   # mesmo layout de bytes da superfície de display (ARGB8888)
+        'premultiplied': False,
+        'hash_chunk_size': 1024 * 1024,
+        'cooked_tiers': ['720p', '540p']   # versões pré-reduzidas gravadas pelo cooker
+    }
+    
+    # ===== TIERS DE RENDERIZAÇÃO =====
+    # Escala de cada tier em relação à resolução base (coordenadas de mundo continuam em 1920x1080)
+    RENDER_TIERS = {
+        '1080p': 1.0,
+        '720p': 720 / 1080,
+        '540p': 0.5
+    }
+    
+    # ===== FONTES =====
+    FONT_CONFIG = {
+        'cache_file': os.path.join(CACHE_DIR, 'fonts.json'),
+        'negative_ttl': 7 * 24 * 3600  # segundos até procurar de novo uma fonte ausente
+    }
+    
+    # ===== MONITOR DE PERFORMANCE =====
+    PERF_CONFIG = {
+        'metric_history': 300,          # quadros na janela de cada métrica (ring buffer)
+        'overlay_key': pygame.K_F3,     # liga/desliga o overlay de tempos de quadro
+        'overlay_history': 240,         # quadros no gráfico
+        'graph_scale_ms': 50,           # altura do gráfico em ms
+        'text_refresh_ms': 250          # intervalo de atualização dos números
+    }
+    
+    # ===== GRAVADOR DE VOO =====
+    FLIGHT_RECORDER_CONFIG = {
+        'enabled': True,
+        'capacity': 8192,               # registros (~25s de quadros a 60 fps)
+        'dump_key': pygame.K_F9,        # grava o trace atual em logs/
+        'dump_dir': 'logs'
+    }
+    
+    # ===== DETECTOR DE ENGASGOS =====
+    HITCH_CONFIG = {
+        'enabled': True,
+        'budget_multiplier': 4,         # quadro acima de 4x o orçamento (~67ms a 60 fps) é engasgo
+        'poll_ms': 5,                   # intervalo da thread de vigia
+        'stack_depth': 16               # níveis da pilha no relatório
+    }
+    
+    # ===== PROFILER POR CENA =====
+    PROFILER_CONFIG = {
+        'key': pygame.K_F10,            # perfila os próximos quadros da cena atual
+        'frames': 300,
+        'mode': 'cprofile',             # 'cprofile' (.pstats) ou 'sample' (.collapsed); 'both' roda os dois
+                                        # juntos e um mede a sobrecarga do outro (só para uma olhada única)
+        'sample_interval_ms': 1,
+        'output_dir': 'logs'
+    }
+    
+    # ===== MEMÓRIA =====
+    MEMORY_CONFIG = {
+        'rss_sample_frames': 60,        # lê /proc/self/statm a cada N quadros (métrica memory_usage)
+        'tracemalloc': False,           # diffs de tracemalloc entre cenas (também via --tracemalloc)
+        'tracemalloc_frames': 8,        # profundidade das pilhas guardadas pelo tracemalloc
+        'top_diffs': 10                 # linhas por diff no relatório
+    }
+
+    SOAK_CONFIG = {
+        'frames_per_scene': 600,        # quadros de cada cena por ciclo (menu, begin, plataforma, paint)
+        'warmup_cycles': 2,             # ciclos iniciais fora da detecção (caches ainda enchendo)
+        'growth_ratio': 0.8,            # fração de ciclos crescendo para acusar tendência
+        'rss_growth_mb': 8.0,           # crescimento de RSS após o aquecimento considerado vazamento
+        'report_dir': 'logs'            # relatório soak_<horário>.json
+    }
+
+    BENCH_CONFIG = {
+        'frames': 300,                  # quadros medidos por cena e tamanho de janela
+        'warmup_frames': 30,            # quadros descartados no início (tiers e caches enchendo)
+        'window_sizes': [(960, 540), (1080, 720), (1280, 720), (1920, 1080)],
+        'output_dir': 'logs'            # bench_<horário>.json
+    }
+
+    METRICS_CONFIG = {
+        'enabled': False,               # endpoint /metrics (também via --metrics); desligado não importa nada
+        'host': '127.0.0.1',            # só localhost
+        'port': 9464,
+        'report_sections': ()           # seções extras do relatório de performance ('memory' varre o GC)
+    }
+    
     # ===== MÚSICA =====
     MUSIC_FILES = {
         'menu': 'music/menu_theme.ogg',
@@ -153,12 +243,28 @@ class GameConfig:
         'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         'file': 'game.log',
         'max_size': 1024 * 1024,  # 1MB
-        'backup_count': 3
+        'backup_count': 3,
+        'queue_size': 10000,           # registros na fila do logger (cheia = descarta e conta)
+        'compress_rotated': True,      # game.log.N.gz, compactado na thread do logger
+        'rate_window': 10.0,           # segundos: mensagem idêntica do mesmo ponto sai uma vez por janela
+        'site_budget': 20              # registros por ponto de chamada (arquivo:linha) por janela
     }
     
     # ===== ANALYTICS =====
     ANALYTICS_CONFIG = {
         'enabled': True,
         'save_interval': 30,  # segundos
-        'metrics_file': 'analytics.json'
+        'store_file': 'analytics.db',    # SQLite: sessões (upsert da sessão viva) e totais incrementais
+        'legacy_file': 'analytics.json', # formato antigo, importado uma vez se o store estiver vazio
+        'queue_size': 4096,              # eventos na fila da thread de escrita (cheia = descarta e conta)
+        'batch_size': 256,               # eventos por transação
+        'flush_interval': 1.0            # segundos: a thread grava o que houver pelo menos nesse intervalo
+    }
+    
+    # ===== MAPAS DE CALOR DE POSIÇÃO =====
+    HEATMAP_CONFIG = {
+        'enabled': True,        # precisa de NumPy (sem ele as amostras são ignoradas)
+        'cell_size': 32,        # pixels do mapa por célula da grade
+        'sample_every': 1,      # amostra a cada N quadros
+        'output_dir': 'logs'    # PNGs do heatmap_render.py
     } 
\ No newline at end of file
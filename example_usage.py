@@ -138,7 +138,7 @@ def main():
         print("\n=== Todos os exemplos executados com sucesso! ===")
         print("Verifique os arquivos gerados:")
         print("- logs/game.log (logs do jogo)")
-        print("- analytics.json (dados de analytics)")
+        print("- analytics.db (dados de analytics)")
         
     except Exception as e:
         log_error(f"Erro durante execução dos exemplos: {e}")
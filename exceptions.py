@@ -6,6 +6,9 @@ Exceções customizadas para diferentes tipos de erro
 import pygame
 import os
 from logger import log_error, log_critical
+from font_pool import get_sysfont
+from flight_recorder import record_event, dump_flight_recorder
+from analytics import flush_analytics
 
 class GameError(Exception):
     """Exceção base para todos os erros do jogo"""
@@ -141,6 +144,16 @@ def handle_critical_error(error, context=""):
     if context:
         log_critical(f"Contexto: {context}")
     
+    # Linha do tempo dos últimos segundos antes do erro
+    record_event('error', type(error).__name__, {'message': str(error), 'context': context})
+    trace_path = dump_flight_recorder('crash')
+    if trace_path:
+        log_critical(f"Trace do gravador de voo salvo em: {trace_path}")
+    
+    # Sessão e eventos pendentes do analytics gravados antes de um possível crash
+    if not flush_analytics():
+        log_critical("Analytics pendentes não foram gravados a tempo")
+    
     # Aqui você pode adicionar lógica para salvar estado do jogo
     # ou mostrar tela de erro para o usuário
     
@@ -162,7 +175,7 @@ def create_error_surface(error_message, screen_size):
         surface = pygame.Surface(screen_size)
         surface.fill((50, 0, 0))  # Fundo vermelho escuro
         
-        font = pygame.font.SysFont('Arial', 24)
+        font = get_sysfont('Arial', 24)
         
         # Título
         title = font.render("ERRO DO JOGO", True, (255, 255, 255))
@@ -0,0 +1,148 @@
+"""
+Gravador de voo do jogo Desprogramados
+Buffer circular binário, sempre ligado, com os últimos segundos de spans de quadro
+e eventos do jogo; exportado no formato Chrome trace (chrome://tracing, Perfetto)
+"""
+
+import json
+import os
+import struct
+import time
+from datetime import datetime
+from config import GameConfig
+
+# Registro fixo: início (s, perf_counter), duração (ms), id do nome, categoria, fase
+_RECORD = struct.Struct('<ddHBB')
+
+# Fase do evento no formato Chrome trace
+PHASE_SPAN = 0      # 'X' (span completo)
+PHASE_INSTANT = 1   # 'i' (evento pontual)
+_PHASE_CODES = ('X', 'i')
+
+class FlightRecorder:
+    """
+    Buffer circular de registros de tamanho fixo
+
+    Cada registro é escrito com struct.pack_into num bytearray pré-alocado, sem
+    criar objetos por quadro; nomes e categorias viram ids numa tabela interna e
+    só os dados de eventos (dicts já existentes) ficam numa lista paralela.
+    Escrito apenas pela thread principal.
+    """
+
+    def __init__(self, capacity=None):
+        config = GameConfig.FLIGHT_RECORDER_CONFIG
+        self.enabled = config['enabled']
+        self.capacity = capacity or config['capacity']
+        self.dump_dir = config['dump_dir']
+        self.buffer = bytearray(_RECORD.size * self.capacity)
+        self.args = [None] * self.capacity
+        self.index = 0
+        self.count = 0
+        self.names = []
+        self.name_ids = {}
+        self.categories = []
+        self.category_ids = {}
+        self.origin = time.perf_counter()
+        self.origin_wall = time.time()
+
+    def _intern(self, table, ids, value):
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = len(table)
+            table.append(value)
+            ids[value] = value_id
+        return value_id
+
+    def _write(self, phase, category, name, start, duration, args):
+        slot = self.index
+        _RECORD.pack_into(
+            self.buffer, slot * _RECORD.size,
+            start, duration,
+            self._intern(self.names, self.name_ids, name),
+            self._intern(self.categories, self.category_ids, category),
+            phase
+        )
+        self.args[slot] = args
+        self.index = (slot + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def record_span(self, category, name, start, duration_ms, args=None):
+        """Registra um span que começou em `start` (perf_counter) e durou `duration_ms`"""
+        if self.enabled:
+            self._write(PHASE_SPAN, category, name, start, duration_ms, args)
+
+    def record_event(self, category, name, args=None):
+        """Registra um evento pontual agora"""
+        if self.enabled:
+            self._write(PHASE_INSTANT, category, name, time.perf_counter(), 0.0, args)
+
+    def records(self):
+        """Registros do mais antigo para o mais recente: (fase, categoria, nome, início, duração, args)"""
+        first = (self.index - self.count) % self.capacity
+        for i in range(self.count):
+            slot = (first + i) % self.capacity
+            start, duration, name_id, category_id, phase = _RECORD.unpack_from(self.buffer, slot * _RECORD.size)
+            yield phase, self.categories[category_id], self.names[name_id], start, duration, self.args[slot]
+
+    def to_chrome_trace(self):
+        """Converte o buffer para o dicionário do formato Chrome trace-event"""
+        pid = os.getpid()
+        events = [
+            {'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 1, 'args': {'name': 'Desprogramados'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': 1, 'args': {'name': 'main'}}
+        ]
+        for phase, category, name, start, duration, args in self.records():
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': _PHASE_CODES[phase],
+                'ts': round((start - self.origin) * 1e6, 1),
+                'pid': pid,
+                'tid': 1
+            }
+            if phase == PHASE_SPAN:
+                event['dur'] = round(duration * 1000, 1)
+            else:
+                event['s'] = 't'
+            if args:
+                event['args'] = args if isinstance(args, dict) else {'data': args}
+            events.append(event)
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'recorder_start': datetime.fromtimestamp(self.origin_wall).isoformat(),
+                'records': self.count,
+                'capacity': self.capacity
+            }
+        }
+
+    def dump(self, reason='manual'):
+        """
+        Grava o conteúdo atual em logs/trace_<motivo>_<timestamp>.json
+
+        Returns:
+            Caminho do arquivo gravado ou None se falhar
+        """
+        try:
+            os.makedirs(self.dump_dir, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            path = os.path.join(self.dump_dir, f'trace_{reason}_{timestamp}.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+            return path
+        except (OSError, TypeError, ValueError):
+            return None
+
+# Instância global do gravador de voo
+flight_recorder = FlightRecorder()
+
+def record_span(category, name, start, duration_ms, args=None):
+    flight_recorder.record_span(category, name, start, duration_ms, args)
+
+def record_event(category, name, args=None):
+    flight_recorder.record_event(category, name, args)
+
+def dump_flight_recorder(reason='manual'):
+    return flight_recorder.dump(reason)
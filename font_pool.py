@@ -0,0 +1,106 @@
+"""
+Pool de fontes compartilhado para o jogo Desprogramados
+Resolve fontes do sistema uma única vez (cache em disco) e reaproveita os objetos Font
+"""
+
+import json
+import os
+import time
+import pygame
+from logger import log_debug, log_error
+from config import GameConfig
+
+class FontPool:
+    """Cache de caminhos de fontes do sistema e pool de objetos Font por (caminho, tamanho)"""
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file or GameConfig.FONT_CONFIG['cache_file']
+        self.negative_ttl = GameConfig.FONT_CONFIG['negative_ttl']
+        self.fonts = {}
+        self.resolved = None  # carregado do disco no primeiro uso
+        self.stats = {
+            'font_hits': 0,
+            'font_misses': 0,
+            'disk_hits': 0,
+            'system_lookups': 0
+        }
+
+    def _load_cache(self):
+        """Carrega os caminhos resolvidos em execuções anteriores"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self):
+        """Grava o cache de caminhos de forma atômica"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            tmp_path = self.cache_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.resolved, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            log_error(f"Erro ao salvar cache de fontes: {e}")
+
+    def resolve(self, name, bold=False, italic=False):
+        """
+        Resolve o arquivo de uma fonte do sistema
+
+        Returns:
+            Caminho do arquivo ou None para a fonte padrão do pygame
+        """
+        if self.resolved is None:
+            self.resolved = self._load_cache()
+
+        key = f"{name.lower()}|{int(bold)}|{int(italic)}"
+        entry = self.resolved.get(key)
+        if entry is not None:
+            path = entry.get('path')
+            if path and os.path.exists(path):
+                self.stats['disk_hits'] += 1
+                return path
+            # Fonte ausente fica em cache por um tempo, para não varrer o sistema a cada execução
+            if not path and time.time() - entry.get('resolved_at', 0) < self.negative_ttl:
+                self.stats['disk_hits'] += 1
+                return None
+
+        # match_font dispara a varredura de fontes do sistema (fc-list no Linux)
+        self.stats['system_lookups'] += 1
+        path = pygame.font.match_font(name, bold, italic)
+        self.resolved[key] = {'path': path, 'resolved_at': time.time()}
+        self._save_cache()
+        log_debug(f"Fonte '{name}' resolvida para: {path or 'fonte padrão'}")
+        return path
+
+    def get_font(self, path, size):
+        """Retorna a Font compartilhada para (caminho, tamanho)"""
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            self.stats['font_misses'] += 1
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+        else:
+            self.stats['font_hits'] += 1
+        return font
+
+    def get_sysfont(self, name, size, bold=False, italic=False):
+        """Equivalente a pygame.font.SysFont, sem varredura após a primeira execução"""
+        return self.get_font(self.resolve(name, bold, italic), size)
+
+    def get_stats(self):
+        """Retorna estatísticas do pool"""
+        return dict(self.stats, pooled_fonts=len(self.fonts))
+
+# Instância global do pool de fontes
+font_pool = FontPool()
+
+def get_font(path, size):
+    """Font de um arquivo (ex: assets/Pixellari.ttf) compartilhada entre módulos"""
+    return font_pool.get_font(path, size)
+
+def get_sysfont(name, size, bold=False, italic=False):
+    """Font do sistema compartilhada entre módulos"""
+    return font_pool.get_sysfont(name, size, bold, italic)
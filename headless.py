@@ -0,0 +1,95 @@
+"""
+Execução sem janela do jogo Desprogramados
+Driver de vídeo/áudio dummy do SDL, entrada roteirizada e relógio que encerra
+a cena após N quadros; base do teste de resistência e dos benchmarks
+"""
+
+import os
+
+# Sem janela nem áudio: precisa valer antes do primeiro import do pygame
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import math
+import pygame
+
+class SceneFinished(Exception):
+    """Fim do orçamento de quadros da cena no ciclo"""
+
+class _HeldKeys:
+    """Substituto do retorno de pygame.key.get_pressed (indexado pela constante da tecla)"""
+
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+class ScriptedInput:
+    """
+    Entrada roteirizada, avançada um passo por quadro
+
+    Alterna blocos de andar para a direita, pular, andar para a esquerda e
+    parar para todos os jogadores; pinta em círculo com o mouse e aperta
+    espaço de tempos em tempos para avançar os diálogos.
+    """
+
+    BLOCK_FRAMES = 90
+    DIALOG_EVERY = 45
+
+    def __init__(self, controls):
+        self.controls = controls
+        self.frame = 0
+        self.held = set()
+        self.mouse_down = False
+
+    def install(self):
+        pygame.key.get_pressed = lambda: _HeldKeys(self.held)
+        pygame.mouse.get_pressed = lambda num_buttons=3: (self.mouse_down,) + (False,) * (num_buttons - 1)
+        pygame.mouse.get_pos = self.mouse_pos
+
+    def step(self):
+        self.frame += 1
+        block = (self.frame // self.BLOCK_FRAMES) % 4
+        direction = 'right' if block < 2 else 'left'
+        self.held = {ctrl[direction] for ctrl in self.controls}
+        if block in (1, 3) and self.frame % 30 < 5:
+            self.held.update(ctrl['jump'] for ctrl in self.controls)
+        self.mouse_down = block != 3
+        if self.frame % self.DIALOG_EVERY == 0:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0, unicode=' ', scancode=0))
+
+    def mouse_pos(self):
+        surface = pygame.display.get_surface()
+        width, height = surface.get_size() if surface else (1080, 720)
+        angle = self.frame * 0.05
+        radius = min(width, height) * 0.3
+        return (int(width / 2 + radius * math.cos(angle)), int(height / 2 + radius * math.sin(angle)))
+
+class ScriptedClock:
+    """
+    Relógio das cenas no soak: avança a entrada e encerra a cena após N quadros
+
+    Sem `realtime` os quadros não esperam (o soak roda o mais rápido possível).
+    """
+
+    def __init__(self, scripted_input, frames, realtime=False):
+        self.input = scripted_input
+        self.frames = frames
+        self.realtime = realtime
+        self.count = 0
+        self.clock = pygame.time.Clock()
+
+    def tick(self, framerate=0):
+        self.count += 1
+        self.input.step()
+        elapsed = self.clock.tick(framerate if self.realtime else 0)
+        if self.count >= self.frames:
+            raise SceneFinished()
+        return elapsed
+
+    def get_time(self):
+        return self.clock.get_time()
+
+    def get_fps(self):
+        return self.clock.get_fps()
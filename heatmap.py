@@ -0,0 +1,95 @@
+"""
+Mapas de calor de posição dos jogadores do jogo Desprogramados
+Grade grossa (ex.: células de 32px) por fase em NumPy, somada a cada quadro
+pelas cenas, e gravada compactada (zlib + base64) na sessão do analytics.
+NumPy é opcional: sem ele as amostras são ignoradas
+"""
+
+import base64
+import zlib
+from config import GameConfig
+from logger import log_info
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DTYPE = 'uint32'
+
+def encode_grid(grid, cell_size):
+    """Grade -> dict JSON (contagens uint32 compactadas)"""
+    return {
+        'cell': cell_size,
+        'shape': list(grid.shape),
+        'dtype': DTYPE,
+        'samples': int(grid.sum()),
+        'data': base64.b64encode(zlib.compress(grid.astype(DTYPE).tobytes(), 6)).decode('ascii')
+    }
+
+def decode_grid(data):
+    """dict de encode_grid -> grade NumPy"""
+    raw = zlib.decompress(base64.b64decode(data['data']))
+    return np.frombuffer(raw, dtype=data.get('dtype', DTYPE)).reshape(data['shape']).copy()
+
+class HeatmapSnapshot:
+    """Grades copiadas num instante; to_json() compacta (chamado na thread de escrita do analytics)"""
+    __slots__ = ('grids', 'cell_size')
+
+    def __init__(self, grids, cell_size):
+        self.grids = grids
+        self.cell_size = cell_size
+
+    def to_json(self):
+        return {level: encode_grid(grid, self.cell_size) for level, grid in self.grids.items()}
+
+class HeatmapRecorder:
+    """
+    Grades de posição por fase da sessão atual
+
+    record() custa uma soma num elemento da grade por jogador; a grade da
+    fase é criada no primeiro quadro com o tamanho do mapa. As grades
+    acumulam todas as tentativas da fase na sessão.
+    """
+
+    def __init__(self):
+        config = GameConfig.HEATMAP_CONFIG
+        self.enabled = config['enabled'] and np is not None
+        self.cell_size = config['cell_size']
+        self.sample_every = config['sample_every']
+        self.grids = {}   # fase -> grade (linhas, colunas)
+        self.frames = 0
+        if config['enabled'] and np is None:
+            log_info("NumPy não encontrado: mapas de calor de posição desativados")
+
+    def record(self, level, positions, map_size):
+        """Soma posições (x, y) em pixels do mapa; fora do mapa vai para a borda"""
+        if not self.enabled:
+            return
+        self.frames += 1
+        if self.frames % self.sample_every:
+            return
+        grid = self.grids.get(level)
+        if grid is None:
+            rows = -(-map_size[1] // self.cell_size)
+            cols = -(-map_size[0] // self.cell_size)
+            grid = self.grids[level] = np.zeros((rows, cols), dtype=DTYPE)
+        rows, cols = grid.shape
+        cell = self.cell_size
+        for x, y in positions:
+            row = min(max(int(y) // cell, 0), rows - 1)
+            col = min(max(int(x) // cell, 0), cols - 1)
+            grid[row, col] += 1
+
+    def snapshot(self):
+        """Cópia das grades para gravação; a compactação fica com quem grava"""
+        return HeatmapSnapshot({level: grid.copy() for level, grid in self.grids.items()}, self.cell_size)
+
+    def reset(self):
+        self.grids = {}
+
+# Instância global dos mapas de calor
+heatmap_recorder = HeatmapRecorder()
+
+def record_positions(level, positions, map_size):
+    heatmap_recorder.record(level, positions, map_size)
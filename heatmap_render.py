@@ -0,0 +1,123 @@
+"""
+Renderiza os mapas de calor de posição gravados no analytics
+Soma as grades de cada fase nas sessões do store (leitura em fluxo) e grava
+um PNG por fase com o mapa de calor sobre a arte da fase. Precisa de NumPy
+
+Uso:
+    python heatmap_render.py
+    python heatmap_render.py --levels plataforma --last 10 --scale 0.25
+"""
+
+import argparse
+import os
+import sys
+from collections import deque
+from datetime import datetime
+import pygame
+from config import GameConfig
+from analytics_store import AnalyticsStore
+from heatmap import np, decode_grid
+from logger import log_warning
+
+# Camadas de arte desenhadas sob o mapa de calor (mesma ordem da cena)
+LEVEL_ART = {
+    'plataforma': [os.path.join('assets', 'map1.png')],
+    'paint': [os.path.join('assets', 'paint_colormap.png'), os.path.join('assets', 'paint_screen.png')],
+    'begin': [os.path.join('assets', 'begin.png')],
+}
+MAX_ALPHA = 190
+
+def sum_grids(store, levels=None, last=None):
+    """Grades somadas por fase (todas as sessões, ou as `last` mais recentes)"""
+    totals, sessions = {}, 0
+    rows = deque(store.iter_sessions(), maxlen=last) if last else store.iter_sessions()
+    for _, session in rows:
+        heatmaps = session.get('heatmaps') or {}
+        if heatmaps:
+            sessions += 1
+        for level, data in heatmaps.items():
+            if levels and level not in levels:
+                continue
+            grid = decode_grid(data)
+            if level not in totals:
+                totals[level] = [grid.astype('uint64'), data['cell']]
+            elif totals[level][0].shape == grid.shape:
+                totals[level][0] += grid
+            else:
+                log_warning("Mapa de calor de %s ignorado: grade %s difere de %s (célula ou mapa mudou)",
+                            level, grid.shape, totals[level][0].shape)
+    return totals, sessions
+
+def heat_colors(grid):
+    """Contagens -> RGBA (escala log; preto/transparente onde ninguém passou)"""
+    intensity = np.log1p(grid.astype('float64'))
+    peak = intensity.max()
+    if peak > 0:
+        intensity /= peak
+    rgb = np.empty(grid.shape + (3,), dtype='uint8')
+    rgb[..., 0] = np.clip(intensity * 3.0, 0, 1) * 255
+    rgb[..., 1] = np.clip(intensity * 3.0 - 1.0, 0, 1) * 255
+    rgb[..., 2] = np.clip(intensity * 3.0 - 2.0, 0, 1) * 255
+    alpha = np.where(grid > 0, 60 + intensity * (MAX_ALPHA - 60), 0).astype('uint8')
+    return rgb, alpha
+
+def render_level(level, grid, cell_size, scale):
+    """Surface com a arte da fase e o mapa de calor por cima"""
+    layers = [pygame.image.load(path) for path in LEVEL_ART.get(level, []) if os.path.exists(path)]
+    rows, cols = grid.shape
+    size = layers[0].get_size() if layers else (cols * cell_size, rows * cell_size)
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    image.fill((0, 0, 0, 255))
+    for layer in layers:
+        image.blit(layer, (0, 0))
+
+    rgb, alpha = heat_colors(grid)
+    heat = pygame.Surface((cols, rows), pygame.SRCALPHA)
+    # surfarray é (x, y): transpõe a grade (linha, coluna)
+    pygame.surfarray.blit_array(heat, rgb.transpose(1, 0, 2))
+    heat_alpha = pygame.surfarray.pixels_alpha(heat)
+    heat_alpha[...] = alpha.T
+    del heat_alpha
+    image.blit(pygame.transform.scale(heat, (cols * cell_size, rows * cell_size)), (0, 0))
+
+    if scale != 1.0:
+        image = pygame.transform.smoothscale(
+            image, (max(1, int(size[0] * scale)), max(1, int(size[1] * scale)))
+        )
+    return image
+
+def main():
+    config = GameConfig.HEATMAP_CONFIG
+    parser = argparse.ArgumentParser(description='PNGs dos mapas de calor de posição por fase')
+    parser.add_argument('--store', default=GameConfig.ANALYTICS_CONFIG['store_file'])
+    parser.add_argument('--levels', nargs='+', help='fases (padrão: todas com dados)')
+    parser.add_argument('--last', type=int, help='só as N sessões mais recentes')
+    parser.add_argument('--scale', type=float, default=1.0, help='escala do PNG (ex.: 0.25 para a plataforma)')
+    parser.add_argument('--output-dir', default=config['output_dir'])
+    args = parser.parse_args()
+
+    if np is None:
+        print("heatmap_render.py precisa de NumPy (pip install numpy)")
+        return 1
+    if not os.path.exists(args.store):
+        print(f"Store de analytics não encontrado: {args.store}")
+        return 1
+
+    store = AnalyticsStore(args.store)
+    totals, sessions = sum_grids(store, args.levels, args.last)
+    store.close()
+    if not totals:
+        print("Nenhum mapa de calor gravado ainda")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    for level, (grid, cell_size) in sorted(totals.items()):
+        path = os.path.join(args.output_dir, f'heatmap_{level}_{stamp}.png')
+        pygame.image.save(render_level(level, grid, cell_size, args.scale), path)
+        print(f"{level}: {int(grid.sum())} amostras, grade {grid.shape[1]}x{grid.shape[0]} -> {path}")
+    print(f"{sessions} sessões com mapas de calor")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Detector de engasgos do jogo Desprogramados
+Uma thread de vigia amostra a pilha Python da thread principal quando um quadro
+passa várias vezes do orçamento, e o relatório sai pelo logger
+"""
+
+import gc
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from config import GameConfig
+from logger import log_warning, log_debug
+from optimizations import frame_timer
+from asset_pipeline import asset_loader
+from flight_recorder import record_event
+
+class HitchDetector:
+    """
+    Vigia do quadro aberto no FrameTimer
+
+    A thread só lê frame_timer.frame_start e frame_timer.scene (leituras
+    atômicas no CPython) e guarda a amostra; o relatório é montado e logado
+    na thread principal, no begin_frame seguinte.
+    """
+
+    def __init__(self, timer):
+        config = GameConfig.HITCH_CONFIG
+        self.enabled = config['enabled']
+        self.timer = timer
+        self.threshold = config['budget_multiplier'] * 1000.0 / GameConfig.FPS  # ms
+        self.poll_interval = config['poll_ms'] / 1000.0
+        self.stack_depth = config['stack_depth']
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.main_thread_id = threading.main_thread().ident
+        self.pending = deque()
+        self.sampled_frame = None  # frame_start do último quadro amostrado
+        self.signatures = {}       # assinatura da pilha -> ocorrências
+        self.gc_runs = deque(maxlen=32)
+        self._gc_start = None
+        self.stats = {'hitches': 0, 'reported': 0, 'suppressed': 0}
+
+    # --- Ciclo de vida ---
+
+    def start(self):
+        """Inicia a thread de vigia e o registro de coletas do GC"""
+        if not self.enabled or self.thread is not None:
+            return
+        gc.callbacks.append(self._on_gc)
+        self.timer.begin_hooks.append(self.report_pending)
+        self.thread = threading.Thread(target=self._watch, name='hitch-watchdog', daemon=True)
+        self.thread.start()
+        log_debug(f"Detector de engasgos ativo (limite {self.threshold:.0f}ms)")
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.thread = None
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.report_pending in self.timer.begin_hooks:
+            self.timer.begin_hooks.remove(self.report_pending)
+
+    def _on_gc(self, phase, info):
+        """Callback do GC: guarda (início, geração, duração em ms) de cada coleta"""
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            end = time.perf_counter()
+            self.gc_runs.append((self._gc_start, info.get('generation'), (end - self._gc_start) * 1000))
+            self._gc_start = None
+
+    # --- Thread de vigia ---
+
+    def _watch(self):
+        while not self.stop_event.wait(self.poll_interval):
+            frame_start = self.timer.frame_start
+            if frame_start is None or frame_start == self.sampled_frame:
+                continue
+            elapsed = (time.perf_counter() - frame_start) * 1000
+            if elapsed < self.threshold:
+                continue
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame, limit=self.stack_depth)
+            del frame
+            self.sampled_frame = frame_start
+            self.pending.append({
+                'frame_start': frame_start,
+                'scene': self.timer.scene,
+                'elapsed_at_sample': elapsed,
+                'stack': stack
+            })
+
+    # --- Relatório (thread principal) ---
+
+    @staticmethod
+    def _signature(stack):
+        """Identifica a pilha pelos (arquivo, função, linha) de cada nível"""
+        return tuple((f.filename, f.name, f.lineno) for f in stack)
+
+    def report_pending(self, scene=None):
+        """Loga as amostras pendentes (chamado pelo FrameTimer no início de cada quadro)"""
+        while self.pending:
+            sample = self.pending.popleft()
+            self._report(sample)
+
+    def _report(self, sample):
+        frame_start = sample['frame_start']
+        if frame_start == self.timer.last_frame_start and self.timer.last_end is not None:
+            duration = (self.timer.last_end - frame_start) * 1000
+        else:
+            duration = (time.perf_counter() - frame_start) * 1000
+        self.stats['hitches'] += 1
+
+        signature = self._signature(sample['stack'])
+        count = self.signatures.get(signature, 0) + 1
+        self.signatures[signature] = count
+        top = sample['stack'][-1] if sample['stack'] else None
+        where = f"{top.name} ({top.filename.rsplit('/', 1)[-1]}:{top.lineno})" if top else '?'
+        record_event('hitch', sample['scene'] or '-', {'duration_ms': round(duration, 1), 'where': where, 'count': count})
+
+        # Mesma pilha: relatório completo só na 1ª vez, depois nas potências de 2
+        if count > 1:
+            if count & (count - 1) == 0:
+                log_warning(f"ENGASGO repetido ({count}x) em {where}: {duration:.0f}ms na cena {sample['scene']}")
+                self.stats['reported'] += 1
+            else:
+                self.stats['suppressed'] += 1
+            return
+
+        loads = [
+            f"{path} ({ms:.0f}ms, {kind})"
+            for end, path, ms, kind in list(asset_loader.recent_loads)
+            if end >= frame_start
+        ]
+        gc_runs = [
+            f"gen{generation} ({ms:.1f}ms)"
+            for start, generation, ms in list(self.gc_runs)
+            if start >= frame_start
+        ]
+        lines = [
+            f"ENGASGO: quadro de {duration:.0f}ms (limite {self.threshold:.0f}ms) na cena {sample['scene']}",
+            f"  amostrado aos {sample['elapsed_at_sample']:.0f}ms em {where}",
+            f"  assets carregados no quadro: {', '.join(loads) if loads else 'nenhum'}",
+            f"  coletas do GC no quadro: {', '.join(gc_runs) if gc_runs else 'nenhuma'}",
+            "  pilha da thread principal:"
+        ]
+        lines.extend(line.rstrip() for line in traceback.format_list(sample['stack']))
+        log_warning('\n'.join(lines))
+        self.stats['reported'] += 1
+
+    def get_stats(self):
+        """Retorna estatísticas do detector"""
+        return dict(self.stats, unique_stacks=len(self.signatures))
+
+# Instância global do detector de engasgos
+hitch_detector = HitchDetector(frame_timer)
+
+def start_hitch_detector():
+    hitch_detector.start()
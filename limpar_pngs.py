@@ -1,14 +1,54 @@
+"""
+Limpa os PNGs da pasta assets e cozinha os blobs crus e atlas usados em runtime
+Uso: python limpar_pngs.py [--sem-limpeza] [--force]
+"""
+
+import argparse
 import os
 from PIL import Image
 
 ASSETS_DIR = 'assets'
 
-for filename in os.listdir(ASSETS_DIR):
-    if filename.lower().endswith('.png'):
-        path = os.path.join(ASSETS_DIR, filename)
-        try:
-            img = Image.open(path)
-            img.save(path)
-            print(f'Limpo: {filename}')
-        except Exception as e:
-            print(f'Erro ao processar {filename}: {e}') 
\ No newline at end of file
+def limpar_pngs(assets_dir=ASSETS_DIR):
+    """Regrava os PNGs pelo PIL para remover chunks problemáticos (iCCP etc.)"""
+    for filename in os.listdir(assets_dir):
+        if filename.lower().endswith('.png'):
+            path = os.path.join(assets_dir, filename)
+            try:
+                img = Image.open(path)
+                img.save(path)
+                print(f'Limpo: {filename}')
+            except Exception as e:
+                print(f'Erro ao processar {filename}: {e}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Limpa e cozinha os assets do jogo')
+    parser.add_argument('--sem-limpeza', action='store_true', help='não regravar os PNGs pelo PIL')
+    parser.add_argument('--sem-cozimento', action='store_true', help='não gerar os blobs cozidos')
+    parser.add_argument('--force', action='store_true', help='recozinhar mesmo sem mudança de conteúdo')
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    if not args.sem_limpeza:
+        limpar_pngs()
+
+    if not args.sem_cozimento:
+        from asset_pipeline import cook_assets, cook_sprite_atlases
+        stats = cook_assets(ASSETS_DIR, force=args.force)
+        for filename in stats['cooked']:
+            print(f'Cozido: {filename}')
+        for filename in stats['failed']:
+            print(f'Erro ao cozinhar {filename}')
+        print(f"{len(stats['cooked'])} cozidos, {len(stats['skipped'])} inalterados")
+
+        # Atlas com a união dos quadros usados pelas tabelas ANIM dos minigames
+        from minigames import paint, plataforma
+        sheets = sorted(set(paint.SPRITES.values()) | set(plataforma.SPRITES.values()))
+        atlases = cook_sprite_atlases(sheets, [paint.ANIM, plataforma.ANIM],
+                                      paint.SPRITE_W, paint.SPRITE_H, force=args.force)
+        for filename in atlases:
+            print(f'Atlas cozido: {filename}')
+
+if __name__ == '__main__':
+    main()
@@ -3,22 +3,173 @@ Sistema de logging estruturado para o jogo Desprogramados
 Substitui os print() statements por logging profissional
 """
 
+import atexit
+import gzip
 import logging
 import logging.handlers
 import os
+import queue
+import shutil
 import sys
+import threading
 from datetime import datetime
 from config import GameConfig
+from flight_recorder import record_event
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que nunca bloqueia o jogo: com a fila cheia o registro é
+    descartado e contado, e um aviso com o total descartado entra na fila
+    assim que houver espaço
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.lock_counts = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.dropped_by_level = {}
+        self._unreported = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.lock_counts:
+                self.dropped += 1
+                self._unreported += 1
+                self.dropped_by_level[record.levelname] = self.dropped_by_level.get(record.levelname, 0) + 1
+            return
+        self.enqueued += 1
+        if self._unreported:
+            with self.lock_counts:
+                count, self._unreported = self._unreported, 0
+            notice = logging.LogRecord(
+                record.name, logging.WARNING, __file__, 0,
+                f"{count} registros de log descartados (fila cheia)", None, None
+            )
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                with self.lock_counts:
+                    self._unreported += count
+
+class _CallSite:
+    """Estado do limite de um ponto de chamada (arquivo:linha)"""
+    __slots__ = ('window_start', 'emitted', 'last_message', 'last_emit', 'repeats', 'dropped')
+
+    def __init__(self, now):
+        self.window_start = now
+        self.emitted = 0
+        self.last_message = None
+        self.last_emit = now
+        self.repeats = 0   # cópias idênticas suprimidas desde o último registro emitido
+        self.dropped = 0   # registros suprimidos por estourar o orçamento
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita registros repetidos por ponto de chamada
+
+    A mesma mensagem do mesmo arquivo:linha sai uma vez por janela; as cópias
+    são contadas e o próximo registro emitido leva o resumo ("repetida N
+    vezes"). Cada ponto de chamada tem ainda um orçamento de registros por
+    janela, para mensagens que mudam a cada quadro (ex.: com números).
+    """
+
+    def __init__(self, window, budget):
+        super().__init__()
+        self.window = window
+        self.budget = budget
+        self.sites = {}
+        self.suppressed = 0
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        message = record.getMessage()
+        now = record.created
+        key = (record.pathname, record.lineno)
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = _CallSite(now)
+            if now - site.window_start >= self.window:
+                site.window_start = now
+                site.emitted = 0
+            if message == site.last_message and now - site.last_emit < self.window:
+                site.repeats += 1
+                self.suppressed += 1
+                return False
+            if site.emitted >= self.budget:
+                site.dropped += 1
+                self.suppressed += 1
+                return False
+            summary = self._summary(site, message, now)
+            site.repeats = site.dropped = 0
+            site.last_message = message
+            site.last_emit = now
+            site.emitted += 1
+        if summary:
+            record.msg = f"{message} [{summary}]"
+            record.args = None
+        return True
+
+    @staticmethod
+    def _counts(site, repeated='repetida'):
+        parts = []
+        if site.repeats:
+            parts.append(f"{repeated} {site.repeats} vezes")
+        if site.dropped:
+            parts.append(f"{site.dropped} registros suprimidos")
+        return parts
+
+    def _summary(self, site, message, now):
+        repeated = 'repetida' if message == site.last_message else 'mensagem anterior repetida'
+        parts = self._counts(site, repeated)
+        if parts:
+            parts.append(f"em {now - site.last_emit:.1f}s")
+        return ', '.join(parts)
+
+    def pending_summaries(self):
+        """Resumos ainda não emitidos (para o fim da execução)"""
+        with self.lock:
+            pending = []
+            for (path, line), site in self.sites.items():
+                parts = self._counts(site)
+                if parts:
+                    pending.append(f"{os.path.basename(path)}:{line} '{site.last_message}' {', '.join(parts)}")
+                    site.repeats = site.dropped = 0
+            return pending
+
+def _gzip_namer(name):
+    return name + '.gz'
+
+def _gzip_rotator(source, dest):
+    """Compacta o log rotacionado (roda na thread do QueueListener, fora do jogo)"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
 
 class GameLogger:
-    """Sistema de logging centralizado para o jogo"""
+    """
+    Sistema de logging centralizado para o jogo
+
+    O jogo só enfileira registros (BoundedQueueHandler); console, arquivo,
+    rotação e compactação ficam na thread do QueueListener.
+    """
     
     def __init__(self, name="Desprogramados"):
         self.name = name
+        self.queue_handler = None
+        self.rate_filter = None
+        self.listener = None
         self.logger = self._setup_logger()
+        # Níveis ativos em cache: debug desligado custa só a leitura de um atributo
+        self.debug_enabled = False
+        self.info_enabled = False
+        self.refresh_levels()
         
     def _setup_logger(self):
-        """Configura o logger com handlers para arquivo e console"""
+        """Configura o logger: fila limitada na frente dos handlers de arquivo e console"""
         logger = logging.getLogger(self.name)
         logger.setLevel(getattr(logging, GameConfig.LOG_CONFIG['level']))
         
@@ -33,7 +184,6 @@ class GameLogger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
         
         # Handler para arquivo com rotação
         if not os.path.exists('logs'):
@@ -42,76 +192,178 @@ class GameLogger:
         file_handler = logging.handlers.RotatingFileHandler(
             os.path.join('logs', GameConfig.LOG_CONFIG['file']),
             maxBytes=GameConfig.LOG_CONFIG['max_size'],
-            backupCount=GameConfig.LOG_CONFIG['backup_count']
+            backupCount=GameConfig.LOG_CONFIG['backup_count'],
+            encoding='utf-8'
         )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        if GameConfig.LOG_CONFIG['compress_rotated']:
+            file_handler.namer = _gzip_namer
+            file_handler.rotator = _gzip_rotator
+        
+        # Mensagens repetidas são resumidas antes de entrar na fila
+        self.rate_filter = RateLimitFilter(
+            GameConfig.LOG_CONFIG['rate_window'], GameConfig.LOG_CONFIG['site_budget']
+        )
+        logger.addFilter(self.rate_filter)
+        
+        # O jogo só enfileira; a thread do listener faz a E/S
+        self.queue_handler = BoundedQueueHandler(queue.Queue(GameConfig.LOG_CONFIG['queue_size']))
+        logger.addHandler(self.queue_handler)
+        self.listener = logging.handlers.QueueListener(
+            self.queue_handler.queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.shutdown)
         
         return logger
     
-    def info(self, message):
+    def shutdown(self):
+        """Esvazia a fila e fecha os arquivos (na saída do processo)"""
+        if self.listener is None:
+            return
+        # Os resumos vão direto para a fila: passando pelo logger, o próprio
+        # filtro (um só ponto de chamada) e o nível os descartariam
+        for summary in self.rate_filter.pending_summaries():
+            record = self.logger.makeRecord(
+                self.logger.name, logging.INFO, __file__, 0, "Resumo de log: %s", (summary,), None
+            )
+            try:
+                self.queue_handler.queue.put(self.queue_handler.prepare(record), timeout=1.0)
+            except queue.Full:
+                break
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.flush()
+            handler.close()
+        self.listener = None
+        # Depois do listener parar, registros tardios vão direto para o stderr
+        self.logger.removeHandler(self.queue_handler)
+    
+    def get_stats(self):
+        """Registros enfileirados, descartados e ocupação atual da fila"""
+        if self.queue_handler is None:
+            return {}
+        return {
+            'enqueued': self.queue_handler.enqueued,
+            'dropped': self.queue_handler.dropped,
+            'dropped_by_level': dict(self.queue_handler.dropped_by_level),
+            'suppressed': self.rate_filter.suppressed,
+            'queue_size': self.queue_handler.queue.qsize(),
+            'queue_capacity': self.queue_handler.queue.maxsize
+        }
+    
+    def refresh_levels(self):
+        """Recalcula os níveis ativos (chamar sempre que o nível do logger mudar)"""
+        self.debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        self.info_enabled = self.logger.isEnabledFor(logging.INFO)
+    
+    def set_level(self, level):
+        """Troca o nível do logger ('DEBUG', 'INFO', ... ou número) e atualiza o cache"""
+        self.logger.setLevel(getattr(logging, level) if isinstance(level, str) else level)
+        self.refresh_levels()
+    
+    def _log(self, level, message, args, stacklevel):
+        """
+        Emite um registro; `message` pode ser um callable (só chamado aqui) e
+        `args` seguem o estilo % do logging (formatados só se o registro sair)
+        """
+        if callable(message):
+            message = message()
+        self.logger.log(level, message, *args, stacklevel=stacklevel + 1)
+    
+    def info(self, message, *args, stacklevel=1):
         """Log de informação geral"""
-        self.logger.info(message)
+        if self.info_enabled:
+            self._log(logging.INFO, message, args, stacklevel + 1)
     
-    def debug(self, message):
+    def debug(self, message, *args, stacklevel=1):
         """Log de debug"""
-        self.logger.debug(message)
+        if self.debug_enabled:
+            self._log(logging.DEBUG, message, args, stacklevel + 1)
     
-    def warning(self, message):
+    def warning(self, message, *args, stacklevel=1):
         """Log de aviso"""
-        self.logger.warning(message)
+        self._log(logging.WARNING, message, args, stacklevel + 1)
     
-    def error(self, message):
+    def error(self, message, *args, stacklevel=1):
         """Log de erro"""
-        self.logger.error(message)
+        self._log(logging.ERROR, message, args, stacklevel + 1)
     
-    def critical(self, message):
+    def critical(self, message, *args, stacklevel=1):
         """Log de erro crítico"""
-        self.logger.critical(message)
+        self._log(logging.CRITICAL, message, args, stacklevel + 1)
     
-    def game_event(self, event_type, data=None):
+    def game_event(self, event_type, data=None, stacklevel=1):
         """Log específico para eventos do jogo"""
-        message = f"GAME_EVENT: {event_type}"
+        record_event('game', event_type, data)
+        if not self.info_enabled:
+            return
         if data:
-            message += f" - {data}"
-        self.logger.info(message)
+            self.logger.info("GAME_EVENT: %s - %s", event_type, data, stacklevel=stacklevel + 1)
+        else:
+            self.logger.info("GAME_EVENT: %s", event_type, stacklevel=stacklevel + 1)
     
-    def performance(self, operation, duration):
+    def performance(self, operation, duration, stacklevel=1):
         """Log de performance"""
-        self.logger.debug(f"PERFORMANCE: {operation} took {duration:.3f}ms")
+        if self.debug_enabled:
+            self.logger.debug("PERFORMANCE: %s took %.3fms", operation, duration, stacklevel=stacklevel + 1)
     
-    def player_action(self, player_name, action, position=None):
+    def player_action(self, player_name, action, position=None, stacklevel=1):
         """Log de ações dos jogadores"""
-        message = f"PLAYER_ACTION: {player_name} - {action}"
+        if not self.debug_enabled:
+            return
         if position:
-            message += f" at ({position[0]:.1f}, {position[1]:.1f})"
-        self.logger.debug(message)
+            self.logger.debug("PLAYER_ACTION: %s - %s at (%.1f, %.1f)", player_name, action,
+                              position[0], position[1], stacklevel=stacklevel + 1)
+        else:
+            self.logger.debug("PLAYER_ACTION: %s - %s", player_name, action, stacklevel=stacklevel + 1)
 
 # Instância global do logger
 game_logger = GameLogger()
 
 # Funções de conveniência para uso direto
-def log_info(message):
-    game_logger.info(message)
+# (stacklevel=2: o registro aponta para quem chamou, base do limite por ponto de chamada)
+#
+# Aceitam argumentos adiados no estilo % do logging ou um callable, formatados
+# só se o nível estiver ativo; debug e performance desligados custam uma
+# checagem de flag, então podem ficar no código por quadro:
+#     log_debug("Volume: %d%%", volume)
+#     log_debug(lambda: f"Estado: {estado_caro()}")
+def log_info(message, *args):
+    if game_logger.info_enabled:
+        game_logger._log(logging.INFO, message, args, 2)
 
-def log_debug(message):
-    game_logger.debug(message)
+def log_debug(message, *args):
+    if game_logger.debug_enabled:
+        game_logger._log(logging.DEBUG, message, args, 2)
 
-def log_warning(message):
-    game_logger.warning(message)
+def log_warning(message, *args):
+    game_logger._log(logging.WARNING, message, args, 2)
 
-def log_error(message):
-    game_logger.error(message)
+def log_error(message, *args):
+    game_logger._log(logging.ERROR, message, args, 2)
 
-def log_critical(message):
-    game_logger.critical(message)
+def log_critical(message, *args):
+    game_logger._log(logging.CRITICAL, message, args, 2)
 
 def log_game_event(event_type, data=None):
-    game_logger.game_event(event_type, data)
+    game_logger.game_event(event_type, data, stacklevel=2)
 
 def log_performance(operation, duration):
-    game_logger.performance(operation, duration)
+    if game_logger.debug_enabled:
+        game_logger.performance(operation, duration, stacklevel=2)
 
 def log_player_action(player_name, action, position=None):
-    game_logger.player_action(player_name, action, position) 
\ No newline at end of file
+    if game_logger.debug_enabled:
+        game_logger.player_action(player_name, action, position, stacklevel=2)
+
+def is_debug_enabled():
+    """Para proteger blocos inteiros de diagnóstico que não são só uma mensagem"""
+    return game_logger.debug_enabled
+
+def set_log_level(level):
+    game_logger.set_level(level)
+
+def get_log_stats():
+    return game_logger.get_stats()
@@ -1,10 +1,15 @@
-import pygame
 import sys
 import time
 import math
 import os
+import argparse
 import contextlib
 
+# Primeiro import do jogo: o cronômetro do boot começa aqui
+from startup_profiler import startup_profiler, startup_mark
+import pygame
+startup_mark('import pygame')
+
 # Suprimir avisos libpng no terminal
 class SuppressLibPngWarnings(contextlib.ContextDecorator):
     def __enter__(self):
@@ -19,22 +24,71 @@ with SuppressLibPngWarnings():
 
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-# Importar sistemas de melhoria
 from config import GameConfig
+
+def parse_args():
+    """Opções de linha de comando (argumentos desconhecidos são ignorados)"""
+    parser = argparse.ArgumentParser(description='Desprogramados')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='imprime o tempo de cada fase da inicialização')
+    parser.add_argument('--profile-scene', metavar='CENA',
+                        choices=[GameConfig.GAME_STATES['MENU']] + GameConfig.PHASES,
+                        help='perfila a cena (menu, begin, plataforma, paint) ao entrar nela')
+    parser.add_argument('--profile-frames', type=int, metavar='N',
+                        help='quantidade de quadros perfilados (padrão em PROFILER_CONFIG)')
+    parser.add_argument('--profile-mode', choices=['cprofile', 'sample', 'both'],
+                        help="cprofile ou sample (padrão em PROFILER_CONFIG); 'both' mede um com a sobrecarga do outro")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='inclui diffs de tracemalloc entre cenas no relatório de performance')
+    parser.add_argument('--metrics', action='store_true',
+                        help='serve /metrics (formato Prometheus) em localhost')
+    parser.add_argument('--metrics-port', type=int, metavar='PORTA',
+                        help='porta do /metrics (padrão em METRICS_CONFIG)')
+    args, _ = parser.parse_known_args()
+    return args
+
+ARGS = parse_args()
+startup_profiler.enabled = ARGS.profile_startup
+
+# Importar sistemas de melhoria
 from logger import log_info, log_debug, log_warning, log_error, log_game_event
 from exceptions import safe_resource_load, handle_critical_error, create_error_surface
-from analytics import track_event, track_level_completed, get_analytics_report
+from asset_pipeline import load_image
+from render_tiers import TierCanvas
+from font_pool import get_sysfont
+from analytics import track_event, track_level_completed, track_startup, get_analytics_report, start_analytics
 from optimizations import (
     render_manager, frame_rate_controller, memory_manager, 
-    performance_monitor, update_performance_metrics, get_performance_report
+    performance_monitor, frame_timer, get_performance_report
 )
+from perf_overlay import handle_debug_event, draw_overlay
+from hitch_detector import start_hitch_detector
+from scene_profiler import request_scene_profile
+from memory_tracker import start_tracemalloc
+# Os minigames são importados só ao entrar na fase (fora do caminho até o menu)
+startup_mark('imports do jogo')
 
-from minigames.plataforma import run_plataforma_minigame
-from minigames.paint import run_paint_minigame
+def excepthook(exc_type, exc_value, exc_traceback):
+    """Exceções não tratadas também passam por handle_critical_error (log + trace do gravador de voo)"""
+    if not issubclass(exc_type, (KeyboardInterrupt, SystemExit)):
+        handle_critical_error(exc_value, "Exceção não tratada")
+    sys.__excepthook__(exc_type, exc_value, exc_traceback)
+
+sys.excepthook = excepthook
 
 # Sistema de música simples integrado
 class SimpleMusicManager:
     def __init__(self):
+        # O mixer (dispositivo de áudio) só é aberto quando a primeira música for tocada
+        self.mixer_ready = False
+        self.current_state = None
+        self.volume = GameConfig.AUDIO_CONFIG['default_volume']
+        self.music_enabled = True
+    
+    def _ensure_mixer(self):
+        """Inicializa o mixer sob demanda"""
+        if self.mixer_ready or not self.music_enabled:
+            return self.mixer_ready
         try:
             pygame.mixer.init(
                 frequency=GameConfig.AUDIO_CONFIG['frequency'],
@@ -42,13 +96,12 @@ class SimpleMusicManager:
                 channels=GameConfig.AUDIO_CONFIG['channels'],
                 buffer=GameConfig.AUDIO_CONFIG['buffer']
             )
-            self.current_state = None
-            self.volume = GameConfig.AUDIO_CONFIG['default_volume']
-            self.music_enabled = True
+            self.mixer_ready = True
             log_info("Sistema de música inicializado")
         except pygame.error as e:
             log_error(f"Erro ao inicializar música: {e}")
             self.music_enabled = False
+        return self.mixer_ready
     
     def play_for_state(self, game_state):
         if not self.music_enabled:
@@ -56,6 +109,13 @@ class SimpleMusicManager:
             
         if game_state == self.current_state:
             return
+        
+        if not self._ensure_mixer():
+            return
+        
+        # Uma tentativa por troca de estado: arquivo ausente ou com erro não é
+        # verificado de novo (nem logado) a cada quadro
+        self.current_state = game_state
             
         # Para música atual
         if pygame.mixer.music.get_busy():
@@ -71,7 +131,6 @@ class SimpleMusicManager:
                     pygame.mixer.music.load(music_file)
                     pygame.mixer.music.set_volume(self.volume)
                     pygame.mixer.music.play(-1)  # Loop infinito
-                    self.current_state = game_state
                     log_info(f"Tocando música para: {game_state}")
                     track_event('music_changed', {'state': game_state, 'file': music_file})
                 except pygame.error as e:
@@ -81,14 +140,14 @@ class SimpleMusicManager:
     
     def set_volume(self, volume):
         self.volume = max(0.0, min(1.0, volume))
-        if self.music_enabled:
+        if self.mixer_ready:
             pygame.mixer.music.set_volume(self.volume)
     
     def get_volume(self):
         return self.volume
     
     def toggle_music(self):
-        if not self.music_enabled:
+        if not self.mixer_ready:
             return False
             
         if pygame.mixer.music.get_busy():
@@ -101,16 +160,22 @@ class SimpleMusicManager:
 # Instância global do gerenciador de música
 music_manager = SimpleMusicManager()
 
-pygame.init()
+# Só os módulos usados até o menu; o mixer é aberto pelo music_manager sob demanda
+pygame.display.init()
+pygame.font.init()
+startup_mark('pygame init')
 
 # Resolução base do jogo
 BASE_WIDTH, BASE_HEIGHT = GameConfig.BASE_WIDTH, GameConfig.BASE_HEIGHT
-BASE_SURFACE = pygame.Surface((BASE_WIDTH, BASE_HEIGHT))
 
 # Iniciar em modo janela redimensionável, tamanho inicial 1080x720
 SCREEN = pygame.display.set_mode((1080, 720), pygame.RESIZABLE)
+# Superfície de composição do menu: coordenadas em 1920x1080, pixels no tier da janela
+BASE_SURFACE = TierCanvas(SCREEN.get_size())
 pygame.display.set_caption(GameConfig.WINDOW_TITLE)
-FONT = pygame.font.SysFont('Arial', 32)
+startup_mark('janela')
+FONT = get_sysfont('Arial', 32)
+startup_mark('fontes')
 
 STATE_MENU = GameConfig.GAME_STATES['MENU']
 STATE_BEGIN = GameConfig.GAME_STATES['BEGIN']
@@ -139,7 +204,7 @@ last_time = 0
 
 def load_image_or_exit(path, desc):
     try:
-        return safe_resource_load(pygame.image.load, "imagem", path)
+        return safe_resource_load(load_image, "imagem", path)
     except Exception as e:
         log_error(f'Erro ao carregar {desc} ({path}): {e}')
         handle_critical_error(e, f"Carregamento de {desc}")
@@ -154,12 +219,17 @@ MENU_BG_W, MENU_BG_H = MENU_BG.get_width(), MENU_BG.get_height()
 TITULO_LOGO = load_image_or_exit('assets/titulo.png', 'logo do título')
 TITULO_LOGO_W, TITULO_LOGO_H = TITULO_LOGO.get_width(), TITULO_LOGO.get_height()
 
-# Carregar sprites individuais dos personagens
-PERSONAGEM_SPRITES = [
-    load_image_or_exit('assets/jackson.png', 'sprite Jackson'),
-    load_image_or_exit('assets/Jean.png', 'sprite Jean'),
-    load_image_or_exit('assets/will.png', 'sprite Will'),
+# Sprites individuais dos personagens: spritesheets grandes que o menu não desenha,
+# carregados (com cache) só quando alguém pedir
+PERSONAGEM_SPRITE_PATHS = [
+    ('assets/jackson.png', 'sprite Jackson'),
+    ('assets/Jean.png', 'sprite Jean'),
+    ('assets/will.png', 'sprite Will'),
 ]
+
+def get_personagem_sprites():
+    return [memory_manager.get_texture(path) for path, desc in PERSONAGEM_SPRITE_PATHS]
+
 SPRITE_COLS = GameConfig.SPRITE_COLS
 SPRITE_WIDTH = GameConfig.SPRITE_WIDTH
 SPRITE_HEIGHT = GameConfig.SPRITE_HEIGHT
@@ -170,6 +240,7 @@ JOGAR_BTN = load_image_or_exit('assets/jogar.png', 'botão jogar')
 JOGAR_BTN_W, JOGAR_BTN_H = 419, 217 
 # Variável para controlar a animação do botão jogar
 jogar_btn_animation_scale = 1.0
+startup_mark('assets do menu')
 
 def draw_menu():
     global menu_anim_offset_x, menu_anim_offset_y, last_time, jogar_btn_rect, menu_transition, menu_transition_start, jogar_btn_animation_scale
@@ -335,19 +406,13 @@ def draw_menu():
         menu_anim_offset_y = (menu_anim_offset_y + speed_y) % MENU_BG_H
         offset_x = int(menu_anim_offset_x)
         offset_y = int(menu_anim_offset_y)
-        def tile_bg(bg, alpha_bg=255):
-            temp = pygame.Surface((MENU_BG_W, MENU_BG_H), pygame.SRCALPHA)
-            temp.blit(bg, (0, 0))
-            if alpha_bg < 255:
-                temp.set_alpha(alpha_bg)
+        def tile_bg(bg):
             for y_ in range(-MENU_BG_H, BASE_HEIGHT + MENU_BG_H, MENU_BG_H):
                 for x_ in range(-MENU_BG_W, BASE_WIDTH + MENU_BG_W, MENU_BG_W):
-                    BASE_SURFACE.blit(temp, (x_ + offset_x, y_ + offset_y))
-        tile_bg(MENU_BG, 255)
+                    BASE_SURFACE.blit(bg, (x_ + offset_x, y_ + offset_y))
+        tile_bg(MENU_BG)
         # Sobrepor fade preto
-        fade_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT), pygame.SRCALPHA)
-        fade_surface.fill((0, 0, 0, alpha))
-        BASE_SURFACE.blit(fade_surface, (0, 0))
+        BASE_SURFACE.fill_overlay((0, 0, 0, alpha))
         jogar_btn_rect = None  # botão não existe
         return
     
@@ -384,103 +449,138 @@ def draw_menu():
     jogar_btn_rect = pygame.Rect(btn_x, btn_y, JOGAR_BTN_W, JOGAR_BTN_H)
 
 
-while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
+def start_diagnostics():
+    """Vigia de engasgos e ferramentas pedidas na linha de comando"""
+    # Vigia de engasgos só depois do boot (o primeiro quadro não tem orçamento)
+    start_hitch_detector()
+
+    if ARGS.tracemalloc:
+        start_tracemalloc()
+
+    if ARGS.profile_scene:
+        request_scene_profile(ARGS.profile_frames, ARGS.profile_scene, ARGS.profile_mode)
+
+    if ARGS.metrics or GameConfig.METRICS_CONFIG['enabled']:
+        # Importado só quando ligado: desligado, o endpoint não custa nada
+        from metrics_server import start_metrics_server
+        start_metrics_server(ARGS.metrics_port)
+
+def main_loop():
+    """Loop principal: menu e troca de fases (o import de main só prepara janela e assets)"""
+    global SCREEN, game_state, menu_transition, menu_transition_start
+
+    start_diagnostics()
+    start_analytics()
+
+    while True:
+        frame_timer.begin_frame(game_state)
+        for event in pygame.event.get():
+            handle_debug_event(event)
+            if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            # Controles de música
-            elif event.key == pygame.K_m:  # M para pausar/despausar música
-                music_manager.toggle_music()
-            elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:  # + para aumentar volume
-                current_vol = music_manager.get_volume()
-                music_manager.set_volume(current_vol + 0.1)
-                log_debug(f"Volume: {int(music_manager.get_volume() * 100)}%")
-            elif event.key == pygame.K_MINUS:  # - para diminuir volume
-                current_vol = music_manager.get_volume()
-                music_manager.set_volume(current_vol - 0.1)
-                log_debug(f"Volume: {int(music_manager.get_volume() * 100)}%")
-        if event.type == pygame.VIDEORESIZE:
-            SCREEN = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-        if game_state == STATE_MENU:
-            if not menu_transition:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                    menu_transition = True
-                    menu_transition_start = pygame.time.get_ticks()
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    mx, my = pygame.mouse.get_pos()
-                    window_width, window_height = SCREEN.get_size()
-                    scale = min(window_width / BASE_WIDTH, window_height / BASE_HEIGHT)
-                    scaled_width = int(BASE_WIDTH * scale)
-                    scaled_height = int(BASE_HEIGHT * scale)
-                    x_offset = (window_width - scaled_width) // 2
-                    y_offset = (window_height - scaled_height) // 2
-                    mx_base = int((mx - x_offset) / scale)
-                    my_base = int((my - y_offset) / scale)
-                    if jogar_btn_rect and jogar_btn_rect.collidepoint(mx_base, my_base):
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    pygame.quit()
+                    sys.exit()
+                # Controles de música
+                elif event.key == pygame.K_m:  # M para pausar/despausar música
+                    music_manager.toggle_music()
+                elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:  # + para aumentar volume
+                    current_vol = music_manager.get_volume()
+                    music_manager.set_volume(current_vol + 0.1)
+                    log_debug("Volume: %d%%", music_manager.get_volume() * 100)
+                elif event.key == pygame.K_MINUS:  # - para diminuir volume
+                    current_vol = music_manager.get_volume()
+                    music_manager.set_volume(current_vol - 0.1)
+                    log_debug("Volume: %d%%", music_manager.get_volume() * 100)
+            if event.type == pygame.VIDEORESIZE:
+                SCREEN = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+                BASE_SURFACE.set_window_size(SCREEN.get_size())
+            if game_state == STATE_MENU:
+                if not menu_transition:
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
                         menu_transition = True
                         menu_transition_start = pygame.time.get_ticks()
-            else:
-                # Após 2 segundos, inicia o jogo
-                if pygame.time.get_ticks() - menu_transition_start > GameConfig.FADE_DURATION:
-                    game_state = STATE_BEGIN
-                    menu_transition = False
-                    log_game_event('game_started', {'from': 'menu', 'to': 'begin'})
-    if game_state == STATE_MENU:
-        music_manager.play_for_state('menu')
-        draw_menu()
-    elif game_state == STATE_PAINT:
-        music_manager.play_for_state('paint')
-        level_start_time = time.time()
-        result = run_paint_minigame(SCREEN, clock)
-        if result == 'success':
-            level_time = time.time() - level_start_time
-            track_level_completed('paint', level_time)
-            game_state = STATE_MENU
-            log_game_event('level_completed', {'level': 'paint', 'time': level_time})
-    elif game_state == STATE_BEGIN:
-        music_manager.play_for_state('begin')
-        from minigames.paint import run_begin_minigame
-        level_start_time = time.time()
-        result = run_begin_minigame(
-            SCREEN, clock,
-            'assets/begin.png',
-            'assets/begin_colormap.png',
-            None,
-            None
-        )
-        if result == 'success':
-            level_time = time.time() - level_start_time
-            track_level_completed('begin', level_time)
-            game_state = STATE_PLATAFORMA
-            log_game_event('level_completed', {'level': 'begin', 'time': level_time})
-    elif game_state == STATE_PLATAFORMA:
-        music_manager.play_for_state('plataforma')
-        level_start_time = time.time()
-        result = run_plataforma_minigame(SCREEN, clock)
-        if result == 'success':
-            level_time = time.time() - level_start_time
-            track_level_completed('plataforma', level_time)
-            game_state = STATE_PAINT
-            log_game_event('level_completed', {'level': 'plataforma', 'time': level_time})
-    # Ajuste de proporção e centralização
-    window_width, window_height = SCREEN.get_size()
-    scale = min(window_width / BASE_WIDTH, window_height / BASE_HEIGHT)
-    scaled_width = int(BASE_WIDTH * scale)
-    scaled_height = int(BASE_HEIGHT * scale)
-    scaled_surface = pygame.transform.smoothscale(BASE_SURFACE, (scaled_width, scaled_height))
-    x_offset = (window_width - scaled_width) // 2
-    y_offset = (window_height - scaled_height) // 2
-    SCREEN.fill((0, 0, 0))
-    SCREEN.blit(scaled_surface, (x_offset, y_offset))
-    pygame.display.flip()
-    
-    # Atualizar métricas de performance
-    fps, frame_time = frame_rate_controller.update()
-    update_performance_metrics(fps, frame_time, 0)  # update_time será calculado se necessário
-    
-    clock.tick(GameConfig.FPS)
\ No newline at end of file
+                    if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                        mx, my = pygame.mouse.get_pos()
+                        window_width, window_height = SCREEN.get_size()
+                        scale = min(window_width / BASE_WIDTH, window_height / BASE_HEIGHT)
+                        scaled_width = int(BASE_WIDTH * scale)
+                        scaled_height = int(BASE_HEIGHT * scale)
+                        x_offset = (window_width - scaled_width) // 2
+                        y_offset = (window_height - scaled_height) // 2
+                        mx_base = int((mx - x_offset) / scale)
+                        my_base = int((my - y_offset) / scale)
+                        if jogar_btn_rect and jogar_btn_rect.collidepoint(mx_base, my_base):
+                            menu_transition = True
+                            menu_transition_start = pygame.time.get_ticks()
+                else:
+                    # Após 2 segundos, inicia o jogo
+                    if pygame.time.get_ticks() - menu_transition_start > GameConfig.FADE_DURATION:
+                        game_state = STATE_BEGIN
+                        menu_transition = False
+                        log_game_event('game_started', {'from': 'menu', 'to': 'begin'})
+        frame_timer.mark('input')
+        if game_state == STATE_MENU:
+            music_manager.play_for_state('menu')
+            BASE_SURFACE.set_window_size(SCREEN.get_size())
+            draw_menu()
+            frame_timer.mark('render')
+        elif game_state == STATE_PAINT:
+            music_manager.play_for_state('paint')
+            from minigames.paint import run_paint_minigame
+            level_start_time = time.time()
+            result = run_paint_minigame(SCREEN, clock)
+            if result == 'success':
+                level_time = time.time() - level_start_time
+                track_level_completed('paint', level_time)
+                game_state = STATE_MENU
+                log_game_event('level_completed', {'level': 'paint', 'time': level_time})
+        elif game_state == STATE_BEGIN:
+            music_manager.play_for_state('begin')
+            from minigames.paint import run_begin_minigame
+            level_start_time = time.time()
+            result = run_begin_minigame(
+                SCREEN, clock,
+                'assets/begin.png',
+                'assets/begin_colormap.png',
+                None,
+                None
+            )
+            if result == 'success':
+                level_time = time.time() - level_start_time
+                track_level_completed('begin', level_time)
+                game_state = STATE_PLATAFORMA
+                log_game_event('level_completed', {'level': 'begin', 'time': level_time})
+        elif game_state == STATE_PLATAFORMA:
+            music_manager.play_for_state('plataforma')
+            from minigames.plataforma import run_plataforma_minigame
+            level_start_time = time.time()
+            result = run_plataforma_minigame(SCREEN, clock)
+            if result == 'success':
+                level_time = time.time() - level_start_time
+                track_level_completed('plataforma', level_time)
+                game_state = STATE_PAINT
+                log_game_event('level_completed', {'level': 'plataforma', 'time': level_time})
+        # Ajuste de proporção e centralização
+        BASE_SURFACE.present(SCREEN)
+        draw_overlay(SCREEN)
+        pygame.display.flip()
+        frame_timer.end_frame()
+
+        if startup_profiler.time_to_first_frame is None:
+            time_to_first_frame = startup_profiler.mark_first_frame()
+            track_startup(time_to_first_frame, startup_profiler.get_phases())
+            log_info(f"Primeiro quadro do menu em {time_to_first_frame:.0f}ms")
+            log_debug(startup_profiler.format_report())
+            if startup_profiler.enabled:
+                print(startup_profiler.format_report())
+
+        # Métricas por etapa já foram registradas pelo frame_timer
+        frame_rate_controller.update()
+
+        clock.tick(GameConfig.FPS)
+
+if __name__ == '__main__':
+    main_loop()
@@ -0,0 +1,233 @@
+"""
+Contabilidade de memória do jogo Desprogramados
+Bytes de cada Surface e Mask por dono (caches, cenas), RSS do processo via
+/proc/self/statm e diffs opcionais de tracemalloc entre trocas de cena
+"""
+
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+import pygame
+from config import GameConfig
+from logger import log_debug, log_info
+from asset_pipeline import asset_loader
+from render_tiers import TierCanvas
+from font_pool import font_pool
+from optimizations import (
+    memory_manager, render_manager, performance_monitor, frame_timer, OptimizedSurface
+)
+
+MB = 1024 * 1024
+
+def read_rss():
+    """RSS do processo em bytes (uma leitura de /proc/self/statm), ou None fora do Linux"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def object_bytes(obj):
+    """
+    Bytes de pixels/bits de uma Surface ou Mask
+
+    Subsuperfícies compartilham os pixels do pai e contam 0.
+    """
+    if isinstance(obj, pygame.Surface):
+        if obj.get_parent() is not None:
+            return 0
+        return obj.get_pitch() * obj.get_height()
+    if isinstance(obj, pygame.mask.Mask):
+        width, height = obj.get_size()
+        return (width + 7) // 8 * height
+    return 0
+
+class MemoryTracker:
+    """Contabiliza Surfaces e Masks por dono e acompanha o RSS"""
+
+    def __init__(self):
+        config = GameConfig.MEMORY_CONFIG
+        self.rss_sample_frames = config['rss_sample_frames']
+        self.tracemalloc_frames = config['tracemalloc_frames']
+        self.top_diffs = config['top_diffs']
+        self.owners = {}  # nome -> função que devolve os objetos do dono
+        self.frames_since_sample = 0
+        self.last_scene = None
+        self.last_snapshot = None
+        self.phase_diffs = []  # diffs de tracemalloc entre cenas (mais recentes no fim)
+        if config['tracemalloc']:
+            self.start_tracemalloc()
+
+    def register_owner(self, name, provider):
+        """Registra um dono; `provider()` devolve um iterável de Surfaces/Masks"""
+        self.owners[name] = provider
+
+    # --- RSS (barato, todo N quadros) ---
+
+    def on_begin_frame(self, scene):
+        """Hook do FrameTimer: amostra RSS e marca a troca de cena para o tracemalloc"""
+        self.frames_since_sample += 1
+        if self.frames_since_sample >= self.rss_sample_frames:
+            self.frames_since_sample = 0
+            rss = read_rss()
+            if rss is not None:
+                performance_monitor.add_metric('memory_usage', rss / MB)
+        if scene != self.last_scene:
+            if self.last_scene is not None:
+                self.mark_phase(f"{self.last_scene} -> {scene}")
+            self.last_scene = scene
+
+    # --- tracemalloc (opcional) ---
+
+    def start_tracemalloc(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+            log_info("tracemalloc ativo: diffs de alocação entre cenas no relatório de performance")
+        self.last_snapshot = tracemalloc.take_snapshot()
+
+    def mark_phase(self, label):
+        """Compara as alocações Python com a troca de cena anterior"""
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        diff = {
+            'transition': label,
+            'traced_mb': round(tracemalloc.get_traced_memory()[0] / MB, 2),
+            'top': []
+        }
+        if self.last_snapshot is not None:
+            for stat in snapshot.compare_to(self.last_snapshot, 'lineno')[:self.top_diffs]:
+                frame = stat.traceback[0]
+                diff['top'].append({
+                    'where': f"{frame.filename}:{frame.lineno}",
+                    'size_diff_kb': round(stat.size_diff / 1024, 1),
+                    'count_diff': stat.count_diff
+                })
+        self.last_snapshot = snapshot
+        self.phase_diffs.append(diff)
+        del self.phase_diffs[:-10]
+        log_debug("tracemalloc %s: %sMB rastreados", label, diff['traced_mb'])
+        return diff
+
+    # --- Contabilidade de Surfaces e Masks ---
+
+    @staticmethod
+    def _live_objects():
+        """Surfaces e Masks alcançáveis (elas não são rastreadas pelo GC, então olha os referentes)"""
+        found = {}
+        for container in gc.get_objects():
+            for ref in gc.get_referents(container):
+                if isinstance(ref, (pygame.Surface, pygame.mask.Mask)):
+                    found[id(ref)] = ref
+        return found
+
+    @staticmethod
+    def _scene_locals():
+        """Surfaces e Masks em variáveis locais da pilha da thread principal, por função"""
+        frame = sys._current_frames().get(threading.main_thread().ident)
+        owners = {}
+        while frame is not None:
+            objects = [v for v in frame.f_locals.values()
+                       if isinstance(v, (pygame.Surface, pygame.mask.Mask))]
+            if objects:
+                owners.setdefault(f"locais:{frame.f_code.co_name}", []).extend(objects)
+            frame = frame.f_back
+        return owners
+
+    def account(self, include_unowned=True):
+        """
+        Bytes por dono; cada objeto conta só para o primeiro dono que o reivindicar
+
+        Returns:
+            dict com 'owners' {nome: {surfaces, masks, bytes, mapped_bytes}}, totais e RSS
+        """
+        seen = set()
+        owners = {}
+        mapped = asset_loader.mapped_surfaces
+
+        def add(name, objects):
+            entry = owners.setdefault(name, {'surfaces': 0, 'masks': 0, 'bytes': 0, 'mapped_bytes': 0})
+            for obj in objects:
+                if obj is None or id(obj) in seen:
+                    continue
+                seen.add(id(obj))
+                size = object_bytes(obj)
+                if isinstance(obj, pygame.mask.Mask):
+                    entry['masks'] += 1
+                else:
+                    entry['surfaces'] += 1
+                # Pixels de blobs cozidos ficam no page cache (mmap), fora do heap
+                if obj in mapped:
+                    entry['mapped_bytes'] += size
+                else:
+                    entry['bytes'] += size
+
+        for name, provider in self.owners.items():
+            add(name, provider())
+        for name, objects in self._scene_locals().items():
+            add(name, objects)
+        if include_unowned:
+            add('outros', self._live_objects().values())
+        owners = {name: entry for name, entry in owners.items() if entry['surfaces'] or entry['masks']}
+
+        rss = read_rss()
+        return {
+            'owners': owners,
+            'total_bytes': sum(e['bytes'] for e in owners.values()),
+            'total_mapped_bytes': sum(e['mapped_bytes'] for e in owners.values()),
+            'live_surfaces': sum(e['surfaces'] for e in owners.values()),
+            'live_masks': sum(e['masks'] for e in owners.values()),
+            'rss_bytes': rss
+        }
+
+    def get_report(self):
+        """Seção 'memory' do relatório de performance (valores em MB)"""
+        accounting = self.account()
+        return {
+            'rss_mb': round(accounting['rss_bytes'] / MB, 1) if accounting['rss_bytes'] else None,
+            'surfaces_mb': round(accounting['total_bytes'] / MB, 1),
+            'mapped_mb': round(accounting['total_mapped_bytes'] / MB, 1),
+            'live_surfaces': accounting['live_surfaces'],
+            'live_masks': accounting['live_masks'],
+            'by_owner_mb': {
+                name: round((entry['bytes'] + entry['mapped_bytes']) / MB, 2)
+                for name, entry in sorted(accounting['owners'].items(),
+                                          key=lambda item: -(item[1]['bytes'] + item[1]['mapped_bytes']))
+            },
+            'pooled_fonts': font_pool.get_stats()['pooled_fonts'],
+            'tracemalloc': self.phase_diffs[-3:]
+        }
+
+def _tier_canvas_objects():
+    for canvas in list(TierCanvas.instances):
+        yield canvas.surface
+        yield canvas._overlay
+        yield from list(canvas._tier_cache.values())
+
+def _optimized_surface_objects():
+    for optimized in list(OptimizedSurface.instances):
+        yield optimized.original_surface
+        yield from optimized.scaled_cache.values()
+        yield from optimized.rotated_cache.values()
+
+# Instância global da contabilidade de memória
+memory_tracker = MemoryTracker()
+memory_tracker.register_owner('memory_manager.texturas', lambda: list(memory_manager.texture_cache.values()))
+memory_tracker.register_owner('render_manager.fundos', lambda: list(render_manager.background_cache.values()))
+memory_tracker.register_owner('render_manager.sprites', lambda: list(render_manager.sprite_cache.values()))
+memory_tracker.register_owner('optimized_surface', lambda: list(_optimized_surface_objects()))
+memory_tracker.register_owner('tier_canvas', lambda: list(_tier_canvas_objects()))
+memory_tracker.register_owner('asset_loader', lambda: list(asset_loader._source_paths.keys()))
+frame_timer.begin_hooks.append(memory_tracker.on_begin_frame)
+performance_monitor.report_sections['memory'] = memory_tracker.get_report
+
+def get_memory_report():
+    return memory_tracker.get_report()
+
+def start_tracemalloc():
+    memory_tracker.start_tracemalloc()
@@ -0,0 +1,163 @@
+"""
+Endpoint de métricas do jogo Desprogramados
+Servidor HTTP em thread daemon que expõe /metrics em localhost no formato
+texto do Prometheus (relatório de performance, caches, sessão e etapas do quadro)
+"""
+
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from config import GameConfig
+from logger import log_info, log_error, log_debug, get_log_stats
+from optimizations import (
+    performance_monitor, frame_timer, get_performance_report, get_cache_stats
+)
+from analytics import game_analytics
+from memory_tracker import read_rss
+
+PREFIX = 'desprogramados'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _metric_name(*parts):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', '_'.join([PREFIX] + [str(p) for p in parts]))
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value):
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value in (float('inf'), float('-inf')):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(int(value))
+
+def _flatten(prefix, data, out):
+    """Folhas numéricas de um dict aninhado -> (nome, valor); textos e None ficam de fora"""
+    for key, value in data.items():
+        name = f'{prefix}_{key}'
+        if isinstance(value, dict):
+            _flatten(name, value, out)
+        elif isinstance(value, bool):
+            out.append((name, int(value)))
+        elif isinstance(value, (int, float)):
+            out.append((name, value))
+
+class MetricsFormatter:
+    """Monta o texto de exposição; uma família (# TYPE) por nome de métrica"""
+
+    def __init__(self):
+        self.lines = []
+
+    def gauge(self, name, value, help_text=None, labels=None):
+        if help_text:
+            self.lines.append(f'# HELP {name} {help_text}')
+            self.lines.append(f'# TYPE {name} gauge')
+        if labels:
+            label_text = ','.join(f'{k}="{_label_value(v)}"' for k, v in labels.items())
+            self.lines.append(f'{name}{{{label_text}}} {_format_value(value)}')
+        else:
+            self.lines.append(f'{name} {_format_value(value)}')
+
+    def gauges(self, section, data, help_text):
+        leaves = []
+        _flatten(section, data, leaves)
+        for key, value in leaves:
+            self.gauge(_metric_name(key), value, help_text)
+
+    def text(self):
+        return '\n'.join(self.lines) + '\n'
+
+def render_metrics():
+    """
+    Texto de /metrics
+
+    Roda na thread do servidor e só lê estruturas do jogo; seções caras do
+    relatório (ex.: 'memory', que varre o GC) só entram se listadas em
+    METRICS_CONFIG['report_sections'].
+    """
+    metrics = MetricsFormatter()
+    report = get_performance_report(GameConfig.METRICS_CONFIG['report_sections'])
+
+    scene = report.pop('scene', None)
+    metrics.gauge(_metric_name('scene_info'), 1, 'Cena atual', {'scene': scene or 'none'})
+    metrics.gauges('perf', report, 'Relatório de performance (get_performance_report)')
+    metrics.gauges('cache', get_cache_stats(), 'Estatísticas do cache de texturas (get_cache_stats)')
+    metrics.gauges('session', game_analytics.get_session_summary(), 'Resumo da sessão do analytics')
+    metrics.gauges('log', get_log_stats(), 'Fila do logger (registros enfileirados e descartados)')
+
+    # Percentis por etapa do quadro na janela móvel do PerformanceMonitor
+    name = _metric_name('stage_time_ms')
+    help_text = 'Tempo por etapa do quadro em ms (janela móvel)'
+    stages = dict(frame_timer.STAGE_METRICS, frame='frame_time')
+    for stage, metric_type in stages.items():
+        stats = performance_monitor.get_percentiles(metric_type)
+        for key, value in stats.items():
+            quantile = 1.0 if key == 'max' else int(key[1:]) / 100.0
+            metrics.gauge(name, value, help_text, {'stage': stage, 'quantile': f'{quantile:g}'})
+            help_text = None
+
+    rss = read_rss()
+    if rss is not None:
+        metrics.gauge(_metric_name('rss_bytes'), rss, 'RSS do processo (/proc/self/statm)')
+    return metrics.text()
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        try:
+            body = render_metrics().encode('utf-8')
+        except Exception as e:
+            log_error(f"Erro ao montar /metrics: {e}")
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log_debug(lambda: "/metrics: " + format % args)
+
+class MetricsServer:
+    """Servidor /metrics numa thread daemon; o loop do jogo nunca espera por ele"""
+
+    def __init__(self):
+        config = GameConfig.METRICS_CONFIG
+        self.host = config['host']
+        self.port = config['port']
+        self.server = None
+        self.thread = None
+
+    def start(self, port=None):
+        """Abre a porta e começa a servir; retorna False se a porta não puder ser aberta"""
+        if self.server is not None:
+            return True
+        try:
+            self.server = HTTPServer((self.host, port or self.port), _MetricsHandler)
+        except OSError as e:
+            log_error(f"Endpoint de métricas desativado ({self.host}:{port or self.port}): {e}")
+            return False
+        self.thread = threading.Thread(target=self.server.serve_forever, name='metrics-server', daemon=True)
+        self.thread.start()
+        host, bound_port = self.server.server_address[:2]
+        log_info(f"Métricas em http://{host}:{bound_port}/metrics")
+        return True
+
+    def stop(self):
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        self.thread = None
+
+# Instância global do endpoint de métricas (só criada quando o módulo é importado)
+metrics_server = MetricsServer()
+
+def start_metrics_server(port=None):
+    return metrics_server.start(port)
@@ -2,6 +2,12 @@ import pygame
 import os
 import random
 import math
+from asset_pipeline import load_image, load_sprite_atlas
+from render_tiers import TierCanvas
+from font_pool import get_font, get_sysfont
+from optimizations import frame_timer
+from perf_overlay import handle_debug_event, draw_overlay
+from heatmap import record_positions
 
 SPRITES = {
     'Jackson': os.path.join('assets', 'jackson.png'),
@@ -50,13 +56,15 @@ class Player:
         self.spritesheet = spritesheet
         self.masks = self._make_masks()
         self.visible = True  # Novo atributo para visibilidade
+        self.label = None
+        self.label_font = None
 
     def _make_masks(self):
         masks = {}
         for key, anim in ANIM.items():
             row = anim['row']
             for col in range(anim['frames']):
-                surf = self.spritesheet.subsurface((col*SPRITE_W, row*SPRITE_H, SPRITE_W, SPRITE_H)).convert_alpha()
+                surf = self.spritesheet.get_frame(row, col)
                 masks[(key, col)] = pygame.mask.from_surface(surf)
         return masks
 
@@ -71,7 +79,7 @@ class Player:
 
     def get_surface(self):
         row, frame = self.get_frame()
-        return self.spritesheet.subsurface((frame*SPRITE_W, row*SPRITE_H, SPRITE_W, SPRITE_H)).convert_alpha()
+        return self.spritesheet.get_frame(row, frame)
 
     def rect(self):
         return pygame.Rect(int(self.x - SPRITE_W//2), int(self.y), SPRITE_W, SPRITE_H)
@@ -94,8 +102,11 @@ class Player:
         px = int(self.x - SPRITE_W//2)
         py = int(self.y)
         surf.blit(img, (px, py))
-        label = font.render(self.name, True, (0,255,255))
-        surf.blit(label, (px, py-32))
+        # Nome renderizado uma vez por fonte (superfície estável para o cache do tier)
+        if self.label_font is not font:
+            self.label = font.render(self.name, True, (0,255,255))
+            self.label_font = font
+        surf.blit(self.label, (px, py-32))
 
     def try_move(self, dx, dy, colormap_mask, draw_mask):
         new_x = self.x + dx
@@ -175,18 +186,18 @@ class Player:
 def run_paint_minigame(screen, clock):
     pygame.display.set_caption('Desprogramados - Paint')
     base_width, base_height = 1920, 1080
-    font = pygame.font.SysFont('Arial', 28)
-    spritesheets = {name: pygame.image.load(path).convert_alpha() for name, path in SPRITES.items()}
-    colormap_img = pygame.image.load(COLORMAP_PATH).convert_alpha()
+    font = get_sysfont('Arial', 28)
+    spritesheets = {name: load_sprite_atlas(path, ANIM, SPRITE_W, SPRITE_H) for name, path in SPRITES.items()}
+    colormap_img = load_image(COLORMAP_PATH)
     colormap_mask = pygame.mask.from_surface(colormap_img)
     exit_mask = pygame.mask.from_threshold(colormap_img, (0,0,255,255), (1,1,1,255)) # azul = saída
-    buttons_img = pygame.image.load(BUTTONS_PATH).convert_alpha()
+    buttons_img = load_image(BUTTONS_PATH)
     # --- Remover lógica de erro ---
     # 1. Não carregar erro_img
     # 2. Não criar erro_rects, erro_active
     # 3. Não ativar erro ao clicar no preto
     # 4. Não desenhar erro na tela
-    screen_img = pygame.image.load(SCREEN_PATH).convert_alpha() if os.path.exists(SCREEN_PATH) else None
+    screen_img = load_image(SCREEN_PATH) if os.path.exists(SCREEN_PATH) else None
     players = [
         Player('Jackson', 100, 800, spritesheets['Jackson']),
         Player('Jean', 300, 800, spritesheets['Jean']),
@@ -198,6 +209,14 @@ def run_paint_minigame(screen, clock):
     pygame.draw.circle(draw_layer, (255,0,0,255), (100,100), 30)
     draw_mask = pygame.mask.from_surface(draw_layer)
     mode = 'none' # 'draw', 'erase', 'none', 'erro'
+    # paint_buttons semi-transparente, preparado uma vez fora do loop
+    buttons_alpha = 80
+    buttons_img_alpha = buttons_img.copy()
+    buttons_img_alpha.fill((255,255,255,buttons_alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    # Quadro composto direto na resolução do tier da janela
+    surf = TierCanvas(screen.get_size())
+    # Arte estática já no tier antes do loop (sem redução no primeiro quadro)
+    surf.prepare(colormap_img, screen_img, buttons_img_alpha, *spritesheets.values())
     # Remover erro_img, erro_rects, erro_active, e lógica associada
     # Substituir o bloco de ativação do erro por um pass
     # Exemplo:
@@ -207,8 +226,10 @@ def run_paint_minigame(screen, clock):
     brush_radius = 8  # Pincel menor
     last_draw_pos = None  # Para evitar atualizações desnecessárias
     while running:
+        frame_timer.begin_frame('paint')
         updated_draw = False
         for event in pygame.event.get():
+            handle_debug_event(event)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
@@ -241,7 +262,9 @@ def run_paint_minigame(screen, clock):
             last_draw_pos = None
         if updated_draw:
             draw_mask = pygame.mask.from_surface(draw_layer)
+            surf.invalidate(draw_layer)
         keys = pygame.key.get_pressed()
+        frame_timer.mark('input')
         # Atualização dos jogadores
         for idx, player in enumerate(players):  # Iterar sobre cópia para remoção segura
             ctrl = CONTROLS[idx]
@@ -279,7 +302,10 @@ def run_paint_minigame(screen, clock):
             return 'success'
 
         # Desenho da fase
-        surf = pygame.Surface((base_width, base_height))
+        record_positions('paint', [(p.x, p.y + SPRITE_H) for p in players if p.visible], (base_width, base_height))
+        frame_timer.mark('physics')
+        surf.set_window_size(screen.get_size())
+        surf.fill((0, 0, 0))
         surf.blit(colormap_img, (0,0))  # paint_colormap
         if screen_img:
             surf.blit(screen_img, (0,0))  # paint_screen
@@ -293,31 +319,26 @@ def run_paint_minigame(screen, clock):
         # Exemplo:
         # if erro_active: ... (remover)
         # paint_buttons semi-transparente por cima de tudo
-        buttons_alpha = 80
-        buttons_img_alpha = buttons_img.copy()
-        buttons_img_alpha.fill((255,255,255,buttons_alpha), special_flags=pygame.BLEND_RGBA_MULT)
         surf.blit(buttons_img_alpha, (0,0))
         # paint_buttons invisível, mas clicável
         # Não desenhar visualmente, mas manter a lógica de clique
         # (Nada a fazer aqui, pois já usamos buttons_img.get_at para detecção de clique)
-        window_width, window_height = screen.get_size()
-        if window_width == base_width and window_height == base_height:
-            screen.blit(surf, (0,0))
-        else:
-            scaled_surface = pygame.transform.smoothscale(surf, (window_width, window_height))
-            screen.blit(scaled_surface, (0,0))
+        frame_timer.mark('render')
+        surf.present(screen, keep_aspect=False)
+        draw_overlay(screen)
         pygame.display.flip()
+        frame_timer.end_frame()
         clock.tick(60) 
 
 def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path=None, char_positions=None):
     pygame.display.set_caption('Desprogramados - Paint')
     base_width, base_height = 1920, 1080
-    font = pygame.font.SysFont('Arial', 28)
+    font = get_sysfont('Arial', 28)
     # Fonte do diálogo
     dialog_font_path = os.path.join('assets', 'Pixellari.ttf')
-    dialog_font = pygame.font.Font(dialog_font_path, 50)
+    dialog_font = get_font(dialog_font_path, 50)
     # Caixa de diálogo
-    chat_img = pygame.image.load(os.path.join('assets', 'chat.png')).convert_alpha()
+    chat_img = load_image(os.path.join('assets', 'chat.png'))
     CHAT_W, CHAT_H = 540, 174
     CHAT_TEXT_X, CHAT_TEXT_Y = 270, 87
     CHAT_TEXT_W, CHAT_TEXT_H = 500, 120
@@ -341,13 +362,13 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
     dialog_end_time = None
     auto_run = False
     auto_run_start = None
-    spritesheets = {name: pygame.image.load(path).convert_alpha() for name, path in SPRITES.items()}
-    colormap_img = pygame.image.load(colormap_path).convert_alpha()
+    spritesheets = {name: load_sprite_atlas(path, ANIM, SPRITE_W, SPRITE_H) for name, path in SPRITES.items()}
+    colormap_img = load_image(colormap_path)
     colormap_mask = pygame.mask.from_surface(colormap_img)
     exit_mask = pygame.mask.from_threshold(colormap_img, (0,0,255,255), (1,1,1,255)) # azul = saída
-    buttons_img = pygame.image.load(BUTTONS_PATH).convert_alpha()
-    bg_img = pygame.image.load(bg_path).convert_alpha()
-    screen_img = pygame.image.load(screen_path).convert_alpha() if screen_path and os.path.exists(screen_path) else None
+    buttons_img = load_image(BUTTONS_PATH)
+    bg_img = load_image(bg_path)
+    screen_img = load_image(screen_path) if screen_path and os.path.exists(screen_path) else None
     if char_positions is not None:
         players = [
             Player('Jackson', char_positions[0][0], char_positions[0][1], spritesheets['Jackson']),
@@ -363,6 +384,15 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
     pygame.draw.circle(draw_layer, (255,0,0,255), (100,100), 30)
     draw_mask = pygame.mask.from_surface(draw_layer)
     mode = 'none'
+    # paint_buttons semi-transparente, preparado uma vez fora do loop
+    buttons_alpha = 80
+    buttons_img_alpha = buttons_img.copy()
+    buttons_img_alpha.fill((255,255,255,buttons_alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    # Quadro composto direto na resolução do tier da janela
+    surf = TierCanvas(screen.get_size())
+    # Caixa de diálogo semi-transparente (90% opacidade = 10% transparência)
+    chat_alpha = chat_img.copy()
+    chat_alpha.fill((255, 255, 255, 230), special_flags=pygame.BLEND_RGBA_MULT)  # 230/255 = ~90% opacidade
     running = True
     brush_radius = 8
     # Variáveis para animar o robo_marcha.png na fase begin
@@ -372,13 +402,22 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
     robo_phase = 0.0
     is_begin_phase = os.path.basename(colormap_path) == 'begin_colormap.png'
     if is_begin_phase:
-        robo_img = pygame.image.load(os.path.join('assets', 'robo_marcha.png')).convert_alpha()
+        robo_img = load_image(os.path.join('assets', 'robo_marcha.png'))
         robo_w, robo_h = robo_img.get_width(), robo_img.get_height()
+        robo2_img = load_image(os.path.join('assets', 'robo_marcha2.png'))
+        robo2_w, robo2_h = robo2_img.get_width(), robo2_img.get_height()
         dialog_active = True
         dialog_start_time = pygame.time.get_ticks()
+        surf.prepare(robo_img, robo2_img)
+    else:
+        surf.prepare(colormap_img)
+    # Arte estática já no tier antes do loop (sem redução no primeiro quadro)
+    surf.prepare(bg_img, screen_img, buttons_img_alpha, chat_alpha, *spritesheets.values())
 
     while running:
+        frame_timer.begin_frame('paint_custom')
         for event in pygame.event.get():
+            handle_debug_event(event)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
@@ -429,7 +468,9 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
             elif mode == 'erase':
                 pygame.draw.circle(draw_layer, (0,0,0,0), (mx, my), brush_radius)
             draw_mask = pygame.mask.from_surface(draw_layer)
+            surf.invalidate(draw_layer)
         keys = pygame.key.get_pressed()
+        frame_timer.mark('input')
         for idx, player in enumerate(players):
             ctrl = CONTROLS[idx]
             dx = 0
@@ -474,7 +515,9 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
                 return 'success'
         elif all(not p.visible for p in players):
             return 'success'
-        surf = pygame.Surface((base_width, base_height))
+        frame_timer.mark('physics')
+        surf.set_window_size(screen.get_size())
+        surf.fill((0, 0, 0))
         surf.blit(bg_img, (0,0))
         # Só desenha o colormap se não for o begin_colormap.png
         if not (os.path.basename(colormap_path) == 'begin_colormap.png'):
@@ -496,8 +539,6 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
                     surf.blit(robo_img, (x_tile - robo_offset, y_tile + robo_y_offset))
         # Nova camada: robo_marcha2.png na frente de tudo
         if os.path.basename(colormap_path) == 'begin_colormap.png':
-            robo2_img = pygame.image.load(os.path.join('assets', 'robo_marcha2.png')).convert_alpha()
-            robo2_w, robo2_h = robo2_img.get_width(), robo2_img.get_height()
             if not hasattr(run_paint_minigame_custom, '_robo2_offset'):
                 run_paint_minigame_custom._robo2_offset = 0
                 run_paint_minigame_custom._robo2_phase = 0.0
@@ -549,7 +590,7 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
             font_size = 60  # Revertido de 56 para 48
             min_font_size = 59  # Revertido de 24 para 20
             while font_size >= min_font_size:
-                test_font = pygame.font.Font(dialog_font_path, font_size)
+                test_font = get_font(dialog_font_path, font_size)
                 lines = wrap_text(text, test_font, max_text_width)
                 line_height = test_font.get_linesize()
                 max_lines_by_height = max_text_height // line_height
@@ -557,7 +598,7 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
                 if len(lines) <= max_lines:
                     break
                 font_size -= 2
-            dialog_font_dynamic = pygame.font.Font(dialog_font_path, font_size)
+            dialog_font_dynamic = get_font(dialog_font_path, font_size)
             lines = wrap_text(text, dialog_font_dynamic, max_text_width)
             line_height = dialog_font_dynamic.get_linesize()
             max_lines_by_height = max_text_height // line_height
@@ -565,42 +606,33 @@ def run_paint_minigame_custom(screen, clock, bg_path, colormap_path, screen_path
             lines = lines[:max_lines]
             text_x = chat_x + (CHAT_TEXT_X - (CHAT_W//2)) + padding_left
             text_y = chat_y + (CHAT_TEXT_Y - (CHAT_H//2)) + padding_top
-            # Criar versão semi-transparente do chat (90% opacidade = 10% transparência)
-            chat_alpha = chat_img.copy()
-            chat_alpha.fill((255, 255, 255, 230), special_flags=pygame.BLEND_RGBA_MULT)  # 230/255 = ~90% opacidade
             surf.blit(chat_alpha, (chat_x, chat_y))
+            # Layout em coordenadas base; o texto sai da fonte no tamanho do tier (nítido, sem reescala)
+            tier_font = get_font(dialog_font_path, surf.to_tier(font_size))
             for i, line in enumerate(lines):
-                rendered = dialog_font_dynamic.render(line, True, (0,0,0))
+                rendered = tier_font.render(line, True, (0,0,0))
                 # Centralizar o texto horizontalmente
-                line_width = rendered.get_width()
+                line_width = dialog_font_dynamic.size(line)[0]
                 centered_x = text_x + (max_text_width - line_width) // 2
-                surf.blit(rendered, (centered_x, text_y + i * dialog_font_dynamic.get_linesize()))
+                surf.blit_tier(rendered, (centered_x, text_y + i * dialog_font_dynamic.get_linesize()))
             # Seta para continuar
             # (Removido: não desenhar mais o sinal '>>')
-        buttons_alpha = 80
-        buttons_img_alpha = buttons_img.copy()
-        buttons_img_alpha.fill((255,255,255,buttons_alpha), special_flags=pygame.BLEND_RGBA_MULT)
         surf.blit(buttons_img_alpha, (0,0))
-        window_width, window_height = screen.get_size()
-        scale = min(window_width / base_width, window_height / base_height)
-        scaled_width = int(base_width * scale)
-        scaled_height = int(base_height * scale)
-        scaled_surface = pygame.transform.smoothscale(surf, (scaled_width, scaled_height))
-        x_offset = (window_width - scaled_width) // 2
-        y_offset = (window_height - scaled_height) // 2
-        screen.fill((0,0,0))
-        screen.blit(scaled_surface, (x_offset, y_offset))
+        frame_timer.mark('render')
+        surf.present(screen)
+        draw_overlay(screen)
         pygame.display.flip()
+        frame_timer.end_frame()
         clock.tick(60) 
 
 def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None, char_positions=None):
     """Fase BEGIN separada da fase paint. Copiada de run_paint_minigame_custom, mas dedicada à introdução."""
     pygame.display.set_caption('Desprogramados - Begin')
     base_width, base_height = 1920, 1080
-    font = pygame.font.SysFont('Arial', 56)
+    font = get_sysfont('Arial', 56)
     dialog_font_path = os.path.join('assets', 'Pixellari.ttf')
-    dialog_font = pygame.font.Font(dialog_font_path, 50)
-    chat_img = pygame.image.load(os.path.join('assets', 'chat.png')).convert_alpha()
+    dialog_font = get_font(dialog_font_path, 50)
+    chat_img = load_image(os.path.join('assets', 'chat.png'))
     CHAT_W, CHAT_H = 540, 174
     CHAT_TEXT_X, CHAT_TEXT_Y = 270, 87
     CHAT_TEXT_W, CHAT_TEXT_H = 540, 120
@@ -621,13 +653,13 @@ def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None,
     dialog_end_time = None
     auto_run = False
     auto_run_start = None
-    spritesheets = {name: pygame.image.load(path).convert_alpha() for name, path in SPRITES.items()}
-    colormap_img = pygame.image.load(colormap_path).convert_alpha()
+    spritesheets = {name: load_sprite_atlas(path, ANIM, SPRITE_W, SPRITE_H) for name, path in SPRITES.items()}
+    colormap_img = load_image(colormap_path)
     colormap_mask = pygame.mask.from_surface(colormap_img)
     exit_mask = pygame.mask.from_threshold(colormap_img, (0,0,255,255), (1,1,1,255))
-    buttons_img = pygame.image.load(BUTTONS_PATH).convert_alpha()
-    bg_img = pygame.image.load(bg_path).convert_alpha()
-    screen_img = pygame.image.load(screen_path).convert_alpha() if screen_path and os.path.exists(screen_path) else None
+    buttons_img = load_image(BUTTONS_PATH)
+    bg_img = load_image(bg_path)
+    screen_img = load_image(screen_path) if screen_path and os.path.exists(screen_path) else None
     if char_positions is not None:
         players = [
             Player('Jackson', char_positions[0][0], char_positions[0][1], spritesheets['Jackson']),
@@ -653,12 +685,27 @@ def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None,
     brush_radius = 8
     robo_offset = 0
     robo_speed = 2
-    robo_img = pygame.image.load(os.path.join('assets', 'robo_marcha.png')).convert_alpha()
+    robo_img = load_image(os.path.join('assets', 'robo_marcha.png'))
     robo_w, robo_h = robo_img.get_width(), robo_img.get_height()
+    robo2_img = load_image(os.path.join('assets', 'robo_marcha2.png'))
+    robo2_w, robo2_h = robo2_img.get_width(), robo2_img.get_height()
     robo_phase = 0.0
+    # paint_buttons semi-transparente, preparado uma vez fora do loop
+    buttons_alpha = 80
+    buttons_img_alpha = buttons_img.copy()
+    buttons_img_alpha.fill((255,255,255,buttons_alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    # Quadro composto direto na resolução do tier da janela
+    surf = TierCanvas(screen.get_size())
+    # Caixa de diálogo semi-transparente (90% opacidade = 10% transparência)
+    chat_alpha = chat_img.copy()
+    chat_alpha.fill((255, 255, 255, 230), special_flags=pygame.BLEND_RGBA_MULT)  # 230/255 = ~90% opacidade
+    # Arte estática já no tier antes do loop (sem redução no primeiro quadro)
+    surf.prepare(bg_img, screen_img, buttons_img_alpha, chat_alpha, robo_img, robo2_img, *spritesheets.values())
     dialog_start_time = pygame.time.get_ticks()
     while running:
+        frame_timer.begin_frame('begin')
         for event in pygame.event.get():
+            handle_debug_event(event)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
@@ -687,6 +734,7 @@ def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None,
                 auto_run_start = pygame.time.get_ticks()
                 print("AUTO-RUN ATIVADO! Personagens começando a correr para a direita...")
         keys = pygame.key.get_pressed()
+        frame_timer.mark('input')
         for idx, player in enumerate(players):
             ctrl = CONTROLS[idx]
             dx = 0
@@ -728,28 +776,28 @@ def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None,
                 zoom_duration = 3000  # 3 segundos
                 zoom_start = pygame.time.get_ticks()
                 while pygame.time.get_ticks() - zoom_start < zoom_duration:
+                    frame_timer.begin_frame('begin_zoom')
                     t = (pygame.time.get_ticks() - zoom_start) / zoom_duration
                     zoom = 1.0 + 0.5 * t  # zoom de 1.0 até 1.5
                     zoom_w = int(base_width * zoom)
                     zoom_h = int(base_height * zoom)
-                    zoomed_bg = pygame.transform.smoothscale(bg_img, (zoom_w, zoom_h))
-                    surf = pygame.Surface((base_width, base_height))
-                    surf.blit(zoomed_bg, (-(zoom_w - base_width)//2, -(zoom_h - base_height)//2))
-                    window_width, window_height = screen.get_size()
-                    scale = min(window_width / base_width, window_height / base_height)
-                    scaled_width = int(base_width * scale)
-                    scaled_height = int(base_height * scale)
-                    scaled_surface = pygame.transform.smoothscale(surf, (scaled_width, scaled_height))
-                    x_offset = (window_width - scaled_width) // 2
-                    y_offset = (window_height - scaled_height) // 2
-                    screen.fill((0,0,0))
-                    screen.blit(scaled_surface, (x_offset, y_offset))
+                    surf.set_window_size(screen.get_size())
+                    surf.fill((0, 0, 0))
+                    # Zoom feito a partir da versão do tier do fundo
+                    surf.blit_scaled(bg_img, (-(zoom_w - base_width)//2, -(zoom_h - base_height)//2), (zoom_w, zoom_h))
+                    frame_timer.mark('render')
+                    surf.present(screen)
+                    draw_overlay(screen)
                     pygame.display.flip()
+                    frame_timer.end_frame()
                     clock.tick(60)
                 return 'success'
         elif all(not p.visible for p in players):
             return 'success'
-        surf = pygame.Surface((base_width, base_height))
+        record_positions('begin', [(p.x, p.y + SPRITE_H) for p in players if p.visible], (base_width, base_height))
+        frame_timer.mark('physics')
+        surf.set_window_size(screen.get_size())
+        surf.fill((0, 0, 0))
         surf.blit(bg_img, (0,0))
         if screen_img:
             surf.blit(screen_img, (0,0))
@@ -765,8 +813,6 @@ def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None,
             for y_tile in range(0, base_height, robo_h):
                 for x_tile in range(-robo_w, base_width + robo_w, robo_w):
                     surf.blit(robo_img, (x_tile - robo_offset, y_tile + robo_y_offset))
-        robo2_img = pygame.image.load(os.path.join('assets', 'robo_marcha2.png')).convert_alpha()
-        robo2_w, robo2_h = robo2_img.get_width(), robo2_img.get_height()
         if not hasattr(run_begin_minigame, '_robo2_offset'):
             run_begin_minigame._robo2_offset = 0
             run_begin_minigame._robo2_phase = 0.0
@@ -813,7 +859,7 @@ def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None,
             font_size = 48  # Revertido de 56 para 48
             min_font_size = 20  # Revertido de 24 para 20
             while font_size >= min_font_size:
-                test_font = pygame.font.Font(dialog_font_path, font_size)
+                test_font = get_font(dialog_font_path, font_size)
                 lines = wrap_text(text, test_font, max_text_width)
                 line_height = test_font.get_linesize()
                 max_lines_by_height = max_text_height // line_height
@@ -821,7 +867,7 @@ def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None,
                 if len(lines) <= max_lines:
                     break
                 font_size -= 2
-            dialog_font_dynamic = pygame.font.Font(dialog_font_path, font_size)
+            dialog_font_dynamic = get_font(dialog_font_path, font_size)
             lines = wrap_text(text, dialog_font_dynamic, max_text_width)
             line_height = dialog_font_dynamic.get_linesize()
             max_lines_by_height = max_text_height // line_height
@@ -829,29 +875,20 @@ def run_begin_minigame(screen, clock, bg_path, colormap_path, screen_path=None,
             lines = lines[:max_lines]
             text_x = chat_x + (CHAT_TEXT_X - (CHAT_W//2)) + padding_left
             text_y = chat_y + (CHAT_TEXT_Y - (CHAT_H//2)) + padding_top
-            # Criar versão semi-transparente do chat (90% opacidade = 10% transparência)
-            chat_alpha = chat_img.copy()
-            chat_alpha.fill((255, 255, 255, 230), special_flags=pygame.BLEND_RGBA_MULT)  # 230/255 = ~90% opacidade
             surf.blit(chat_alpha, (chat_x, chat_y))
+            # Layout em coordenadas base; o texto sai da fonte no tamanho do tier (nítido, sem reescala)
+            tier_font = get_font(dialog_font_path, surf.to_tier(font_size))
             for i, line in enumerate(lines):
-                rendered = dialog_font_dynamic.render(line, True, (0,0,0))
+                rendered = tier_font.render(line, True, (0,0,0))
                 # Centralizar o texto horizontalmente
-                line_width = rendered.get_width()
+                line_width = dialog_font_dynamic.size(line)[0]
                 centered_x = text_x + (max_text_width - line_width) // 2
-                surf.blit(rendered, (centered_x, text_y + i * dialog_font_dynamic.get_linesize()))
+                surf.blit_tier(rendered, (centered_x, text_y + i * dialog_font_dynamic.get_linesize()))
             # (Removido: não desenhar mais o sinal '>>' aqui também)
-        buttons_alpha = 80
-        buttons_img_alpha = buttons_img.copy()
-        buttons_img_alpha.fill((255,255,255,buttons_alpha), special_flags=pygame.BLEND_RGBA_MULT)
         surf.blit(buttons_img_alpha, (0,0))
-        window_width, window_height = screen.get_size()
-        scale = min(window_width / base_width, window_height / base_height)
-        scaled_width = int(base_width * scale)
-        scaled_height = int(base_height * scale)
-        scaled_surface = pygame.transform.smoothscale(surf, (scaled_width, scaled_height))
-        x_offset = (window_width - scaled_width) // 2
-        y_offset = (window_height - scaled_height) // 2
-        screen.fill((0,0,0))
-        screen.blit(scaled_surface, (x_offset, y_offset))
+        frame_timer.mark('render')
+        surf.present(screen)
+        draw_overlay(screen)
         pygame.display.flip()
+        frame_timer.end_frame()
         clock.tick(60) 
\ No newline at end of file
@@ -2,6 +2,18 @@ import pygame
 import os
 import random
 import math
+from config import GameConfig
+from asset_pipeline import load_image, load_sprite_atlas
+from render_tiers import TierCanvas
+from font_pool import get_sysfont
+from optimizations import frame_timer, ObjectPool, SpatialHash
+from perf_overlay import handle_debug_event, draw_overlay
+from heatmap import record_positions
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 SPRITES = {
     'Jackson': os.path.join('assets', 'jackson.png'),
@@ -29,7 +41,9 @@ RAMP_TOLERANCE = 5
 ROBOT_W, ROBOT_H = 230, 125
 ROBOT_FRAMES = 2
 ROBOT_SPEED = 8
-ROBOT_COUNT = 20
+ROBOT_COUNT = GameConfig.ROBOT_COUNT  # com NumPy escala para milhares (DroneSwarm)
+
+COLLISION_CELL = 256  # célula do hash espacial de colisão (px)
 
 # Configurações da plataforma móvel
 MOVEL_PATH = os.path.join('assets', 'movel.png')
@@ -69,6 +83,9 @@ class Player:
         self.dir = 1  # 1: direita, -1: esquerda
         self.spritesheet = spritesheet
         self.masks = self._make_masks()
+        self.label = None
+        self.label_font = None
+        self.drone_contacts = []  # drones tocando o jogador neste quadro
 
     def _make_masks(self):
         # Gera máscara para cada quadro do spritesheet
@@ -76,7 +93,7 @@ class Player:
         for key, anim in ANIM.items():
             row = anim['row']
             for col in range(anim['frames']):
-                surf = self.spritesheet.subsurface((col*SPRITE_W, row*SPRITE_H, SPRITE_W, SPRITE_H)).convert_alpha()
+                surf = self.spritesheet.get_frame(row, col)
                 masks[(key, col)] = pygame.mask.from_surface(surf)
         return masks
 
@@ -91,7 +108,7 @@ class Player:
 
     def get_surface(self):
         row, frame = self.get_frame()
-        return self.spritesheet.subsurface((frame*SPRITE_W, row*SPRITE_H, SPRITE_W, SPRITE_H)).convert_alpha()
+        return self.spritesheet.get_frame(row, frame)
 
     def rect(self):
         return pygame.Rect(int(self.x - SPRITE_W//2), int(self.y), SPRITE_W, SPRITE_H)
@@ -114,8 +131,11 @@ class Player:
         px = int(self.x - cam_x - SPRITE_W//2)
         py = int(self.y - cam_y)
         surf.blit(img, (px, py))
-        label = font.render(self.name, True, (0,255,255))
-        surf.blit(label, (px, py-32))
+        # Nome renderizado uma vez por fonte (superfície estável para o cache do tier)
+        if self.label_font is not font:
+            self.label = font.render(self.name, True, (0,255,255))
+            self.label_font = font
+        surf.blit(self.label, (px, py-32))
 
     def try_move(self, dx, dy, colormap_mask):
         # Tenta mover pixel a pixel, respeitando rampas e paredes
@@ -199,18 +219,19 @@ class MovelPlatform:
         self.anim_frame = 0
         self.anim_timer = 0
         self.animation_speed = MOVEL_ANIMATION_SPEED
+        # Subsuperfícies criadas uma vez (sem cópia de pixels a cada quadro)
+        self.frames = [
+            spritesheet.subsurface((i * MOVEL_WIDTH, 0, MOVEL_WIDTH, MOVEL_HEIGHT))
+            for i in range(MOVEL_FRAMES)
+        ]
+        self.invisible_colormap_frame = colormap.subsurface((0, 0, MOVEL_WIDTH, MOVEL_HEIGHT))
         
         # Criar máscara para colisão usando o colormap invisível
         self.mask = pygame.mask.from_surface(self.get_invisible_colormap_frame())
     
     def get_current_frame(self):
         """Retorna o frame atual da animação"""
-        return self.spritesheet.subsurface((
-            self.anim_frame * MOVEL_WIDTH, 
-            0, 
-            MOVEL_WIDTH, 
-            MOVEL_HEIGHT
-        )).convert_alpha()
+        return self.frames[self.anim_frame]
     
     def get_current_colormap_frame(self):
         """Retorna o frame atual do colormap para colisão"""
@@ -226,12 +247,7 @@ class MovelPlatform:
     def get_invisible_colormap_frame(self):
         """Retorna o frame do colormap invisível para colisão"""
         # O colormap invisível sempre usa o frame 0 (primeira coluna)
-        return self.colormap.subsurface((
-            0, 
-            0, 
-            MOVEL_WIDTH, 
-            MOVEL_HEIGHT
-        )).convert_alpha()
+        return self.invisible_colormap_frame
     
     def update(self):
         """Atualiza a animação da plataforma"""
@@ -324,8 +340,11 @@ class MovelPlatform:
         return False
 
 class DroneRobot:
-    def __init__(self, spritesheet, map_width, map_height):
-        self.spritesheet = spritesheet
+    def __init__(self, frames, map_width, map_height):
+        self.reset(frames, map_width, map_height)
+    def reset(self, frames, map_width, map_height):
+        """Sorteia um drone novo (chamado pelo ObjectPool ao reaproveitar)"""
+        self.frames = frames  # subsuperfícies compartilhadas entre todos os drones
         self.x = random.randint(map_width, map_width + 1000)
         self.y_base = random.randint(0, map_height - ROBOT_H)
         self.y = self.y_base
@@ -345,16 +364,169 @@ class DroneRobot:
         self.tilt_phase += 0.08 + random.uniform(-0.01, 0.01)
         self.y = self.y_base + int(10 * math.sin(self.tilt_phase))
     def draw(self, surf, cam_x, cam_y):
-        img = self.spritesheet.subsurface((self.frame*ROBOT_W, 0, ROBOT_W, ROBOT_H)).convert_alpha()
+        img = self.frames[self.frame]
         px = int(self.x - cam_x)
         py = int(self.y - cam_y)
         surf.blit(img, (px, py))
     def is_off_screen(self, cam_x):
         return self.x < cam_x - ROBOT_W
+    def get_rect(self):
+        return pygame.Rect(int(self.x), int(self.y), ROBOT_W, ROBOT_H)
+
+class DroneRobotList:
+    """Drones como objetos DroneRobot (caminho sem NumPy), mesma interface do DroneSwarm"""
+
+    def __init__(self, frames, map_width, map_height, count, spatial_hash=None):
+        self.frames = frames
+        self.map_width = map_width
+        self.map_height = map_height
+        self.count = count
+        self.spatial_hash = spatial_hash
+        # Quem sai pela esquerda volta ao pool e dá lugar a um drone reaproveitado
+        self.pool = ObjectPool(lambda: DroneRobot(frames, map_width, map_height), count, name='drones')
+        self.robots = [self.pool.acquire(frames, map_width, map_height) for _ in range(count)]
+
+    def update(self):
+        robots = self.robots
+        spatial_hash = self.spatial_hash
+        for i, robot in enumerate(robots):
+            robot.update()
+            if robot.is_off_screen(0):
+                if spatial_hash is not None:
+                    spatial_hash.remove(robot)
+                self.pool.release(robot)
+                robot = robots[i] = self.pool.acquire(self.frames, self.map_width, self.map_height)
+            if spatial_hash is not None:
+                spatial_hash.move(robot, robot.x, robot.y, ROBOT_W, ROBOT_H)
+
+    def draw(self, surf, cam_x, cam_y):
+        for robot in self.robots:
+            robot.draw(surf, cam_x, cam_y)
+
+class DroneHandle:
+    """Um drone do DroneSwarm no hash espacial (um por slot, criado uma vez)"""
+    __slots__ = ('swarm', 'slot')
+
+    def __init__(self, swarm, slot):
+        self.swarm = swarm
+        self.slot = slot
+
+    def get_rect(self):
+        swarm, slot = self.swarm, self.slot
+        return pygame.Rect(int(swarm.x[slot]), int(swarm.y[slot]), ROBOT_W, ROBOT_H)
+
+class DroneSwarm:
+    """
+    Enxame de drones em arrays NumPy (um array por atributo do DroneRobot)
+
+    update() avança todos os drones com operações vetorizadas e reaproveita
+    os slots de quem saiu pela esquerda (sem criar objetos); draw() descarta
+    quem está fora da câmera e desenha o resto num único blits. Com um hash
+    espacial, só os drones que mudaram de células no quadro são movidos nele.
+    """
+
+    def __init__(self, frames, map_width, map_height, count, spatial_hash=None):
+        self.frames = frames
+        self.map_width = map_width
+        self.map_height = map_height
+        self.count = count
+        # Semente tirada do random do jogo: benchmarks com random.seed() continuam reproduzíveis
+        self.rng = np.random.default_rng(random.getrandbits(64))
+        self.x = np.empty(count)
+        self.y_base = np.empty(count, dtype=np.int64)
+        self.y = np.empty(count, dtype=np.int64)
+        self.frame = np.empty(count, dtype=np.int64)
+        self.anim_timer = np.empty(count, dtype=np.int64)
+        self.speed = np.empty(count)
+        self.tilt_phase = np.empty(count)
+        self._spawn(np.arange(count))
+        self.y[:] = self.y_base
+        self.spatial_hash = spatial_hash
+        if spatial_hash is not None:
+            self.handles = [DroneHandle(self, slot) for slot in range(count)]
+            self.cells = np.full((4, count), np.iinfo(np.int64).min, dtype=np.int64)
+            self._sync_hash()
+
+    def _spawn(self, slots):
+        """Sorteia novos drones nos slots dados (mesmas faixas do DroneRobot)"""
+        n = len(slots)
+        rng = self.rng
+        self.x[slots] = rng.integers(self.map_width, self.map_width + 1000, n, endpoint=True)
+        self.y_base[slots] = rng.integers(0, self.map_height - ROBOT_H, n, endpoint=True)
+        self.frame[slots] = rng.integers(0, 1, n, endpoint=True)
+        self.anim_timer[slots] = rng.integers(0, 10, n, endpoint=True)
+        self.speed[slots] = ROBOT_SPEED + rng.integers(-2, 2, n, endpoint=True)
+        self.tilt_phase[slots] = rng.uniform(0, 2 * 3.1415, n)
+
+    def update(self):
+        self.x -= self.speed
+        self.anim_timer += 1
+        flip = self.anim_timer >= 10
+        self.frame[flip] = (self.frame[flip] + 1) % ROBOT_FRAMES
+        self.anim_timer[flip] = 0
+        # Tilt vertical suave (senoidal)
+        self.tilt_phase += 0.08 + self.rng.uniform(-0.01, 0.01, self.count)
+        self.y[:] = self.y_base + np.trunc(10 * np.sin(self.tilt_phase)).astype(np.int64)
+        # Quem saiu pela esquerda do mapa volta pela direita no mesmo slot
+        gone = np.flatnonzero(self.x < -ROBOT_W)
+        if len(gone):
+            self._spawn(gone)
+            self.y[gone] = self.y_base[gone]
+        if self.spatial_hash is not None:
+            self._sync_hash()
+
+    def _sync_hash(self):
+        """Move no hash só os drones cuja faixa de células mudou"""
+        spatial_hash = self.spatial_hash
+        size = spatial_hash.cell_size
+        cells = np.stack((
+            self.x // size, self.y // size, (self.x + ROBOT_W) // size, (self.y + ROBOT_H) // size
+        )).astype(np.int64)
+        changed = np.flatnonzero((cells != self.cells).any(axis=0))
+        self.cells = cells
+        handles = self.handles
+        for slot, x, y in zip(changed.tolist(), self.x[changed].tolist(), self.y[changed].tolist()):
+            spatial_hash.move(handles[slot], x, y, ROBOT_W, ROBOT_H)
+
+    def draw(self, surf, cam_x, cam_y):
+        view_w, view_h = surf.get_size()
+        px = (self.x - cam_x).astype(np.int64)
+        py = self.y - int(cam_y)
+        visible = np.flatnonzero((px > -ROBOT_W) & (px < view_w) & (py > -ROBOT_H) & (py < view_h))
+        if not len(visible):
+            return
+        frames = self.frames
+        surf.blits([
+            (frames[frame], (x, y))
+            for frame, x, y in zip(self.frame[visible].tolist(), px[visible].tolist(), py[visible].tolist())
+        ])
+
+def rle_frames(frames):
+    """
+    Cópias dos quadros com RLE: o blit pula os trechos transparentes
+    (~metade do drone), cerca de 6x mais rápido com muitos drones na tela
+    """
+    copies = []
+    for frame in frames:
+        copy = frame.copy()
+        copy.set_alpha(255, pygame.RLEACCEL)
+        copies.append(copy)
+    return copies
+
+def make_drones(frames, map_width, map_height, count=None, spatial_hash=None):
+    """DroneSwarm com NumPy; senão a lista de DroneRobot (ambos mantêm o hash espacial, se dado)"""
+    count = ROBOT_COUNT if count is None else count
+    frames = rle_frames(frames)
+    if np is not None:
+        return DroneSwarm(frames, map_width, map_height, count, spatial_hash)
+    return DroneRobotList(frames, map_width, map_height, count, spatial_hash)
 
 class RoboPiloto:
     def __init__(self, img):
         self.img = img
+        frame_img = img.subsurface((0, 0, ROBO_PILOTO_W, ROBO_PILOTO_H))
+        # Espelhamento pré-calculado para a volta (dir == -1)
+        self.frames = {1: frame_img, -1: pygame.transform.flip(frame_img, True, False)}
         self.x = ROBO_PILOTO_X1
         self.y = ROBO_PILOTO_Y
         self.dir = 1  # 1: direita, -1: esquerda
@@ -366,11 +538,10 @@ class RoboPiloto:
         elif self.x <= ROBO_PILOTO_X1:
             self.x = ROBO_PILOTO_X1
             self.dir = 1
+    def get_rect(self):
+        return pygame.Rect(int(self.x), int(self.y), ROBO_PILOTO_W, ROBO_PILOTO_H)
     def draw(self, surf, cam_x, cam_y):
-        frame_img = self.img.subsurface((0, 0, ROBO_PILOTO_W, ROBO_PILOTO_H)).copy()
-        # Espelhar apenas na volta (dir == -1)
-        if self.dir == -1:
-            frame_img = pygame.transform.flip(frame_img, True, False)
+        frame_img = self.frames[self.dir]
         px = int(self.x - cam_x)
         py = int(self.y - cam_y)
         surf.blit(frame_img, (px, py))
@@ -379,26 +550,32 @@ class RoboPiloto:
 def run_plataforma_minigame(screen, clock):
     pygame.display.set_caption('Desprogramados - Plataforma')
     base_width, base_height = 1920, 1080
-    font = pygame.font.SysFont('Arial', 28)
-    spritesheets = {name: pygame.image.load(path).convert_alpha() for name, path in SPRITES.items()}
-    colormap_img = pygame.image.load(COLORMAP_PATH).convert_alpha()
+    font = get_sysfont('Arial', 28)
+    spritesheets = {name: load_sprite_atlas(path, ANIM, SPRITE_W, SPRITE_H) for name, path in SPRITES.items()}
+    colormap_img = load_image(COLORMAP_PATH)
     colormap_mask = pygame.mask.from_surface(colormap_img)
-    map_img = pygame.image.load(MAP_PATH).convert_alpha()
-    robot_sheet = pygame.image.load(ROBOT_PATH).convert_alpha()
+    map_img = load_image(MAP_PATH)
+    robot_sheet = load_image(ROBOT_PATH)
+    robot_frames = [robot_sheet.subsurface((i*ROBOT_W, 0, ROBOT_W, ROBOT_H)) for i in range(ROBOT_FRAMES)]
     players = [
         Player('Jackson', 200, 350, spritesheets['Jackson']),
         Player('Jean', 350, 350, spritesheets['Jean']),
     ]
-    robo_piloto_img = pygame.image.load(ROBO_PILOTO_PATH).convert_alpha()
+    robo_piloto_img = load_image(ROBO_PILOTO_PATH)
     robo_piloto = RoboPiloto(robo_piloto_img)
     
     # Carregar plataforma móvel
-    movel_img = pygame.image.load(MOVEL_PATH).convert_alpha()
-    movel_colormap_img = pygame.image.load(MOVEL_COLORMAP_PATH).convert_alpha()
+    movel_img = load_image(MOVEL_PATH)
+    movel_colormap_img = load_image(MOVEL_COLORMAP_PATH)
     movel_platform = MovelPlatform(movel_img, movel_colormap_img)
     
     map_w, map_h = colormap_img.get_width(), colormap_img.get_height()
-    robots = [DroneRobot(robot_sheet, map_w, map_h) for _ in range(ROBOT_COUNT)]
+    # Hash espacial com tudo que se move e pode tocar os jogadores
+    collision_hash = SpatialHash(COLLISION_CELL)
+    collision_hash.move(robo_piloto, robo_piloto.x, robo_piloto.y, ROBO_PILOTO_W, ROBO_PILOTO_H)
+    collision_hash.move(movel_platform, movel_platform.x, movel_platform.y, MOVEL_WIDTH, MOVEL_HEIGHT)  # só anima, não sai do lugar
+    robots = make_drones(robot_frames, map_w, map_h, spatial_hash=collision_hash)
+    candidates = []  # reaproveitada em todas as consultas
     running = True
     # Remover variáveis e lógica de transição de céu
     # sky_transition_started = False
@@ -406,14 +583,25 @@ def run_plataforma_minigame(screen, clock):
     # sky_transition_duration = 5000  # 5 segundos em ms
     # sky_switch_delay = 5000  # 5 segundos até começar a transição
     # dia_img = pygame.image.load(os.path.join('assets', 'dia.png')).convert()
-    noite_img = pygame.image.load(os.path.join('assets', 'noite.png')).convert()
+    noite_img = load_image(os.path.join('assets', 'noite.png'), alpha=False)
+    # Quadro composto direto na resolução do tier da janela
+    game_surface = TierCanvas(screen.get_size())
+    instr = font.render('Jackson: A/D/W | Jean: J/L/I | Jean: ←/→/↑', True, (0,255,255))
+    # Arte estática já no tier antes do loop (sem redução no primeiro quadro; o mapa leva ~100ms)
+    game_surface.prepare(
+        noite_img, map_img, instr, *spritesheets.values(), *robots.frames, *robo_piloto.frames.values(),
+        *movel_platform.frames, movel_platform.invisible_colormap_frame
+    )
     # start_time = pygame.time.get_ticks()
     while running:
+        frame_timer.begin_frame('plataforma')
         for event in pygame.event.get():
+            handle_debug_event(event)
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
         keys = pygame.key.get_pressed()
+        frame_timer.mark('input')
         # --- UPDATE PLAYERS ---
         for idx, player in enumerate(players):
             ctrl = CONTROLS[idx]
@@ -432,21 +620,31 @@ def run_plataforma_minigame(screen, clock):
             player.vy += GRAVITY
             if player.vy > 22:
                 player.vy = 22
-            # --- COLISÃO COM ROBO PILOTO COMO PLATAFORMA ---
-            # Verifica se o player está em cima do robô piloto
+            # Candidatos a colisão: o que está nas células do jogador (16px de folga embaixo para os pés)
             player_rect = player.rect()
-            robo_rect = pygame.Rect(int(robo_piloto.x), int(robo_piloto.y), ROBO_PILOTO_W, ROBO_PILOTO_H)
-            # Considera "em cima" se os pés do player estão tocando o topo do robô e há interseção horizontal
-            on_robo = (
-                player_rect.bottom <= robo_rect.top + 16 and
-                player_rect.bottom >= robo_rect.top - 16 and
-                player_rect.right > robo_rect.left + 10 and
-                player_rect.left < robo_rect.right - 10
+            collision_hash.query_rect(
+                player_rect.x, player_rect.y, player_rect.width, player_rect.height + 16, candidates
             )
-            
-            # --- COLISÃO COM PLATAFORMA MÓVEL ---
-            movel_rect = movel_platform.get_rect()
-            on_movel = movel_platform.check_player_on_top(player)
+            on_robo = on_movel = False
+            player.drone_contacts.clear()
+            for obj in candidates:
+                if obj is robo_piloto:
+                    # --- COLISÃO COM ROBO PILOTO COMO PLATAFORMA ---
+                    robo_rect = robo_piloto.get_rect()
+                    # Considera "em cima" se os pés do player estão tocando o topo do robô e há interseção horizontal
+                    on_robo = (
+                        player_rect.bottom <= robo_rect.top + 16 and
+                        player_rect.bottom >= robo_rect.top - 16 and
+                        player_rect.right > robo_rect.left + 10 and
+                        player_rect.left < robo_rect.right - 10
+                    )
+                elif obj is movel_platform:
+                    # --- COLISÃO COM PLATAFORMA MÓVEL ---
+                    movel_rect = movel_platform.get_rect()
+                    on_movel = movel_platform.check_player_on_top(player)
+                elif player_rect.colliderect(obj.get_rect()):
+                    # Drones ainda não reagem ao toque; os contatos ficam no jogador
+                    player.drone_contacts.append(obj)
             
             if on_robo and player.vy >= 0:
                 player.y = robo_rect.top - SPRITE_H
@@ -481,15 +679,12 @@ def run_plataforma_minigame(screen, clock):
             if player.y > base_height - SPRITE_H:
                 player.y = base_height - SPRITE_H
         # Atualiza robôs
-        for robot in robots:
-            robot.update()
+        robots.update()
         robo_piloto.update()
         
         # Atualiza plataforma móvel
         movel_platform.update()
-        robots = [r for r in robots if not r.is_off_screen(0)]
-        while len(robots) < ROBOT_COUNT:
-            robots.append(DroneRobot(robot_sheet, map_w, map_h))
+        collision_hash.move(robo_piloto, robo_piloto.x, robo_piloto.y, ROBO_PILOTO_W, ROBO_PILOTO_H)
         # --- CAMERA ---
         # Centralizar a câmera no centro dos jogadores
         min_x = min(p.x for p in players)
@@ -503,32 +698,29 @@ def run_plataforma_minigame(screen, clock):
         # Limitar a câmera para não mostrar fora do mapa
         cam_x = max(0, min(cam_x, map_w - base_width))
         cam_y = max(0, min(cam_y, map_h - base_height))
+        # Mapa de calor pelos pés dos jogadores
+        record_positions('plataforma', [(p.x, p.y + SPRITE_H) for p in players], (map_w, map_h))
+        frame_timer.mark('physics')
         # --- DESENHO ---
-        game_surface = pygame.Surface((base_width, base_height))
+        game_surface.set_window_size(screen.get_size())
+        game_surface.fill((0, 0, 0))
         # Desenhar apenas o fundo noite.png em todo o mapa
         for x in range(0, map_w, noite_img.get_width()):
             game_surface.blit(noite_img, (x - cam_x, 0 - cam_y))
         game_surface.blit(map_img, (-cam_x, -cam_y))
         for player in players:
             player.draw(game_surface, cam_x, cam_y, font)
-        for robot in robots:
-            robot.draw(game_surface, cam_x, cam_y)
+        robots.draw(game_surface, cam_x, cam_y)
         robo_piloto.draw(game_surface, cam_x, cam_y)
         
         # Desenhar plataforma móvel
         movel_platform.draw(game_surface, cam_x, cam_y)
-        instr = font.render('Jackson: A/D/W | Jean: J/L/I | Jean: ←/→/↑', True, (0,255,255))
         game_surface.blit(instr, (game_surface.get_width()/2 - instr.get_width()/2, 30))
+        frame_timer.mark('render')
         # Ajuste de proporção e centralização igual ao main.py
-        window_width, window_height = screen.get_size()
-        scale = min(window_width / base_width, window_height / base_height)
-        scaled_width = int(base_width * scale)
-        scaled_height = int(base_height * scale)
-        scaled_surface = pygame.transform.smoothscale(game_surface, (scaled_width, scaled_height))
-        x_offset = (window_width - scaled_width) // 2
-        y_offset = (window_height - scaled_height) // 2
-        screen.fill((0, 0, 0))
-        screen.blit(scaled_surface, (x_offset, y_offset))
+        game_surface.present(screen)
+        draw_overlay(screen)
         pygame.display.flip()
+        frame_timer.end_frame()
         clock.tick(60)
     return 'success' 
\ No newline at end of file
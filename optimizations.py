@@ -4,11 +4,16 @@ Melhora performance através de técnicas de otimização
 """
 
 import pygame
+import math
 import time
 import weakref
+from array import array
+from bisect import bisect_left
 from collections import defaultdict
 from logger import log_debug, log_performance
 from config import GameConfig
+from asset_pipeline import load_image
+from flight_recorder import record_span
 
 class RenderManager:
     """Gerenciador de renderização otimizado"""
@@ -63,76 +68,349 @@ class RenderManager:
         
         log_performance('render_frame', render_time)
 
+# Pools com nome, para estatísticas (seção 'pools' do relatório de performance)
+object_pools = {}
+
 class ObjectPool:
-    """Pool de objetos para reduzir alocação de memória"""
-    
-    def __init__(self, object_class, initial_size=10):
-        self.object_class = object_class
-        self.pool = [object_class() for _ in range(initial_size)]
-        self.active_objects = []
-    
-    def get_object(self):
-        """Obtém objeto do pool ou cria novo"""
-        if self.pool:
-            obj = self.pool.pop()
-            self.active_objects.append(obj)
-            return obj
+    """
+    Pool de objetos com lista livre por índice
+
+    Cada objeto criado ganha um slot fixo (índice em `objects`); os slots
+    livres ficam numa pilha, então acquire() e release() são O(1) com
+    qualquer número de objetos. Protocolo de reset: se o objeto tiver
+    reset(), acquire(*args) chama obj.reset(*args) antes de entregá-lo,
+    para o objeto reaproveitado sair igual a um recém-criado.
+    """
+
+    def __init__(self, factory, initial_size=0, name=None):
+        self.factory = factory      # cria um objeto novo (classe ou função sem argumentos)
+        self.objects = []           # slot -> objeto
+        self.in_use = []            # slot -> em uso?
+        self.free_slots = []        # pilha de slots livres
+        self.slots = {}             # id(objeto) -> slot
+        self.active_count = 0
+        self.high_water = 0         # maior número de objetos em uso ao mesmo tempo
+        self.acquires = 0
+        self.reuses = 0
+        self.name = name
+        if name:
+            object_pools[name] = self
+        self.prewarm(initial_size)
+
+    def _new_slot(self):
+        obj = self.factory()
+        slot = len(self.objects)
+        self.objects.append(obj)
+        self.in_use.append(False)
+        self.slots[id(obj)] = slot
+        return slot
+
+    def prewarm(self, count):
+        """Cria objetos livres até o pool ter pelo menos `count` (fora do loop do jogo)"""
+        while len(self.objects) < count:
+            self.free_slots.append(self._new_slot())
+
+    def acquire(self, *args, **kwargs):
+        """Obtém um objeto livre (ou cria um) e aplica o reset com os argumentos dados"""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.reuses += 1
         else:
-            obj = self.object_class()
-            self.active_objects.append(obj)
-            return obj
-    
-    def return_object(self, obj):
-        """Retorna objeto ao pool"""
-        if obj in self.active_objects:
-            self.active_objects.remove(obj)
-            # Reset do objeto se tiver método reset
-            if hasattr(obj, 'reset'):
-                obj.reset()
-            self.pool.append(obj)
-    
+            slot = self._new_slot()
+        self.in_use[slot] = True
+        self.acquires += 1
+        self.active_count += 1
+        if self.active_count > self.high_water:
+            self.high_water = self.active_count
+        obj = self.objects[slot]
+        reset = getattr(obj, 'reset', None)
+        if reset is not None:
+            reset(*args, **kwargs)
+        return obj
+
+    def release(self, obj):
+        """Devolve o objeto ao pool; objetos de fora ou já devolvidos são ignorados"""
+        slot = self.slots.get(id(obj))
+        if slot is None or not self.in_use[slot] or self.objects[slot] is not obj:
+            return False
+        self.in_use[slot] = False
+        self.free_slots.append(slot)
+        self.active_count -= 1
+        return True
+
+    # Nomes antigos
+    get_object = acquire
+    return_object = release
+
     def cleanup(self):
-        """Limpa objetos inativos"""
-        self.pool.clear()
+        """Descarta os objetos livres (os em uso continuam no pool, em slots novos)"""
+        active = [obj for obj, used in zip(self.objects, self.in_use) if used]
+        self.objects = active
+        self.in_use = [True] * len(active)
+        self.free_slots = []
+        self.slots = {id(obj): slot for slot, obj in enumerate(active)}
+
+    def get_stats(self):
+        return {
+            'size': len(self.objects),
+            'active': self.active_count,
+            'free': len(self.free_slots),
+            'high_water': self.high_water,
+            'acquires': self.acquires,
+            'reuses': self.reuses
+        }
 
 class SpatialHash:
-    """Hash espacial para otimizar colisões"""
+    """
+    Hash espacial dinâmico para colisões
+
+    Cada objeto guarda a faixa de células que ocupa: move() só mexe na grade
+    quando essa faixa muda (no caso comum, de um quadro para o outro, não
+    muda) e remove() tira o objeto só das células dele. query_rect() devolve
+    os candidatos (objetos em células que o retângulo toca), cada um uma vez,
+    numa lista do chamador, sem criar conjuntos por consulta. O teste exato
+    de colisão fica com quem consulta.
+    """
     
     def __init__(self, cell_size=64):
         self.cell_size = cell_size
-        self.grid = defaultdict(list)
+        self.grid = {}    # (cx, cy) -> objetos na célula
+        self.cells = {}   # objeto -> (cx0, cy0, cx1, cy1)
     
     def get_cell_key(self, x, y):
         """Calcula chave da célula para posição"""
-        return (x // self.cell_size, y // self.cell_size)
+        return (int(x // self.cell_size), int(y // self.cell_size))
+    
+    def _cell_range(self, x, y, width, height):
+        size = self.cell_size
+        return (int(x // size), int(y // size), int((x + width) // size), int((y + height) // size))
+    
+    def _insert(self, obj, cells):
+        grid = self.grid
+        for cell_x in range(cells[0], cells[2] + 1):
+            for cell_y in range(cells[1], cells[3] + 1):
+                bucket = grid.get((cell_x, cell_y))
+                if bucket is None:
+                    grid[(cell_x, cell_y)] = {obj}
+                else:
+                    bucket.add(obj)
+    
+    def _discard(self, obj, cells):
+        grid = self.grid
+        for cell_x in range(cells[0], cells[2] + 1):
+            for cell_y in range(cells[1], cells[3] + 1):
+                bucket = grid[(cell_x, cell_y)]
+                bucket.discard(obj)
+                if not bucket:
+                    del grid[(cell_x, cell_y)]
+    
+    def move(self, obj, x, y, width, height):
+        """Insere o objeto ou atualiza sua posição (só toca a grade se mudou de células)"""
+        cells = self._cell_range(x, y, width, height)
+        old = self.cells.get(obj)
+        if old == cells:
+            return
+        if old is not None:
+            self._discard(obj, old)
+        self._insert(obj, cells)
+        self.cells[obj] = cells
     
     def add_object(self, obj, x, y, width, height):
         """Adiciona objeto ao hash espacial"""
-        # Calcular células que o objeto ocupa
-        start_cell = self.get_cell_key(x, y)
-        end_cell = self.get_cell_key(x + width, y + height)
-        
-        for cell_x in range(start_cell[0], end_cell[0] + 1):
-            for cell_y in range(start_cell[1], end_cell[1] + 1):
-                self.grid[(cell_x, cell_y)].append(obj)
+        self.move(obj, x, y, width, height)
+    
+    def remove(self, obj):
+        """Tira o objeto das células dele; retorna False se não estava no hash"""
+        cells = self.cells.pop(obj, None)
+        if cells is None:
+            return False
+        self._discard(obj, cells)
+        return True
+    
+    def query_rect(self, x, y, width, height, out=None):
+        """
+        Objetos nas células que o retângulo toca, sem repetição
+
+        Args:
+            out: lista reaproveitada entre consultas (é limpa antes)
+        """
+        if out is None:
+            out = []
+        else:
+            out.clear()
+        qx0, qy0, qx1, qy1 = self._cell_range(x, y, width, height)
+        grid, cells = self.grid, self.cells
+        for cell_x in range(qx0, qx1 + 1):
+            for cell_y in range(qy0, qy1 + 1):
+                bucket = grid.get((cell_x, cell_y))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    # Conta o objeto só na primeira célula dele dentro da consulta
+                    first = cells[obj]
+                    if (cell_x == (first[0] if first[0] > qx0 else qx0)
+                            and cell_y == (first[1] if first[1] > qy0 else qy0)):
+                        out.append(obj)
+        return out
     
     def get_nearby_objects(self, x, y, radius):
         """Retorna objetos próximos à posição"""
-        center_cell = self.get_cell_key(x, y)
-        cells_to_check = radius // self.cell_size + 1
-        
-        nearby_objects = set()
-        for dx in range(-cells_to_check, cells_to_check + 1):
-            for dy in range(-cells_to_check, cells_to_check + 1):
-                cell_key = (center_cell[0] + dx, center_cell[1] + dy)
-                if cell_key in self.grid:
-                    nearby_objects.update(self.grid[cell_key])
-        
-        return list(nearby_objects)
+        return self.query_rect(x - radius, y - radius, 2 * radius, 2 * radius)
+    
+    def __contains__(self, obj):
+        return obj in self.cells
+    
+    def __iter__(self):
+        """Objetos no hash (sem cópia: não inserir nem remover durante a iteração)"""
+        return iter(self.cells)
+    
+    def __len__(self):
+        return len(self.cells)
     
     def clear(self):
         """Limpa hash espacial"""
         self.grid.clear()
+        self.cells.clear()
+
+class RingBuffer:
+    """
+    Buffer circular de tamanho fixo sobre array('d')
+
+    append é O(1) (a soma é mantida incrementalmente e recalculada a cada volta
+    completa, para não acumular erro de ponto flutuante); os percentis ordenam
+    uma cópia só quando alguém pede o relatório.
+    """
+    
+    def __init__(self, size):
+        self.size = size
+        self.data = array('d', bytes(8 * size))
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+    
+    def append(self, value):
+        if self.count == self.size:
+            self.total -= self.data[self.index]
+        else:
+            self.count += 1
+        self.data[self.index] = value
+        self.total += value
+        self.index += 1
+        if self.index == self.size:
+            self.index = 0
+            self.total = sum(self.data)
+    
+    def __len__(self):
+        return self.count
+    
+    def values(self):
+        """Valores do mais antigo para o mais recente"""
+        if self.count < self.size:
+            return self.data[:self.count].tolist()
+        return (self.data[self.index:] + self.data[:self.index]).tolist()
+    
+    def last(self):
+        return self.data[self.index - 1] if self.count else 0.0
+    
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+    
+    def percentiles(self, points=(50, 95, 99)):
+        """Percentis (rank mais próximo) e máximo da janela atual"""
+        if not self.count:
+            return dict({f'p{p}': 0.0 for p in points}, max=0.0)
+        ordered = sorted(self.data[:self.count])
+        result = {}
+        for p in points:
+            rank = max(0, min(self.count - 1, math.ceil(p / 100.0 * self.count) - 1))
+            result[f'p{p}'] = ordered[rank]
+        result['max'] = ordered[-1]
+        return result
+    
+    def clear(self):
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+
+class FrameHistogram:
+    """
+    Histograma de tempos (ms) em baldes fixos
+
+    add é O(1) e o histograma cobre o nível inteiro (não só a janela do
+    RingBuffer); histogramas de níveis ou sessões diferentes podem ser somados.
+    """
+    
+    # Limite superior de cada balde em ms (o último balde é tudo acima de 1s)
+    BUCKETS = (1, 2, 4, 6, 8, 10, 12, 14, 16, 17, 20, 25, 33, 40, 50, 66, 100, 150, 250, 500, 1000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, value):
+        self.counts[bisect_left(self.BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other):
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+    
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+    
+    def percentile(self, p):
+        """Limite superior do balde que contém o percentil p (limitado ao máximo visto)"""
+        if not self.count:
+            return 0.0
+        target = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self.BUCKETS[i], self.max) if i < len(self.BUCKETS) else self.max
+        return self.max
+    
+    def count_above(self, limit):
+        """Quadros em baldes inteiramente acima de `limit` ms"""
+        start = bisect_left(self.BUCKETS, limit) + 1
+        return sum(self.counts[start:])
+    
+    def to_dict(self):
+        return {
+            'buckets': list(self.BUCKETS),
+            'counts': list(self.counts),
+            'count': self.count,
+            'total': round(self.total, 3),
+            'max': round(self.max, 3)
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Histograma salvo por to_dict (ex.: no analytics); baldes de outra
+        versão são redistribuídos pelo limite superior de cada um
+        """
+        histogram = cls()
+        buckets = tuple(data.get('buckets', cls.BUCKETS))
+        counts = data.get('counts', [])
+        if buckets == cls.BUCKETS and len(counts) == len(histogram.counts):
+            histogram.counts = list(counts)
+        else:
+            for i, n in enumerate(counts):
+                limit = buckets[i] if i < len(buckets) else float('inf')
+                histogram.counts[bisect_left(cls.BUCKETS, limit)] += n
+        histogram.count = data.get('count', sum(counts))
+        histogram.total = data.get('total', 0.0)
+        histogram.max = data.get('max', 0.0)
+        return histogram
 
 class FrameRateController:
     """Controlador de taxa de quadros otimizado"""
@@ -140,22 +418,20 @@ class FrameRateController:
     def __init__(self, target_fps=60):
         self.target_fps = target_fps
         self.target_frame_time = 1000.0 / target_fps
-        self.last_frame_time = time.time()
-        self.frame_times = []
+        self.last_frame_time = time.perf_counter()
         self.max_frame_history = 60
+        self.frame_times = RingBuffer(self.max_frame_history)
         
     def update(self):
         """Atualiza controlador de FPS"""
-        current_time = time.time()
+        current_time = time.perf_counter()
         frame_time = (current_time - self.last_frame_time) * 1000  # em ms
         self.last_frame_time = current_time
         
         self.frame_times.append(frame_time)
-        if len(self.frame_times) > self.max_frame_history:
-            self.frame_times.pop(0)
         
         # Calcular FPS atual
-        avg_frame_time = sum(self.frame_times) / len(self.frame_times)
+        avg_frame_time = self.frame_times.mean()
         current_fps = 1000.0 / avg_frame_time if avg_frame_time > 0 else 0
         
         return current_fps, frame_time
@@ -165,8 +441,11 @@ class FrameRateController:
         if len(self.frame_times) < 2:
             return False
         
-        avg_frame_time = sum(self.frame_times) / len(self.frame_times)
-        return avg_frame_time > self.target_frame_time * 1.1
+        return self.frame_times.mean() > self.target_frame_time * 1.1
+    
+    def get_percentiles(self):
+        """p50/p95/p99/máx dos últimos quadros (ms)"""
+        return self.frame_times.percentiles()
 
 class MemoryManager:
     """Gerenciador de memória para otimização"""
@@ -185,7 +464,7 @@ class MemoryManager:
         else:
             self.cache_misses += 1
             try:
-                texture = pygame.image.load(path).convert_alpha()
+                texture = load_image(path)
                 self.texture_cache[path] = texture
                 return texture
             except Exception as e:
@@ -225,45 +504,191 @@ class MemoryManager:
 class PerformanceMonitor:
     """Monitor de performance em tempo real"""
     
+    METRIC_TYPES = (
+        'fps', 'frame_time', 'input_time', 'update_time',
+        'render_time', 'present_time', 'wait_time', 'memory_usage'
+    )
+    
     def __init__(self):
+        self.max_history = GameConfig.PERF_CONFIG['metric_history']
         self.metrics = {
-            'fps': [],
-            'render_time': [],
-            'update_time': [],
-            'memory_usage': []
+            metric_type: RingBuffer(self.max_history)
+            for metric_type in self.METRIC_TYPES
         }
-        self.max_history = 100
         self.start_time = time.time()
+        self.current_scene = None
+        # Seções extras do relatório (ex: memória), registradas por outros módulos
+        self.report_sections = {}
+        # Histogramas dos tempos (ms) por cena, desde a entrada na cena até o resumo do nível
+        self.scene_histograms = defaultdict(lambda: defaultdict(FrameHistogram))
     
     def add_metric(self, metric_type, value):
         """Adiciona métrica de performance"""
-        if metric_type in self.metrics:
-            self.metrics[metric_type].append(value)
-            if len(self.metrics[metric_type]) > self.max_history:
-                self.metrics[metric_type].pop(0)
+        buffer = self.metrics.get(metric_type)
+        if buffer is not None:
+            buffer.append(value)
+            if metric_type.endswith('_time') and self.current_scene is not None:
+                self.scene_histograms[self.current_scene][metric_type].add(value)
     
     def get_average(self, metric_type):
         """Retorna média de uma métrica"""
-        if metric_type in self.metrics and self.metrics[metric_type]:
-            return sum(self.metrics[metric_type]) / len(self.metrics[metric_type])
-        return 0
+        buffer = self.metrics.get(metric_type)
+        return buffer.mean() if buffer is not None else 0
+    
+    def get_percentiles(self, metric_type):
+        """Retorna p50/p95/p99/máx de uma métrica na janela atual"""
+        buffer = self.metrics.get(metric_type)
+        return buffer.percentiles() if buffer is not None else {}
     
-    def get_performance_report(self):
-        """Gera relatório de performance"""
+    def get_level_summary(self, level_name, reset=True):
+        """
+        Resumo de performance de um nível (cena `level_name` e sub-cenas como 'begin_zoom')
+
+        Usa os histogramas acumulados desde a entrada na cena, então cobre o
+        nível inteiro; com reset=True a próxima tentativa começa do zero.
+        """
+        scenes = [scene for scene in self.scene_histograms
+                  if scene == level_name or str(scene).startswith(f'{level_name}_')]
+        merged = defaultdict(FrameHistogram)
+        for scene in scenes:
+            for metric_type, histogram in self.scene_histograms[scene].items():
+                merged[metric_type].merge(histogram)
+            if reset:
+                del self.scene_histograms[scene]
+        
+        frames = merged['frame_time']
+        budget = 1000.0 / GameConfig.FPS
+        summary = {
+            'frames': frames.count,
+            'avg_frame_time': round(frames.mean(), 3),
+            'p50_frame_time': frames.percentile(50),
+            'p95_frame_time': frames.percentile(95),
+            'p99_frame_time': frames.percentile(99),
+            'max_frame_time': round(frames.max, 3),
+            'slow_frames': frames.count_above(2 * budget),  # quadros acima de 2x o orçamento
+            'stages': {
+                metric_type: {
+                    'avg': round(histogram.mean(), 3),
+                    'p95': histogram.percentile(95),
+                    'max': round(histogram.max, 3)
+                }
+                for metric_type, histogram in merged.items() if metric_type != 'frame_time'
+            },
+            'frame_time_histogram': frames.to_dict()
+        }
+        return summary
+    
+    def get_performance_report(self, sections=None):
+        """
+        Gera relatório de performance
+
+        Args:
+            sections: nomes das seções extras (report_sections) a incluir; None inclui todas
+        """
         return {
+            'frame_time_percentiles': self.get_percentiles('frame_time'),
             'avg_fps': self.get_average('fps'),
             'avg_render_time': self.get_average('render_time'),
             'avg_update_time': self.get_average('update_time'),
-            'uptime': time.time() - self.start_time
+            'avg_input_time': self.get_average('input_time'),
+            'avg_present_time': self.get_average('present_time'),
+            'avg_frame_time': self.get_average('frame_time'),
+            'scene': self.current_scene,
+            'uptime': time.time() - self.start_time,
+            **{name: section() for name, section in list(self.report_sections.items())
+               if sections is None or name in sections}
         }
 
+class FrameTimer:
+    """
+    Spans por etapa do quadro (input, physics, render, present)
+
+    Cada loop de cena chama begin_frame no topo, mark ao fim de cada etapa e
+    end_frame depois do flip; o tempo até o próximo begin_frame (clock.tick) vira 'wait'.
+    """
+    
+    # Etapa do quadro -> métrica do PerformanceMonitor
+    STAGE_METRICS = {
+        'input': 'input_time',
+        'physics': 'update_time',
+        'render': 'render_time',
+        'present': 'present_time',
+        'wait': 'wait_time'
+    }
+    
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.scene = None
+        self.frame_start = None
+        self.last_mark = None
+        self.last_end = None
+        self.last_frame_start = None
+        self.stages = {}
+        self.listeners = []  # chamados com (cena, etapas em ms) a cada quadro fechado
+        self.begin_hooks = []  # chamados com a cena no início de todo quadro, antes de abri-lo
+        self.last_frame = None
+    
+    def begin_frame(self, scene):
+        """Abre o quadro e fecha o anterior com o tempo de espera"""
+        now = time.perf_counter()
+        if self.last_end is not None and scene == self.scene:
+            # Quadro anterior completo: fecha com a espera e o intervalo total
+            wait = (now - self.last_end) * 1000
+            self.last_frame['wait'] = wait
+            self.monitor.add_metric('wait_time', wait)
+            record_span('stage', 'wait', self.last_end, wait)
+            frame_time = (now - self.last_frame_start) * 1000
+            record_span('frame', self.scene, self.last_frame_start, frame_time)
+            self.monitor.add_metric('frame_time', frame_time)
+            if frame_time > 0:
+                self.monitor.add_metric('fps', 1000.0 / frame_time)
+            for listener in self.listeners:
+                listener(self.scene, self.last_frame)
+        for hook in self.begin_hooks:
+            hook(scene)
+        self.scene = scene
+        self.monitor.current_scene = scene
+        self.frame_start = now
+        self.last_mark = now
+        self.last_end = None
+        self.stages = {}
+    
+    def mark(self, stage):
+        """Fecha a etapa `stage`, que vai da marca anterior até agora"""
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        duration = (now - self.last_mark) * 1000
+        self.stages[stage] = self.stages.get(stage, 0.0) + duration
+        # Span gravado já no mark, para que um crash no meio do quadro apareça no trace
+        record_span('stage', stage, self.last_mark, duration)
+        self.last_mark = now
+    
+    def end_frame(self):
+        """Fecha a etapa 'present' e registra as etapas no monitor"""
+        if self.frame_start is None:
+            return
+        self.mark('present')
+        for stage, duration in self.stages.items():
+            metric = self.STAGE_METRICS.get(stage)
+            if metric:
+                self.monitor.add_metric(metric, duration)
+        self.last_frame = self.stages
+        self.last_frame_start = self.frame_start
+        self.last_end = self.last_mark
+        self.frame_start = None
+
 class OptimizedSurface:
     """Superfície otimizada com cache de transformações"""
     
+    # Instâncias vivas, para a contabilidade de memória dos caches
+    instances = weakref.WeakSet()
+    
     def __init__(self, surface):
         self.original_surface = surface
         self.scaled_cache = {}
         self.rotated_cache = {}
+        OptimizedSurface.instances.add(self)
     
     def get_scaled(self, size):
         """Retorna versão escalada da superfície (com cache)"""
@@ -289,6 +714,7 @@ spatial_hash = SpatialHash()
 frame_rate_controller = FrameRateController(GameConfig.FPS)
 memory_manager = MemoryManager()
 performance_monitor = PerformanceMonitor()
+frame_timer = FrameTimer(performance_monitor)
 
 def optimize_surface_loading(surface_path):
     """Otimiza carregamento de superfícies"""
@@ -304,10 +730,20 @@ def update_performance_metrics(fps, render_time, update_time):
     performance_monitor.add_metric('render_time', render_time)
     performance_monitor.add_metric('update_time', update_time)
 
-def get_performance_report():
+def get_performance_report(sections=None):
     """Retorna relatório de performance"""
-    return performance_monitor.get_performance_report()
+    return performance_monitor.get_performance_report(sections)
+
+def get_level_performance_summary(level_name):
+    """Resumo de performance do nível (percentis de tempo de quadro e etapas)"""
+    return performance_monitor.get_level_summary(level_name)
 
 def get_cache_stats():
     """Retorna estatísticas do cache"""
-    return memory_manager.get_cache_stats() 
\ No newline at end of file
+    return memory_manager.get_cache_stats() 
+
+def get_pool_stats():
+    """Estatísticas dos pools de objetos com nome"""
+    return {name: pool.get_stats() for name, pool in list(object_pools.items())}
+
+performance_monitor.report_sections['pools'] = get_pool_stats
@@ -0,0 +1,166 @@
+"""
+Overlay de performance do jogo Desprogramados
+Gráfico de tempo de quadro por etapa e percentis por etapa, ligado/desligado pela tecla F3,
+e as demais teclas de diagnóstico tratadas em todos os loops de cena
+"""
+
+from collections import deque
+import pygame
+from config import GameConfig
+from font_pool import get_font
+from logger import log_info, log_error
+from optimizations import frame_timer, performance_monitor
+from flight_recorder import dump_flight_recorder
+from scene_profiler import request_scene_profile
+
+class PerfOverlay:
+    """Overlay (na janela, acima do quadro apresentado) com os spans do FrameTimer"""
+
+    STAGE_ORDER = ['input', 'physics', 'render', 'present', 'wait']
+    STAGE_COLORS = {
+        'input': (80, 160, 255),
+        'physics': (90, 220, 120),
+        'render': (255, 200, 60),
+        'present': (240, 100, 220),
+        'wait': (70, 70, 70)
+    }
+    GRAPH_HEIGHT = 100
+
+    def __init__(self, timer):
+        config = GameConfig.PERF_CONFIG
+        self.visible = False
+        self.key = config['overlay_key']
+        self.graph_scale = config['graph_scale_ms']
+        self.text_refresh = config['text_refresh_ms']
+        self.history = deque(maxlen=config['overlay_history'])
+        self.scene = None
+        self.graph = None
+        self.panel = None
+        self.text_surfaces = []
+        self.last_text_update = 0
+        timer.listeners.append(self._on_frame)
+
+    def _on_frame(self, scene, stages):
+        """Recebe cada quadro fechado pelo FrameTimer"""
+        self.scene = scene
+        self.history.append(stages)
+        if self.visible:
+            self._scroll_graph(stages)
+
+    def handle_event(self, event):
+        """Trata a tecla do overlay; retorna True se o evento foi consumido"""
+        if event.type == pygame.KEYDOWN and event.key == self.key:
+            self.visible = not self.visible
+            if self.visible:
+                self._rebuild_graph()
+                self.last_text_update = 0
+            return True
+        return False
+
+    # --- Gráfico ---
+
+    def _bar_height(self, duration):
+        return min(self.GRAPH_HEIGHT, int(duration * self.GRAPH_HEIGHT / self.graph_scale))
+
+    def _draw_column(self, x, stages):
+        """Barra empilhada de um quadro na coluna x do gráfico"""
+        y = self.GRAPH_HEIGHT
+        for stage in self.STAGE_ORDER:
+            height = self._bar_height(stages.get(stage, 0.0))
+            if height <= 0:
+                continue
+            y -= height
+            if y < 0:
+                height += y
+                y = 0
+            self.graph.fill(self.STAGE_COLORS[stage], (x, y, 1, height))
+            if y == 0:
+                break
+
+    def _rebuild_graph(self):
+        width = self.history.maxlen
+        self.graph = pygame.Surface((width, self.GRAPH_HEIGHT))
+        self.graph.fill((0, 0, 0))
+        offset = width - len(self.history)
+        for i, stages in enumerate(self.history):
+            self._draw_column(offset + i, stages)
+
+    def _scroll_graph(self, stages):
+        """Rola o gráfico um pixel e desenha só a coluna nova"""
+        width = self.graph.get_width()
+        self.graph.scroll(-1, 0)
+        self.graph.fill((0, 0, 0), (width - 1, 0, 1, self.GRAPH_HEIGHT))
+        self._draw_column(width - 1, stages)
+
+    # --- Números ---
+
+    @staticmethod
+    def _format_percentiles(stats):
+        return f"{stats['p50']:6.2f} {stats['p95']:6.2f} {stats['p99']:6.2f} {stats['max']:6.2f}"
+
+    def _update_text(self):
+        """Percentis da janela do PerformanceMonitor, por etapa"""
+        font = get_font(None, 18)
+        avg_frame = performance_monitor.get_average('frame_time')
+        fps = 1000.0 / avg_frame if avg_frame > 0 else 0
+        frame_stats = performance_monitor.get_percentiles('frame_time')
+        lines = [
+            ((255, 255, 255), f"{self.scene or '-'}   {fps:5.1f} fps"),
+            ((255, 255, 255), f"{'ms':<8}    p50    p95    p99    máx"),
+            ((255, 255, 255), f"{'quadro':<8} {self._format_percentiles(frame_stats)}")
+        ]
+        for stage in self.STAGE_ORDER:
+            stats = performance_monitor.get_percentiles(frame_timer.STAGE_METRICS[stage])
+            lines.append((self.STAGE_COLORS[stage], f"{stage:<8} {self._format_percentiles(stats)}"))
+        self.text_surfaces = [font.render(text, True, color) for color, text in lines]
+
+    def draw(self, screen):
+        """Desenha o overlay no canto superior esquerdo da janela"""
+        if not self.visible:
+            return
+        if self.graph is None:
+            self._rebuild_graph()
+        now = pygame.time.get_ticks()
+        if now - self.last_text_update >= self.text_refresh:
+            self._update_text()
+            self.last_text_update = now
+
+        line_height = 18
+        width = max([self.graph.get_width()] + [s.get_width() for s in self.text_surfaces]) + 16
+        height = self.GRAPH_HEIGHT + line_height * len(self.text_surfaces) + 24
+        if self.panel is None or self.panel.get_size() != (width, height):
+            self.panel = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 170))
+        x, y = 10, 10
+        screen.blit(self.panel, (x, y))
+        for i, text in enumerate(self.text_surfaces):
+            screen.blit(text, (x + 8, y + 8 + i * line_height))
+
+        graph_y = y + 16 + line_height * len(self.text_surfaces)
+        screen.blit(self.graph, (x + 8, graph_y))
+        # Linhas de referência de 60 e 30 fps
+        for budget in (1000.0 / 60, 1000.0 / 30):
+            line_y = graph_y + self.GRAPH_HEIGHT - self._bar_height(budget)
+            pygame.draw.line(screen, (200, 60, 60), (x + 8, line_y), (x + 8 + self.graph.get_width(), line_y))
+
+# Instância global do overlay
+perf_overlay = PerfOverlay(frame_timer)
+
+def handle_debug_event(event):
+    """Teclas de diagnóstico (overlay, gravador de voo, profiler); retorna True se consumiu o evento"""
+    if perf_overlay.handle_event(event):
+        return True
+    if event.type == pygame.KEYDOWN and event.key == GameConfig.PROFILER_CONFIG['key']:
+        request_scene_profile()
+        return True
+    if event.type == pygame.KEYDOWN and event.key == GameConfig.FLIGHT_RECORDER_CONFIG['dump_key']:
+        path = dump_flight_recorder('manual')
+        if path:
+            log_info(f"Trace do gravador de voo salvo em: {path}")
+        else:
+            log_error("Falha ao salvar o trace do gravador de voo")
+        return True
+    return False
+
+def draw_overlay(screen):
+    perf_overlay.draw(screen)
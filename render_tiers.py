@@ -0,0 +1,230 @@
+"""
+Tiers de renderização para o jogo Desprogramados
+Compõe cada cena direto na resolução do tier (1080p/720p/540p) mantendo
+as coordenadas de mundo no espaço base 1920x1080
+"""
+
+import math
+import time
+import weakref
+import pygame
+from logger import log_debug
+from config import GameConfig
+from asset_pipeline import asset_loader, SpriteAtlas
+
+class RenderTier:
+    """Resolução de composição e fator de escala em relação ao espaço base"""
+
+    def __init__(self, name, scale):
+        self.name = name
+        self.scale = scale
+        self.size = (
+            round(GameConfig.BASE_WIDTH * scale),
+            round(GameConfig.BASE_HEIGHT * scale)
+        )
+
+    def scaled_size(self, size):
+        """Tamanho de um asset neste tier (arredondado para cima para não abrir frestas entre tiles)"""
+        return (max(1, math.ceil(size[0] * self.scale)), max(1, math.ceil(size[1] * self.scale)))
+
+    def __repr__(self):
+        return f"RenderTier({self.name}, {self.size[0]}x{self.size[1]})"
+
+RENDER_TIERS = sorted(
+    (RenderTier(name, scale) for name, scale in GameConfig.RENDER_TIERS.items()),
+    key=lambda tier: tier.scale
+)
+
+def select_render_tier(window_size):
+    """
+    Escolhe o menor tier que ainda cobre a área útil da janela
+
+    Assim o present final só reduz (ou copia 1:1), nunca amplia.
+    """
+    scale = min(window_size[0] / GameConfig.BASE_WIDTH, window_size[1] / GameConfig.BASE_HEIGHT)
+    for tier in RENDER_TIERS:
+        if tier.scale >= scale - 1e-6:
+            return tier
+    return RENDER_TIERS[-1]
+
+def letterbox(window_size, base_size=None):
+    """Retorna (escala, tamanho escalado, offset) do enquadramento com barras pretas"""
+    base_w, base_h = base_size or (GameConfig.BASE_WIDTH, GameConfig.BASE_HEIGHT)
+    window_width, window_height = window_size
+    scale = min(window_width / base_w, window_height / base_h)
+    scaled_width = int(base_w * scale)
+    scaled_height = int(base_h * scale)
+    x_offset = (window_width - scaled_width) // 2
+    y_offset = (window_height - scaled_height) // 2
+    return scale, (scaled_width, scaled_height), (x_offset, y_offset)
+
+class TierCanvas:
+    """
+    Superfície de composição no tamanho do tier
+
+    Aceita a mesma chamada blit(origem, posição) das superfícies base: a
+    posição está em coordenadas base e a origem é trocada pela sua versão
+    do tier (blob cozido ou smoothscale feito uma única vez e mantido em cache).
+    """
+
+    # Canvases vivos, para a contabilidade de memória
+    instances = weakref.WeakSet()
+
+    def __init__(self, window_size):
+        self.base_size = (GameConfig.BASE_WIDTH, GameConfig.BASE_HEIGHT)
+        self.tier = None
+        self.surface = None
+        self.scale = 1.0
+        self._tier_cache = weakref.WeakKeyDictionary()
+        self._overlay = None
+        self._static = []  # arte estática da cena (prepare), reescalada junto na troca de tier
+        self.set_window_size(window_size)
+        TierCanvas.instances.add(self)
+
+    def set_window_size(self, window_size):
+        """Troca de tier se a janela mudou de tamanho"""
+        tier = select_render_tier(window_size)
+        if tier is self.tier:
+            return
+        self.tier = tier
+        self.scale = tier.scale
+        self.surface = pygame.Surface(tier.size)
+        self._tier_cache = weakref.WeakKeyDictionary()
+        self._overlay = None
+        log_debug(f"Tier de renderização: {tier}")
+        self._prepare_static()
+
+    # --- API compatível com pygame.Surface (em coordenadas base) ---
+
+    def get_width(self):
+        return self.base_size[0]
+
+    def get_height(self):
+        return self.base_size[1]
+
+    def get_size(self):
+        return self.base_size
+
+    def fill(self, color):
+        self.surface.fill(color)
+
+    def blit(self, source, pos):
+        """Desenha a versão do tier de `source` na posição base `pos`"""
+        if self.scale == 1.0:
+            return self.surface.blit(source, pos)
+        return self.surface.blit(
+            self.tier_surface(source),
+            (round(pos[0] * self.scale), round(pos[1] * self.scale))
+        )
+
+    def blit_tier(self, source, pos):
+        """Desenha uma superfície já no tamanho do tier (ex.: texto renderizado com fonte do tier) na posição base"""
+        return self.surface.blit(source, (self.to_tier(pos[0]), self.to_tier(pos[1])))
+
+    def blits(self, sequence):
+        """
+        Vários blits (origem, posição base) num único Surface.blits do tier;
+        a versão do tier de cada origem é buscada uma vez por chamada
+        """
+        if self.scale == 1.0:
+            self.surface.blits(sequence, doreturn=False)
+            return
+        scale = self.scale
+        tier_sources = {}
+        batch = []
+        for source, (x, y) in sequence:
+            tier_source = tier_sources.get(source)
+            if tier_source is None:
+                tier_source = tier_sources[source] = self.tier_surface(source)
+            batch.append((tier_source, (round(x * scale), round(y * scale))))
+        self.surface.blits(batch, doreturn=False)
+
+    # --- Recursos do tier ---
+
+    def to_tier(self, value):
+        """Converte uma distância base para pixels do tier"""
+        return round(value * self.scale)
+
+    def tier_surface(self, source):
+        """Retorna (com cache) a versão de `source` na escala do tier"""
+        if self.scale == 1.0:
+            return source
+        scaled = self._tier_cache.get(source)
+        if scaled is None:
+            scaled = self._load_tier_surface(source)
+            self._tier_cache[source] = scaled
+        return scaled
+
+    def prepare(self, *sources):
+        """
+        Gera já (no carregamento da cena, fora do loop) a versão do tier da
+        arte estática: superfícies e todos os quadros de SpriteAtlas. Sem
+        isso, sem blobs cozidos, cada origem seria reduzida no primeiro blit
+        dentro do loop (engasgos de ~100ms no mapa da plataforma)
+        """
+        for source in sources:
+            if source is None:
+                continue
+            if isinstance(source, SpriteAtlas):
+                self._static.extend(source.get_frame(*key) for key in source.rects)
+            else:
+                self._static.append(source)
+        self._prepare_static()
+
+    def _prepare_static(self):
+        if self.scale == 1.0 or not self._static:
+            return
+        start = time.perf_counter()
+        missing = [source for source in self._static if source not in self._tier_cache]
+        for source in missing:
+            self.tier_surface(source)
+        if missing:
+            log_debug("Arte estática no tier %s: %d superfícies em %.0fms",
+                      self.tier.name, len(missing), (time.perf_counter() - start) * 1000)
+
+    def invalidate(self, source):
+        """Descarta a versão do tier de uma superfície que foi alterada (ex: camada de desenho)"""
+        self._tier_cache.pop(source, None)
+
+    def _load_tier_surface(self, source):
+        """Usa o blob cozido do tier quando existe; senão reduz em runtime"""
+        size = self.tier.scaled_size(source.get_size())
+        path = asset_loader.source_path(source)
+        if path is not None:
+            cooked = asset_loader.load_tier_image(path, self.tier.name)
+            if cooked is not None and cooked.get_size() == size:
+                return cooked
+        if source.get_bitsize() in (24, 32):
+            scaled = pygame.transform.smoothscale(source, size)
+        else:
+            scaled = pygame.transform.scale(source, size)
+        if source.get_flags() & pygame.RLEACCELOK:
+            # Mantém o RLE pedido pela origem (ex.: quadros dos drones)
+            scaled.set_alpha(255, pygame.RLEACCEL)
+        return scaled
+
+    def blit_scaled(self, source, pos, size):
+        """Desenha `source` esticada para `size` (base) a partir da versão do tier"""
+        tier_size = (self.to_tier(size[0]), self.to_tier(size[1]))
+        scaled = pygame.transform.smoothscale(self.tier_surface(source), tier_size)
+        self.surface.blit(scaled, (self.to_tier(pos[0]), self.to_tier(pos[1])))
+
+    def fill_overlay(self, color):
+        """Cobre o quadro inteiro com uma cor RGBA translúcida (fades)"""
+        if self._overlay is None:
+            self._overlay = pygame.Surface(self.tier.size, pygame.SRCALPHA)
+        self._overlay.fill(color)
+        self.surface.blit(self._overlay, (0, 0))
+
+    def present(self, screen, keep_aspect=True):
+        """Leva o quadro composto para a janela (sem smoothscale se o tamanho bater)"""
+        window_size = screen.get_size()
+        if keep_aspect:
+            scale, scaled_size, offset = letterbox(window_size, self.tier.size)
+        else:
+            scaled_size, offset = window_size, (0, 0)
+        screen.fill((0, 0, 0))
+        if scaled_size == self.tier.size:
+            screen.blit(self.surface, offset)
+        else:
+            screen.blit(pygame.transform.smoothscale(self.surface, scaled_size), offset)
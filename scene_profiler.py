@@ -0,0 +1,180 @@
+"""
+Profiler por cena do jogo Desprogramados
+Perfila os próximos N quadros da cena atual (cProfile e/ou amostragem da pilha)
+e grava arquivos .pstats e .collapsed em logs/, nomeados por cena e horário
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from config import GameConfig
+from logger import log_info, log_error
+from optimizations import frame_timer
+
+class StackSampler:
+    """Amostrador estatístico: lê a pilha da thread principal a intervalos fixos"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.main_thread_id = threading.main_thread().ident
+        self.samples = Counter()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def _frame_name(frame):
+        code = frame.f_code
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+        return f"{module}.{code.co_name}"
+
+    def _collapse(self, frame):
+        names = []
+        while frame is not None:
+            names.append(self._frame_name(frame))
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is not None:
+                self.samples[self._collapse(frame)] += 1
+            del frame
+
+    def start(self):
+        self.samples.clear()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='scene-sampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def write_collapsed(self, path):
+        """Formato de pilhas colapsadas (flamegraph.pl, speedscope): 'a;b;c contagem'"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+class SceneProfiler:
+    """
+    Perfila um número fixo de quadros de uma cena
+
+    Liga no begin_frame do primeiro quadro da cena pedida e desliga depois de
+    N quadros ou quando a cena muda; os arquivos ficam em logs/.
+    """
+
+    def __init__(self, timer):
+        config = GameConfig.PROFILER_CONFIG
+        self.timer = timer
+        self.mode = config['mode']
+        self.default_frames = config['frames']
+        self.output_dir = config['output_dir']
+        self.sample_interval = config['sample_interval_ms'] / 1000.0
+        self.requested = None   # (cena ou None para a atual, quadros)
+        self.active_scene = None
+        self.frames_left = 0
+        self.frames_profiled = 0
+        self.start_time = None
+        self.profile = None
+        self.sampler = None
+        self.last_outputs = []
+        timer.begin_hooks.append(self.on_begin_frame)
+
+    def request(self, frames=None, scene=None, mode=None):
+        """
+        Agenda a perfilagem dos próximos `frames` quadros de `scene` (None = cena atual);
+        `mode` troca o modo de PROFILER_CONFIG a partir desta perfilagem
+        """
+        if self.active_scene is not None:
+            return False
+        if mode is not None:
+            self.mode = mode
+        self.requested = (scene, frames or self.default_frames)
+        log_info(f"Profiler agendado: {self.requested[1]} quadros de {scene or 'cena atual'}")
+        return True
+
+    def on_begin_frame(self, scene):
+        """Hook do FrameTimer: conta quadros, liga e desliga a perfilagem"""
+        if self.active_scene is not None:
+            if scene != self.active_scene or self.frames_left <= 0:
+                self._stop()
+            else:
+                self.frames_left -= 1
+                self.frames_profiled += 1
+                return
+        if self.requested is not None:
+            wanted_scene, frames = self.requested
+            if wanted_scene is None or wanted_scene == scene:
+                self.requested = None
+                self._start(scene, frames)
+
+    def _start(self, scene, frames):
+        self.active_scene = scene
+        self.frames_left = frames - 1
+        self.frames_profiled = 1
+        self.start_time = time.perf_counter()
+        if self.mode in ('sample', 'both'):
+            self.sampler = StackSampler(self.sample_interval)
+            self.sampler.start()
+        if self.mode in ('cprofile', 'both'):
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def _stop(self):
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+        elapsed = time.perf_counter() - self.start_time
+        scene = self.active_scene
+        self.active_scene = None
+        try:
+            self.last_outputs = self._write_outputs(scene)
+            log_info(
+                f"Profiler: {self.frames_profiled} quadros de {scene} em {elapsed * 1000:.0f}ms "
+                f"-> {', '.join(self.last_outputs)}"
+            )
+        except OSError as e:
+            log_error(f"Erro ao gravar resultado do profiler: {e}")
+        self.profile = None
+        self.sampler = None
+
+    def _write_outputs(self, scene):
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base = os.path.join(self.output_dir, f'profile_{scene}_{timestamp}')
+        outputs = []
+        if self.profile is not None:
+            path = base + '.pstats'
+            self.profile.dump_stats(path)
+            outputs.append(path)
+            log_info(f"Profiler ({scene}), funções mais caras:\n{self._top_functions()}")
+        if self.sampler is not None:
+            path = base + '.collapsed'
+            self.sampler.write_collapsed(path)
+            outputs.append(path)
+        return outputs
+
+    def _top_functions(self, limit=10):
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats('tottime').print_stats(limit)
+        # Só a tabela, sem o cabeçalho do pstats
+        lines = stream.getvalue().splitlines()
+        start = next((i for i, line in enumerate(lines) if line.strip().startswith('ncalls')), 0)
+        return '\n'.join(line for line in lines[start:] if line.strip())
+
+# Instância global do profiler de cenas
+scene_profiler = SceneProfiler(frame_timer)
+
+def request_scene_profile(frames=None, scene=None, mode=None):
+    return scene_profiler.request(frames, scene, mode)
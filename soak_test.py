@@ -0,0 +1,304 @@
+"""
+Teste de resistência (soak) do jogo Desprogramados
+Roda sem janela (SDL dummy) o ciclo menu -> begin -> plataforma -> paint com
+entrada roteirizada, mede RSS, Surfaces vivas, tamanhos de caches e percentis
+de quadro a cada ciclo e aponta o que cresce entre ciclos
+
+Uso:
+    python soak_test.py --cycles 20
+    python soak_test.py --hours 2 --realtime
+"""
+
+# Primeiro import: liga os drivers dummy do SDL antes do pygame
+from headless import SceneFinished, ScriptedInput, ScriptedClock
+
+import argparse
+import gc
+import inspect
+import json
+import os
+import sys
+import time
+from datetime import datetime
+import pygame
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Teste de resistência sem janela (menu, begin, plataforma, paint)')
+    parser.add_argument('--cycles', type=int, default=5, help='ciclos completos (padrão 5)')
+    parser.add_argument('--hours', type=float, help='roda por tempo em vez de número de ciclos')
+    parser.add_argument('--frames', type=int, metavar='N', help='quadros por cena (padrão em SOAK_CONFIG)')
+    parser.add_argument('--realtime', action='store_true', help='limita a 60 fps como no jogo')
+    args, _ = parser.parse_known_args()
+    return args
+
+ARGS = parse_args()
+
+# O import de main prepara janela, assets e estado do menu (o loop só roda em main.py)
+import main as game
+from config import GameConfig
+from logger import log_info, log_warning, log_error
+from analytics import game_analytics, track_level_completed
+from asset_pipeline import asset_loader
+from font_pool import font_pool
+from render_tiers import TierCanvas
+from optimizations import (
+    memory_manager, render_manager, performance_monitor, frame_timer, OptimizedSurface
+)
+from perf_overlay import handle_debug_event, draw_overlay
+from hitch_detector import hitch_detector
+from flight_recorder import flight_recorder
+from memory_tracker import memory_tracker, MB
+from minigames import paint, plataforma
+
+STATE_MENU = GameConfig.GAME_STATES['MENU']
+STATE_BEGIN = GameConfig.GAME_STATES['BEGIN']
+STATE_PLATAFORMA = GameConfig.GAME_STATES['PLATAFORMA']
+STATE_PAINT = GameConfig.GAME_STATES['PAINT']
+
+def run_menu(screen, clock):
+    """Quadros do menu como no loop de main.py; o último terço passa pelo fade de saída"""
+    game.menu_transition = False
+    while True:
+        frame_timer.begin_frame(STATE_MENU)
+        for event in pygame.event.get():
+            handle_debug_event(event)
+        if not game.menu_transition and clock.count >= clock.frames * 2 // 3:
+            game.menu_transition = True
+            game.menu_transition_start = pygame.time.get_ticks()
+        frame_timer.mark('input')
+        game.BASE_SURFACE.set_window_size(screen.get_size())
+        game.draw_menu()
+        frame_timer.mark('render')
+        game.BASE_SURFACE.present(screen)
+        draw_overlay(screen)
+        pygame.display.flip()
+        frame_timer.end_frame()
+        clock.tick(GameConfig.FPS)
+
+def run_begin(screen, clock):
+    return paint.run_begin_minigame(screen, clock, 'assets/begin.png', 'assets/begin_colormap.png', None, None)
+
+SCENES = [
+    (STATE_MENU, run_menu),
+    (STATE_BEGIN, run_begin),
+    (STATE_PLATAFORMA, plataforma.run_plataforma_minigame),
+    (STATE_PAINT, paint.run_paint_minigame),
+]
+
+# Contêineres que não deveriam crescer de um ciclo para o outro
+WATCHED_SIZES = {
+    'memory_manager.texture_cache': lambda: len(memory_manager.texture_cache),
+    'render_manager.background_cache': lambda: len(render_manager.background_cache),
+    'render_manager.sprite_cache': lambda: len(render_manager.sprite_cache),
+    'font_pool.fonts': lambda: len(font_pool.fonts),
+    'optimized_surface.instances': lambda: len(OptimizedSurface.instances),
+    'tier_canvas.instances': lambda: len(TierCanvas.instances),
+    'asset_loader.mapped_surfaces': lambda: len(asset_loader.mapped_surfaces),
+    'asset_loader.source_paths': lambda: len(asset_loader._source_paths),
+    'asset_loader.load_counts': lambda: len(asset_loader.load_counts),
+    'performance_monitor.scene_histograms': lambda: len(performance_monitor.scene_histograms),
+    'hitch_detector.signatures': lambda: len(hitch_detector.signatures),
+    'flight_recorder.names': lambda: len(flight_recorder.names),
+    'analytics.frame_times': lambda: len(game_analytics.frame_times),
+}
+
+def _analytics_sizes():
+    """Tamanho de cada lista/dict da sessão de analytics"""
+    return {
+        f'analytics.session.{key}': len(value)
+        for key, value in game_analytics.current_session.items()
+        if isinstance(value, (list, dict))
+    }
+
+def _function_state():
+    """Atributos pendurados em funções dos minigames (estado que sobrevive entre execuções)"""
+    state = {}
+    for module in (paint, plataforma):
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if function.__module__ == module.__name__ and vars(function):
+                state[f'{module.__name__}.{name}'] = sorted(vars(function))
+    return state
+
+def take_sample(cycle, started, scenes):
+    """Medidas ao fim de um ciclo"""
+    gc.collect()
+    accounting = memory_tracker.account()
+    sizes = {name: size() for name, size in WATCHED_SIZES.items()}
+    sizes.update(_analytics_sizes())
+    load_stats = asset_loader.get_load_stats()
+    return {
+        'cycle': cycle,
+        'elapsed_s': round(time.time() - started, 1),
+        'rss_mb': round(accounting['rss_bytes'] / MB, 2) if accounting['rss_bytes'] else None,
+        'surfaces_mb': round(accounting['total_bytes'] / MB, 2),
+        'live_surfaces': accounting['live_surfaces'],
+        'live_masks': accounting['live_masks'],
+        'gc_objects': len(gc.get_objects()),
+        'asset_loads': load_stats['cooked_loads'] + load_stats['png_loads'],
+        'sizes': sizes,
+        'function_state': _function_state(),
+        'scenes': scenes
+    }
+
+def run_cycle(screen, scripted_input, frames, realtime):
+    """
+    Um ciclo completo; devolve os percentis de quadro de cada cena
+
+    Uma cena que levanta exceção (ex.: asset faltando) fica registrada como
+    falha, com o erro, e o ciclo segue para as outras.
+    """
+    scenes = {}
+    for state, run_scene in SCENES:
+        game.music_manager.play_for_state(state)
+        clock = ScriptedClock(scripted_input, frames, realtime)
+        scene_start = time.time()
+        error = None
+        try:
+            result = run_scene(screen, clock)
+        except SceneFinished:
+            result = None
+        except Exception as e:
+            result = None
+            error = f'{type(e).__name__}: {e}'
+            log_error("Soak: cena %s falhou no quadro %d: %s", state, clock.count, error)
+        performance = performance_monitor.get_level_summary(state, reset=False)
+        if result == 'success':
+            # Mesmo caminho do analytics de uma fase concluída no jogo
+            track_level_completed(state, time.time() - scene_start)
+        else:
+            # Descarta os histogramas da tentativa (a próxima começa do zero, como no jogo)
+            performance_monitor.get_level_summary(state)
+        scenes[state] = {
+            'frames': clock.count,
+            'completed': result == 'success',
+            'failed': error is not None,
+            'error': error,
+            'p50_frame_time': performance.get('p50_frame_time'),
+            'p95_frame_time': performance.get('p95_frame_time'),
+            'p99_frame_time': performance.get('p99_frame_time'),
+            'max_frame_time': performance.get('max_frame_time')
+        }
+    return scenes
+
+def _series(samples):
+    """Séries numéricas por nome, na ordem dos ciclos"""
+    series = {}
+    for sample in samples:
+        for name in ('rss_mb', 'surfaces_mb', 'live_surfaces', 'live_masks', 'gc_objects'):
+            series.setdefault(name, []).append(sample[name])
+        for name, size in sample['sizes'].items():
+            series.setdefault(name, []).append(size)
+    return series
+
+def find_leaks(samples, baseline_state, config):
+    """
+    Compara os ciclos após o aquecimento e devolve os achados
+
+    Tendência: o valor final é maior que o inicial e cresceu em pelo menos
+    `growth_ratio` dos ciclos. Recarga: assets carregados de novo a cada ciclo.
+    Estado em função: atributos criados em funções dos minigames durante o soak.
+    """
+    findings = []
+    measured = samples[config['warmup_cycles']:]
+    if len(measured) >= 3:
+        for name, values in _series(measured).items():
+            if any(value is None for value in values) or values[-1] <= values[0]:
+                continue
+            steps = [b - a for a, b in zip(values, values[1:])]
+            if sum(1 for step in steps if step > 0) / len(steps) < config['growth_ratio']:
+                continue
+            growth = values[-1] - values[0]
+            if name == 'rss_mb' and growth < config['rss_growth_mb']:
+                continue
+            findings.append({
+                'kind': 'growth',
+                'what': name,
+                'first': values[0],
+                'last': values[-1],
+                'per_cycle': round(growth / len(steps), 3)
+            })
+
+        reloads = [b['asset_loads'] - a['asset_loads'] for a, b in zip(measured, measured[1:])]
+        if reloads and min(reloads) > 0:
+            findings.append({
+                'kind': 'reload',
+                'what': 'asset_loader',
+                'per_cycle': round(sum(reloads) / len(reloads), 1),
+                'paths': dict(asset_loader.load_counts.most_common(10))
+            })
+
+    for function, attributes in samples[-1]['function_state'].items() if samples else ():
+        new = [name for name in attributes if name not in baseline_state.get(function, [])]
+        if new:
+            findings.append({'kind': 'function_state', 'what': function, 'attributes': new})
+    return findings
+
+def _describe(finding):
+    if finding['kind'] == 'growth':
+        return (f"{finding['what']} cresce {finding['per_cycle']:+g}/ciclo "
+                f"({finding['first']} -> {finding['last']})")
+    if finding['kind'] == 'reload':
+        return f"assets recarregados a cada ciclo: {finding['per_cycle']:g} carregamentos/ciclo"
+    return f"estado persistente em {finding['what']}: {', '.join(finding['attributes'])}"
+
+def write_report(report, report_dir):
+    os.makedirs(report_dir, exist_ok=True)
+    path = os.path.join(report_dir, f"soak_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    return path
+
+def main():
+    config = GameConfig.SOAK_CONFIG
+    frames = ARGS.frames or config['frames_per_scene']
+    deadline = time.time() + ARGS.hours * 3600 if ARGS.hours else None
+
+    scripted_input = ScriptedInput(GameConfig.CONTROLS)
+    scripted_input.install()
+    game.start_diagnostics()
+    screen = game.SCREEN
+    baseline_state = _function_state()
+    started = time.time()
+    samples = []
+    failures = {}  # cena -> primeiro erro
+    log_info(f"Soak: {frames} quadros por cena, "
+             f"{f'{ARGS.hours}h' if deadline else f'{ARGS.cycles} ciclos'}")
+
+    cycle = 0
+    while (time.time() < deadline) if deadline else (cycle < ARGS.cycles):
+        cycle += 1
+        scenes = run_cycle(screen, scripted_input, frames, ARGS.realtime)
+        sample = take_sample(cycle, started, scenes)
+        samples.append(sample)
+        frame_p99 = max(scene['p99_frame_time'] or 0 for scene in scenes.values())
+        print(f"ciclo {cycle}: RSS {sample['rss_mb']}MB, {sample['live_surfaces']} surfaces, "
+              f"{sample['live_masks']} masks, {sample['gc_objects']} objetos, p99 {frame_p99:.1f}ms")
+        for state, scene in scenes.items():
+            if scene['failed']:
+                failures.setdefault(state, scene['error'])
+                print(f"  {state} falhou: {scene['error']}")
+
+    findings = find_leaks(samples, baseline_state, config)
+    path = write_report({
+        'started': datetime.fromtimestamp(started).isoformat(),
+        'frames_per_scene': frames,
+        'realtime': ARGS.realtime,
+        'config': config,
+        'cycles': samples,
+        'failed_scenes': failures,
+        'findings': findings
+    }, config['report_dir'])
+
+    for finding in findings:
+        print(f"SUSPEITO: {_describe(finding)}")
+        log_warning(f"Soak: {_describe(finding)}")
+    if len(samples) <= config['warmup_cycles'] + 2:
+        print(f"Aviso: tendências precisam de pelo menos {config['warmup_cycles'] + 3} ciclos")
+    if failures:
+        print(f"Cenas com falha: {', '.join(failures)}")
+    print(f"{cycle} ciclos em {time.time() - started:.0f}s, {len(findings)} suspeitos -> {path}")
+    log_info(f"Soak concluído: {cycle} ciclos, {len(findings)} suspeitos, relatório em {path}")
+    return 1 if findings or failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
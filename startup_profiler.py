@@ -0,0 +1,78 @@
+"""
+Perfil de inicialização do jogo Desprogramados
+Mede cada fase do boot e o tempo até o primeiro quadro do menu
+
+Não importa nada do jogo para poder ser o primeiro import do main.py
+(antes até do pygame), antes do chdir e da criação dos logs.
+"""
+
+import os
+import time
+
+def _process_age():
+    """Segundos desde a criação do processo (Linux), ou None se indisponível"""
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            # O nome do executável pode ter espaços; os campos começam depois do ')'
+            fields = f.read().rsplit(b')', 1)[1].split()
+        start_ticks = int(fields[19])  # campo 22: starttime em ticks desde o boot
+        with open('/proc/uptime', 'rb') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class StartupProfiler:
+    """Cronômetro das fases de inicialização"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last_mark = self.start
+        self.enabled = False  # --profile-startup imprime o relatório no terminal
+        self.phases = []  # (nome, duração em ms) na ordem do boot
+        self.time_to_first_frame = None
+
+        # Tempo gasto pelo interpretador antes do main.py (resolução de 10ms)
+        age = _process_age()
+        if age is not None:
+            self.phases.append(('interpretador', age * 1000))
+            self.start -= age
+
+    def mark(self, name):
+        """Fecha a fase `name`, que vai da marca anterior até agora"""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last_mark) * 1000))
+        self.last_mark = now
+
+    def mark_first_frame(self):
+        """
+        Registra o primeiro quadro apresentado (só na primeira chamada)
+
+        Returns:
+            Tempo até o primeiro quadro em ms, ou None se já registrado
+        """
+        if self.time_to_first_frame is not None:
+            return None
+        self.mark('primeiro quadro')
+        self.time_to_first_frame = (self.last_mark - self.start) * 1000
+        return self.time_to_first_frame
+
+    def get_phases(self):
+        """Retorna as fases como dicionário {nome: ms}"""
+        return {name: round(duration, 2) for name, duration in self.phases}
+
+    def format_report(self):
+        """Tabela com as fases do boot e a fração de cada uma"""
+        total = self.time_to_first_frame or (time.perf_counter() - self.start) * 1000
+        lines = ['Inicialização (ms):']
+        for name, duration in self.phases:
+            share = 100 * duration / total if total else 0
+            lines.append(f"  {name:<24}{duration:9.1f}  {share:5.1f}%")
+        lines.append(f"  {'até o primeiro quadro':<24}{total:9.1f}")
+        return '\n'.join(lines)
+
+# Instância global do perfil de inicialização
+startup_profiler = StartupProfiler()
+
+def startup_mark(name):
+    startup_profiler.mark(name)